@@ -4,11 +4,13 @@ from django.urls import path, reverse
 from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
 from django.conf import settings
+from django.db.models import CharField, OuterRef, Subquery
+from django.db.models.functions import Cast
 
 from blog.models import Category, Post
-from pincatch.models import Page
-from blog import translations
-from pincatch import translations as page_translations
+from pincatch.models import Page, TranslationJob
+from blog import normalization, translations
+from pincatch import translation_jobs, translations as page_translations
 from django_restful_translator.admin import TranslationInline
 from django.contrib.auth.models import User, Group
 
@@ -22,21 +24,57 @@ admin.site.unregister(Group)
 class BaseTranslationAdmin(admin.ModelAdmin):
     readonly_fields = ("created_on", "last_modified")
     inlines = (TranslationInline,)
+    translation_job_kind = None
 
     def get_list_display(self, request):
         base_fields = super().get_list_display(request)
         merged = []
         seen = set()
-        for field in base_fields + ("translate_action",):
+        for field in base_fields + ("translate_action", "translation_status"):
             if field not in seen:
                 seen.add(field)
                 merged.append(field)
         return tuple(merged)
 
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        if self.translation_job_kind is None:
+            return queryset
+        # Latest queued translation per row, fetched with the changelist query itself.
+        latest = TranslationJob.objects.filter(
+            kind=self.translation_job_kind,
+            object_id=Cast(OuterRef("pk"), CharField()),
+        ).order_by("-created_on", "-pk")
+        return queryset.annotate(
+            translation_job_status=Subquery(latest.values("status")[:1]),
+            translation_job_attempts=Subquery(latest.values("attempts")[:1]),
+            translation_job_done=Subquery(latest.values("progress_done")[:1]),
+            translation_job_total=Subquery(latest.values("progress_total")[:1]),
+        )
+
+    def translation_status(self, obj):
+        """Status and progress of the most recent queued translation."""
+        status = getattr(obj, "translation_job_status", None)
+        if not status:
+            return "-"
+        if status == TranslationJob.STATUS_RUNNING:
+            job = TranslationJob(
+                status=status,
+                progress_done=obj.translation_job_done or 0,
+                progress_total=obj.translation_job_total or 0,
+            )
+            return _("Running (%(percent)d%%)") % {"percent": job.progress_percent}
+        if status == TranslationJob.STATUS_PENDING and obj.translation_job_attempts:
+            return _("Retrying (attempt %(attempt)d)") % {"attempt": obj.translation_job_attempts + 1}
+        return dict(TranslationJob.STATUS_CHOICES).get(status, status)
+
+    translation_status.short_description = _("Translation")
+
 
 @admin.register(Category)
 class CategoryAdmin(BaseTranslationAdmin):
     list_display = ("name", "translate_action", "created_on", "last_modified")
+    translation_job_kind = translations.CATEGORY_JOB
 
     actions = ["translate_categories"]
 
@@ -58,7 +96,9 @@ class CategoryAdmin(BaseTranslationAdmin):
             self.message_user(request, _("Category not found."), level=messages.ERROR)
             return HttpResponseRedirect(redirect_url)
         try:
-            translations.trigger_category_translation(category.pk, reset_existing=True)
+            translations.trigger_category_translation(
+                category.pk, reset_existing=True, priority=translation_jobs.PRIORITY_HIGH
+            )
             self.message_user(
                 request,
                 _("Successfully triggered translation for %(name)s.") % {"name": category.name},
@@ -110,9 +150,15 @@ class CategoryAdmin(BaseTranslationAdmin):
 @admin.register(Post)
 class PostAdmin(BaseTranslationAdmin):
     list_display = ("title", "translate_action", "created_on", "last_modified")
+    translation_job_kind = translations.POST_JOB
 
     actions = ["translate_posts"]
 
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        # Translations edited inline are normalized here, not on the next page view.
+        normalization.normalize_post(form.instance)
+
     def get_urls(self):
         urls = super().get_urls()
         custom_urls = [
@@ -131,7 +177,7 @@ class PostAdmin(BaseTranslationAdmin):
             self.message_user(request, _("Post not found."), level=messages.ERROR)
             return HttpResponseRedirect(redirect_url)
         try:
-            translations.trigger_post_translation(post.pk, reset_existing=True)
+            translations.trigger_post_translation(post.pk, reset_existing=True, priority=translation_jobs.PRIORITY_HIGH)
             self.message_user(
                 request,
                 _("Successfully triggered translation for %(title)s.") % {"title": post.title},
@@ -196,6 +242,7 @@ class PageAdmin(BaseTranslationAdmin):
     )
     readonly_fields = ("created_on", "last_modified")
     actions = ["translate_pages"]
+    translation_job_kind = page_translations.PAGE_JOB
 
     def get_urls(self):
         urls = super().get_urls()
@@ -222,7 +269,9 @@ class PageAdmin(BaseTranslationAdmin):
             )
             return HttpResponseRedirect(redirect_url)
         try:
-            page_translations.trigger_page_translation(page.pk, reset_existing=True)
+            page_translations.trigger_page_translation(
+                page.pk, reset_existing=True, priority=translation_jobs.PRIORITY_HIGH
+            )
             self.message_user(
                 request,
                 _("Successfully triggered translation for %(name)s.") % {"name": page.name},
@@ -273,3 +322,36 @@ class PageAdmin(BaseTranslationAdmin):
 
     def _get_redirect_target(self, request):  # pragma: no cover - simple helper
         return request.META.get("HTTP_REFERER") or reverse("admin:pincatch_page_changelist")
+
+
+@admin.register(TranslationJob)
+class TranslationJobAdmin(admin.ModelAdmin):
+    list_display = ("kind", "object_id", "status", "progress", "priority", "attempts", "run_after", "updated_on")
+    list_filter = ("status", "kind")
+    search_fields = ("object_id", "last_error")
+    readonly_fields = [field.name for field in TranslationJob._meta.fields]
+    actions = ["retry_jobs"]
+
+    def has_add_permission(self, request):
+        return False
+
+    def progress(self, obj):
+        if not obj.progress_total:
+            return "-"
+        return f"{obj.progress_done}/{obj.progress_total} ({obj.progress_percent}%)"
+
+    progress.short_description = _("Progress")
+
+    def retry_jobs(self, request, queryset):
+        """Queue failed jobs again (merging with any pending job for the same object)."""
+        count = 0
+        for job in queryset.filter(status=TranslationJob.STATUS_FAILED):
+            translation_jobs.enqueue(job.kind, job.object_id, reset_existing=job.reset_existing, priority=job.priority)
+            count += 1
+        self.message_user(
+            request,
+            _("Queued %(count)d failed job(s) again.") % {"count": count},
+            level=messages.SUCCESS,
+        )
+
+    retry_jobs.short_description = _("Retry selected failed jobs")
@@ -0,0 +1,41 @@
+"""
+Process-pool entry points for `manage.py refresh_translation_cleanups`.
+
+Nothing here imports models at module level, so workers started with the
+spawn method can unpickle these functions before Django is set up.
+"""
+
+
+def init_worker():
+    import django
+    from django.apps import apps
+    from django.db import connections
+
+    if not apps.ready:
+        django.setup()
+    # A forked worker must not reuse the parent's database connection.
+    connections.close_all()
+
+
+def _posts(post_ids):
+    from blog.models import Post
+
+    return list(Post.objects.filter(pk__in=post_ids).order_by("pk"))
+
+
+def run_slug_shard(language, post_ids, dry_run):
+    """Normalize slugs of one (language, post range) shard; returns the update count."""
+    from blog import normalization
+
+    return normalization.normalize_slugs(_posts(post_ids), [language], dry_run=dry_run)
+
+
+def run_body_shard(language, post_ids, force, dry_run):
+    """Clean bodies of one (language, post range) shard; returns changed post pks."""
+    from blog import normalization, slug_index
+
+    slug_lookups = {language: slug_index.post_slug_lookup(language)}
+    updated = normalization.normalize_bodies(
+        _posts(post_ids), [language], slug_lookups, force=force, dry_run=dry_run
+    )
+    return [post_pk for post_pk, _ in updated]
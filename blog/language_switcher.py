@@ -0,0 +1,157 @@
+"""Compute every alternate-language URL for a view in one pass (language switcher, hreflang)."""
+
+from __future__ import annotations
+
+from typing import Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.urls import NoReverseMatch, Resolver404, resolve, reverse
+from django.utils import translation
+from django.utils.text import slugify
+
+from blog.translation_lookup import field_values
+from pincatch.routing import get_routing_table
+from pincatch.versioned_cache import VersionedLocalCache
+
+_switcher_cache = VersionedLocalCache("language-switcher", max_entries=2048)
+
+
+def language_codes() -> List[str]:
+    return [code for code, _ in settings.LANGUAGES]
+
+
+def invalidate() -> None:
+    """Forget computed switcher URLs in every worker after pages, posts or translations change."""
+    _switcher_cache.invalidate()
+
+
+def _normalize_slug(value):
+    if value is None:
+        return value
+    normalized = slugify(str(value), allow_unicode=True)
+    return normalized or str(value)
+
+
+def _translator_for(value) -> Callable[[str], object]:
+    """
+    Return language -> translated argument for a view argument.
+    Translatable objects load all languages for the relevant field once, mirroring
+    Post.get_translated_slug / Category.get_translated_name without a query per language.
+    """
+    if hasattr(value, "get_translated_slug"):
+        slugs = field_values(value, "slug")
+
+        def _slug(language):
+            stored = slugs.get(language)
+            if stored:
+                return _normalize_slug(stored)
+            return value.slug
+
+        return _slug
+    if hasattr(value, "get_translated_name"):
+        names = field_values(value, "name")
+        return lambda language: names.get(language) or value.name
+    return lambda language: value
+
+
+def _home_urls(codes) -> Dict[str, str]:
+    table = get_routing_table()
+    urls = {}
+    for code in codes:
+        with translation.override(code):
+            if code == settings.LANGUAGE_CODE:
+                urls[code] = reverse("home")
+                continue
+            page = table.home_for_language(code)
+            target_slug = (page.get_language_slug() if page else code) or code
+            urls[code] = reverse("home_language", kwargs={"language_slug": target_slug})
+    return urls
+
+
+def _page_view_kwargs(match, language_code) -> Dict[str, str]:
+    """Return kwargs for the dynamic Page view in the target language."""
+    slug = match.kwargs.get("slug")
+    current_language_slug = match.kwargs.get("language_slug")
+    if not slug:
+        return {}
+    table = get_routing_table()
+    current_page = table.page_for_url(slug, current_language_slug)
+    page = table.page_for_language(slug, language_code)
+    if not page and current_page:
+        page = table.page_in_group(current_page.group_id, language_code)
+    if page:
+        return {"slug": page.slug_url, "language_slug": page.get_language_slug()}
+    # If target language page is missing, fall back to the default language page so the dropdown still works.
+    default_page = table.page_for_language(slug, settings.LANGUAGE_CODE)
+    if default_page:
+        return {
+            "slug": default_page.slug_url,
+            "language_slug": default_page.get_language_slug() or settings.LANGUAGE_CODE,
+        }
+    return {"slug": slug, "language_slug": current_language_slug or language_code}
+
+
+def _view_urls(match, context, target_path, codes) -> Dict[str, str]:
+    translators = {}
+    for key, value in match.kwargs.items():
+        if match.view_name == "page_view" and key in {"slug", "language_slug"}:
+            continue
+        if key in context:
+            translators[key] = (_translator_for(context[key]), key == "slug")
+        elif key == "slug" and "blog" in context:
+            translators[key] = (_translator_for(context["blog"]), True)
+        elif key == "category_slug" and "category" in context:
+            translators[key] = (_translator_for(context["category"]), True)
+        else:
+            translators[key] = (_translator_for(value), key == "slug")
+
+    urls = {}
+    for code in codes:
+        kwargs = {}
+        if match.view_name == "page_view":
+            kwargs.update(_page_view_kwargs(match, code))
+        for key, (translate, is_slug) in translators.items():
+            translated = translate(code)
+            kwargs[key] = _normalize_slug(translated) if is_slug else translated
+        with translation.override(code):
+            try:
+                urls[code] = reverse(match.view_name, args=match.args, kwargs=kwargs)
+            except NoReverseMatch:
+                urls[code] = target_path
+    return urls
+
+
+def _build(context, target_path, codes) -> Dict[str, str]:
+    try:
+        match = resolve(target_path)
+    except Resolver404:
+        return {code: target_path for code in codes}
+    if match.view_name in {"home", "home_language"}:
+        return _home_urls(codes)
+    return _view_urls(match, context, target_path, codes)
+
+
+def get_language_urls(context, target_path: Optional[str] = None) -> Dict[str, str]:
+    """
+    Return {language_code: path} for the target path (defaults to the current request).
+
+    Results are memoized per request and, across requests, per path until a
+    Page, Post, Category or Translation changes. Query strings are not included.
+    """
+    request = context.get("request")
+    if target_path is None:
+        target_path = request.path_info if request is not None else "/"
+
+    per_request = None
+    if request is not None:
+        per_request = getattr(request, "_language_switcher_urls", None)
+        if per_request is None:
+            per_request = request._language_switcher_urls = {}
+        if target_path in per_request:
+            return per_request[target_path]
+
+    codes = language_codes()
+    urls = _switcher_cache.get(target_path, lambda: _build(context, target_path, codes))
+    if per_request is not None:
+        per_request[target_path] = urls
+    return urls
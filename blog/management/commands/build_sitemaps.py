@@ -0,0 +1,19 @@
+"""Write every sitemap section and the sitemap index to SITEMAP_FILES_ROOT."""
+
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from blog import sitemap_files
+
+
+class Command(BaseCommand):
+    help = "Rebuild the gzipped sitemap files served by the web server."
+
+    def handle(self, *args, **options) -> None:
+        count = sitemap_files.build_all()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Wrote {count} sitemap section(s) and the index to {sitemap_files.files_root()}."
+            )
+        )
@@ -0,0 +1,35 @@
+"""Backfill or repair the PostSlug index used by blog_detail."""
+
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from blog.models import Post, PostSlug
+from blog.post_slugs import sync_post_slugs
+
+
+class Command(BaseCommand):
+    help = "Index every post's current localized slugs, keeping replaced slugs for redirects."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--drop-history",
+            action="store_true",
+            help="Delete historical slugs first, so old URLs stop redirecting.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        if options.get("drop_history"):
+            deleted, _ = PostSlug.objects.filter(is_current=False).delete()
+            self.stdout.write(f"Removed {deleted} historical slug(s).")
+
+        changes = 0
+        for post in Post.objects.order_by("pk").iterator():
+            changes += sync_post_slugs(post)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Slug index rebuilt. {changes} row(s) changed, "
+                f"{PostSlug.objects.filter(is_current=True).count()} current slug(s) indexed."
+            )
+        )
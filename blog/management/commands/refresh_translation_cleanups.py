@@ -1,14 +1,27 @@
-"""Refresh translated post bodies so they use localized slugs and cleaned markup."""
+"""
+Refresh translated post bodies so they use localized slugs and cleaned markup.
+
+This is the backfill for blog.normalization: page views only read stored
+values, so run it after changing cleanup rules or editing translations in bulk.
+Bodies whose source, slug lookup and text are unchanged since their last
+cleanup are skipped unless --force is given. Work is split into
+(language, post range) shards run on a process pool; slugs are normalized
+for every shard before any body is cleaned against them.
+"""
 
 from __future__ import annotations
 
-from typing import Iterable, Optional
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterable, List, Optional, Tuple
 
 from django.conf import settings
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
 
+from blog import cleanup_workers
 from blog.models import Post
-from blog.translation_cleanup import build_slug_lookup, clean_translation_html
 
 
 class Command(BaseCommand):
@@ -29,17 +42,36 @@ class Command(BaseCommand):
             action="store_true",
             help="Report changes without saving them.",
         )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Re-clean bodies even when their stored hashes show nothing changed.",
+        )
         parser.add_argument(
             "--post-ids",
             nargs="+",
             type=int,
             help="Optional list of Post IDs to process (defaults to all posts).",
         )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Worker processes (default: one per CPU; 1 runs in this process).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Posts per (language, post range) shard.",
+        )
 
     def handle(self, *args, **options) -> None:
         target_language: Optional[str] = options.get("language")
         dry_run: bool = options.get("dry_run", False)
+        force: bool = options.get("force", False)
         post_ids: Optional[Iterable[int]] = options.get("post_ids")
+        batch_size: int = max(1, options.get("batch_size") or 100)
 
         default_language = settings.LANGUAGE_CODE
         available_languages = [lang[0] for lang in settings.LANGUAGES]
@@ -54,66 +86,100 @@ class Command(BaseCommand):
         else:
             languages = [lang for lang in available_languages if lang != default_language]
 
-        queryset = Post.objects.all().prefetch_related("translations")
+        queryset = Post.objects.all()
         if post_ids:
             queryset = queryset.filter(pk__in=post_ids)
 
-        if not queryset.exists():
+        ids = list(queryset.order_by("pk").values_list("pk", flat=True))
+        if not ids:
             self.stdout.write(self.style.WARNING("No posts found for the given criteria."))
             return
 
-        total_updates = 0
+        shards = [
+            (language, ids[start:start + batch_size])
+            for language in languages
+            for start in range(0, len(ids), batch_size)
+        ]
+        workers = options.get("workers") or min(len(shards), os.cpu_count() or 1)
+
+        # Slugs first: cleaned bodies link to the localized slugs of every post.
+        # Each shard commits on its own; an interrupted run is resumed by the
+        # stored hashes, which make finished rows a no-op on the next run.
+        slug_results, slug_failures = self._run_shards(
+            workers, cleanup_workers.run_slug_shard, [(language, shard, dry_run) for language, shard in shards]
+        )
+        body_results, body_failures = self._run_shards(
+            workers,
+            cleanup_workers.run_body_shard,
+            [(language, shard, force, dry_run) for language, shard in shards],
+        )
+
+        slug_counts = defaultdict(int)
+        for (language, _, _), count in slug_results:
+            slug_counts[language] += count
+        body_updates = defaultdict(list)
+        for (language, _, _, _), updated in body_results:
+            body_updates[language].extend(updated)
+
+        total_slugs = 0
+        total_bodies = 0
+        prefix = "[DRY RUN] " if dry_run else ""
         for language in languages:
-            slug_lookup = build_slug_lookup(queryset, language)
-            updates_for_language = 0
-
-            for post in queryset:
-                translation_obj = post.translations.filter(
-                    field_name="body",
-                    language=language,
-                ).first()
-
-                if not translation_obj or not translation_obj.field_value:
-                    continue
-
-                cleaned_html = clean_translation_html(
-                    post.body,
-                    translation_obj.field_value,
-                    slug_lookup,
+            for post_pk in sorted(body_updates[language]):
+                self.stdout.write(
+                    f"{prefix}Post {post_pk} ({language}) body normalized and link(s) updated."
                 )
-
-                # Skip if nothing changes (ignoring leading/trailing whitespace).
-                if cleaned_html.strip() == (translation_obj.field_value or "").strip():
-                    continue
-
-                updates_for_language += 1
-                if dry_run:
-                    self.stdout.write(
-                        f"[DRY RUN] Post {post.pk} ({language}) body would be normalized."
-                    )
-                else:
-                    translation_obj.field_value = cleaned_html
-                    translation_obj.save(update_fields=["field_value"])
-                    self.stdout.write(
-                        self.style.SUCCESS(
-                            f"Post {post.pk} ({language}) body normalized and link(s) updated."
-                        )
-                    )
-
-            total_updates += updates_for_language
+            slug_updates = slug_counts[language]
+            language_bodies = len(body_updates[language])
+            total_slugs += slug_updates
+            total_bodies += language_bodies
             summary_message = (
-                f"{updates_for_language} translation(s) updated for language '{language}'."
+                f"{language_bodies} body and {slug_updates} slug translation(s) "
+                f"updated for language '{language}'."
             )
-            if updates_for_language:
+            if language_bodies or slug_updates:
                 self.stdout.write(self.style.SUCCESS(summary_message))
             else:
                 self.stdout.write(summary_message)
 
+        failures = slug_failures + body_failures
+        if failures:
+            raise CommandError(
+                f"{failures} shard(s) failed; rerun the command to retry them "
+                "(finished rows are skipped)."
+            )
         if dry_run:
             self.stdout.write("Dry run complete. No changes were saved.")
         else:
             self.stdout.write(
                 self.style.SUCCESS(
-                    f"Re-clean completed. {total_updates} translation(s) updated in total."
+                    f"Re-clean completed. {total_bodies} body and {total_slugs} slug "
+                    "translation(s) updated in total."
                 )
-            )
\ No newline at end of file
+            )
+
+    def _run_shards(self, workers: int, fn, jobs: List[tuple]) -> Tuple[List[tuple], int]:
+        """Run fn(*job) for every job; returns ([(job, result)], failure count)."""
+        results = []
+        failures = 0
+        if workers <= 1:
+            for job in jobs:
+                try:
+                    results.append((job, fn(*job)))
+                except Exception as exc:
+                    failures += 1
+                    self.stderr.write(f"Shard {job[0]} ({len(job[1])} posts) failed: {exc}")
+            return results, failures
+
+        # Workers open their own connections; don't hand them the parent's.
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers, initializer=cleanup_workers.init_worker) as pool:
+            futures = {pool.submit(fn, *job): job for job in jobs}
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    results.append((job, future.result()))
+                except Exception as exc:
+                    failures += 1
+                    self.stderr.write(f"Shard {job[0]} ({len(job[1])} posts) failed: {exc}")
+        return results, failures
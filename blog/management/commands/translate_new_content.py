@@ -1,10 +1,54 @@
-from django.core.management.base import BaseCommand
+"""
+Translate posts and categories that are missing translations.
+
+Candidates are found with one query per model: objects with fewer
+non-empty Translation rows than target languages x translatable fields
+(optionally only those modified --since a date). They are translated on a
+bounded pool of --workers threads; provider calls share the per-provider
+concurrency and rate limits of pincatch.translation_executor. Every
+finished object is recorded in a checkpoint file, so an interrupted
+backfill (e.g. of a newly added --language) restarts where it stopped.
+"""
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.models import CharField, Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Cast, Coalesce
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django_restful_translator.models import Translation
+
+from blog import normalization
 from blog.models import Post, Category
 from blog.signals import translate_model_instance, translate_with_provider
+from pincatch import translation_memory
+
+MODELS = {
+    'post': (Post, 'title'),
+    'category': (Category, 'name'),
+}
+
+
+def _parse_since(value):
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise CommandError(f"--since must be an ISO date or datetime, got {value!r}")
+        parsed = timezone.datetime(day.year, day.month, day.day)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
 
 
 class Command(BaseCommand):
-    help = 'Manually trigger translation for existing models without translations'
+    help = 'Translate posts and categories that are missing translations (parallel and resumable)'
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -20,31 +64,162 @@ class Command(BaseCommand):
             default='deepl',
             help='Translation provider to use (default: deepl)'
         )
+        parser.add_argument(
+            '--language',
+            type=str,
+            help='Only fill this language (e.g. after adding it to LANGUAGES)'
+        )
+        parser.add_argument(
+            '--since',
+            type=str,
+            help='Only objects modified on or after this ISO date/datetime'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=2,
+            help='Objects translated concurrently (default: 2)'
+        )
+        parser.add_argument(
+            '--checkpoint',
+            type=str,
+            default=os.path.join(settings.BASE_DIR, '.translate_new_content.json'),
+            help='Checkpoint file recording finished objects'
+        )
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help='Ignore an existing checkpoint and start over'
+        )
 
     def handle(self, *args, **options):
         model_choice = options['model']
         provider = options['provider']
-        
-        if model_choice in ['post', 'all']:
-            self.stdout.write('Translating Posts...')
-            posts = Post.objects.all()
-            for post in posts:
-                try:
-                    translate_model_instance(post, Post)
-                    translate_with_provider(post, Post, provider_name=provider)
-                    self.stdout.write(f"✓ Translated: {post.title}")
-                except Exception as e:
-                    self.stdout.write(self.style.ERROR(f"✗ Error translating {post.title}: {e}"))
-        
-        if model_choice in ['category', 'all']:
-            self.stdout.write('Translating Categories...')
-            categories = Category.objects.all()
-            for category in categories:
+        target_language = options.get('language')
+        since = _parse_since(options['since']) if options.get('since') else None
+
+        languages = [code for code, _ in settings.LANGUAGES if code != settings.LANGUAGE_CODE]
+        if target_language:
+            if target_language not in languages:
+                raise CommandError(f"Language '{target_language}' is not a configured target language.")
+            languages = [target_language]
+
+        model_names = ['post', 'category'] if model_choice == 'all' else [model_choice]
+        run_key = {
+            'models': model_names,
+            'languages': languages,
+            'since': since.isoformat() if since else None,
+            'provider': provider,
+        }
+        checkpoint_path = options['checkpoint']
+        done = self._load_checkpoint(checkpoint_path, run_key, restart=options.get('restart'))
+
+        work = []
+        for model_name in model_names:
+            model_class, label_field = MODELS[model_name]
+            finished = set(done.setdefault(model_name, []))
+            candidates = [
+                obj for obj in self._missing(model_class, languages, since)
+                if obj.pk not in finished
+            ]
+            self.stdout.write(
+                f"{model_class.__name__}: {len(candidates)} object(s) to translate"
+                + (f" ({len(finished)} already done per checkpoint)" if finished else "")
+            )
+            work.extend((model_name, obj) for obj in candidates)
+
+        if not work:
+            self._clear_checkpoint(checkpoint_path)
+            self.stdout.write(self.style.SUCCESS('Nothing to translate.'))
+            return
+
+        failures = 0
+        with ThreadPoolExecutor(max_workers=max(1, options['workers']), thread_name_prefix='backfill') as pool:
+            futures = {
+                pool.submit(self._translate, model_name, obj, provider, languages): (model_name, obj)
+                for model_name, obj in work
+            }
+            for future in as_completed(futures):
+                model_name, obj = futures[future]
+                label = getattr(obj, MODELS[model_name][1])
                 try:
-                    translate_model_instance(category, Category)
-                    translate_with_provider(category, Category, provider_name=provider)
-                    self.stdout.write(f"✓ Translated: {category.name}")
+                    pending = future.result()
                 except Exception as e:
-                    self.stdout.write(self.style.ERROR(f"✗ Error translating {category.name}: {e}"))
-        
-        self.stdout.write(self.style.SUCCESS('Translation complete!'))
\ No newline at end of file
+                    failures += 1
+                    self.stdout.write(self.style.ERROR(f"✗ Error translating {label}: {e}"))
+                    continue
+                if pending:
+                    failures += 1
+                    self.stdout.write(self.style.ERROR(f"✗ {label}: {pending} translation(s) still pending"))
+                    continue
+                done[model_name].append(obj.pk)
+                self._save_checkpoint(checkpoint_path, run_key, done)
+                self.stdout.write(f"✓ Translated: {label}")
+
+        if failures:
+            raise CommandError(f"{failures} object(s) not fully translated; rerun to resume.")
+        self._clear_checkpoint(checkpoint_path)
+        self.stdout.write(self.style.SUCCESS('Translation complete!'))
+
+    def _missing(self, model_class, languages, since):
+        """Objects with fewer non-empty translations than languages x fields, in one query."""
+        fields = list(model_class.translatable_fields)
+        complete = Translation.objects.filter(
+            content_type=ContentType.objects.get_for_model(model_class),
+            object_id=Cast(OuterRef('pk'), CharField()),
+            language__in=languages,
+            field_name__in=fields,
+        ).exclude(field_value='').values('object_id').annotate(total=Count('pk')).values('total')
+        queryset = model_class.objects.annotate(
+            translated_count=Coalesce(Subquery(complete, output_field=IntegerField()), Value(0)),
+        ).filter(translated_count__lt=len(languages) * len(fields))
+        if since is not None:
+            queryset = queryset.filter(last_modified__gte=since)
+        return list(queryset.order_by('pk'))
+
+    def _translate(self, model_name, obj, provider, languages):
+        """Translate one object on a pool thread; returns the number of placeholders left empty."""
+        model_class = MODELS[model_name][0]
+        try:
+            translate_model_instance(obj, model_class, languages=languages)
+            translate_with_provider(obj, model_class, provider_name=provider, languages=languages)
+            if model_class is Post:
+                normalization.normalize_post(obj)
+            return Translation.objects.filter(
+                content_type=ContentType.objects.get_for_model(model_class),
+                object_id=str(obj.pk),
+                language__in=languages,
+                field_value='',
+            ).count()
+        finally:
+            translation_memory.flush()
+            connections.close_all()
+
+    def _load_checkpoint(self, path, run_key, restart=False):
+        if restart or not os.path.exists(path):
+            return {}
+        try:
+            with open(path, encoding='utf-8') as handle:
+                data = json.load(handle)
+        except (OSError, ValueError) as exc:
+            self.stdout.write(self.style.WARNING(f"Ignoring unreadable checkpoint {path}: {exc}"))
+            return {}
+        if data.get('run') != run_key:
+            self.stdout.write(self.style.WARNING(
+                f"Checkpoint {path} belongs to a different run; starting over (use --restart to silence)."
+            ))
+            return {}
+        self.stdout.write(f"Resuming from checkpoint {path}")
+        return data.get('done', {})
+
+    def _save_checkpoint(self, path, run_key, done):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as handle:
+            json.dump({'run': run_key, 'done': done}, handle)
+        os.replace(tmp_path, path)
+
+    def _clear_checkpoint(self, path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-19 06:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_remove_default_language_translations'),
+        ('django_restful_translator', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TranslationNormalization',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source_hash', models.CharField(max_length=64)),
+                ('value_hash', models.CharField(max_length=64)),
+                ('normalized_on', models.DateTimeField(auto_now=True)),
+                ('translation', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='blog_normalization', to='django_restful_translator.translation')),
+            ],
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.7 on 2026-10-19 06:33
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.utils.text import slugify
+
+
+def index_current_slugs(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    PostSlug = apps.get_model('blog', 'PostSlug')
+    Translation = apps.get_model('django_restful_translator', 'Translation')
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+
+    stored = {}
+    post_type = ContentType.objects.filter(app_label='blog', model='post').first()
+    if post_type is not None:
+        rows = Translation.objects.filter(content_type=post_type, field_name='slug')
+        for object_id, language, value in rows.values_list('object_id', 'language', 'field_value'):
+            stored[(object_id, language)] = value
+
+    seen = set()
+    entries = []
+    for post in Post.objects.order_by('pk'):
+        for language, _ in settings.LANGUAGES:
+            value = stored.get((str(post.pk), language))
+            slug = (slugify(value, allow_unicode=True) or value) if value else post.slug
+            if not slug or (language, slug) in seen:
+                continue
+            seen.add((language, slug))
+            entries.append(PostSlug(post=post, language=language, slug=slug, is_current=True))
+    PostSlug.objects.bulk_create(entries)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0009_translationnormalization'),
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('django_restful_translator', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostSlug',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('language', models.CharField(max_length=10)),
+                ('slug', models.CharField(max_length=255)),
+                ('is_current', models.BooleanField(default=True)),
+                ('created_on', models.DateTimeField(auto_now_add=True)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='slug_index', to='blog.post')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['post', 'language'], name='blog_postslug_post_lang_idx')],
+                'constraints': [models.UniqueConstraint(fields=('language', 'slug'), name='blog_postslug_language_slug_uniq')],
+            },
+        ),
+        migrations.RunPython(index_current_slugs, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,8 @@
 from django.db import models
-from django_restful_translator.models import TranslatableModel
+from django_restful_translator.models import TranslatableModel, Translation
 from django.utils.text import slugify
 from ckeditor_uploader.fields import RichTextUploadingField
-from blog.translation_cleanup import build_slug_lookup, clean_translation_html
+from blog.translation_lookup import translated_value, values_for
 from django.core.exceptions import ValidationError
 from django.core.validators import URLValidator
 from django.conf import settings
@@ -26,13 +26,10 @@ class Category(TranslatableModel):
             from django.utils import translation
             language = translation.get_language()
         
-        # Try to get from translations
-        translation_obj = self.translations.filter(
-            language=language, 
-            field_name='name'
-        ).first()
-        if translation_obj:
-            return translation_obj.field_value
+        # Served from prefetched translations or the process-wide lookup cache
+        value = translated_value(self, 'name', language)
+        if value is not None:
+            return value
         return self.name
 
 class Post(TranslatableModel):
@@ -61,81 +58,86 @@ class Post(TranslatableModel):
             from django.utils import translation
             language = translation.get_language()
         
-        # Try to get from translations
-        translation_obj = self.translations.filter(
-            language=language, 
-            field_name='title'
-        ).first()
-        if translation_obj:
-            return translation_obj.field_value
+        # Served from prefetched translations or the process-wide lookup cache
+        value = translated_value(self, 'title', language)
+        if value is not None:
+            return value
         return self.title
 
-    def _normalize_translation_body(self, language: str, translated_html: str) -> str:
-        slug_lookup = build_slug_lookup([self], language)
-        return clean_translation_html(self.body, translated_html, slug_lookup)
-
     def get_translated_slug(self, language=None):
-        """Return localized slug normalized for URLs or fallback to default slug."""
+        """
+        Return localized slug normalized for URLs or fallback to default slug.
+        Stored slugs are normalized by blog.normalization; slugify here only
+        covers rows written since, without touching the database.
+        """
         if language is None:
             from django.utils import translation
             language = translation.get_language()
-        default_language = settings.LANGUAGE_CODE
-
-        translation_obj = self.translations.filter(
-            language=language,
-            field_name='slug'
-        ).first()
-
-        if translation_obj and translation_obj.field_value:
-            normalized = slugify(translation_obj.field_value, allow_unicode=True)
-            if normalized and translation_obj.field_value != normalized:
-                translation_obj.field_value = normalized
-                translation_obj.save(update_fields=['field_value'])
-            if normalized:
-                return normalized
-            return translation_obj.field_value
-
-        fallback_slug = getattr(self, 'slug', None)
-        if language == default_language:
-            return fallback_slug
-
-        if fallback_slug:
-            if translation_obj:
-                if not translation_obj.field_value:
-                    translation_obj.field_value = fallback_slug
-                    translation_obj.save(update_fields=['field_value'])
-            else:
-                self.translations.create(
-                    language=language,
-                    field_name='slug',
-                    field_value=fallback_slug
-                )
-        return fallback_slug
+
+        value = translated_value(self, 'slug', language)
+        if value:
+            return slugify(value, allow_unicode=True) or value
+        return getattr(self, 'slug', None)
     
     def get_translated_body(self, language=None):
-        """Get translated body for specified language or current language"""
+        """
+        Get translated body for specified language or current language.
+        Bodies are cleaned when translated (see blog.normalization), so this is a plain lookup.
+        """
         if language is None:
             from django.utils import translation
             language = translation.get_language()
         
-        # Try to get from translations
-        translation_obj = self.translations.filter(
-            language=language, 
-            field_name='body'
-        ).first()
-        if translation_obj:
-            cleaned = self._normalize_translation_body(language, translation_obj.field_value)
-            if cleaned != translation_obj.field_value:
-                translation_obj.field_value = cleaned
-                translation_obj.save(update_fields=['field_value'])
-            return cleaned
+        # Served from prefetched translations or the process-wide lookup cache
+        value = translated_value(self, 'body', language)
+        if value is not None:
+            return value
         return self.body
     
     def has_translation_for_language(self, language):
         """
         Return True if the post has a translation stub in the specified language.
         """
-        return self.translations.filter(
-            language=language,
-            field_name='title'
-        ).exists()
+        return (language, 'title') in values_for(self)
+
+
+class TranslationNormalization(models.Model):
+    """Hashes recording what a translated post body was last cleaned against."""
+
+    translation = models.OneToOneField(
+        Translation,
+        on_delete=models.CASCADE,
+        related_name="blog_normalization",
+    )
+    source_hash = models.CharField(max_length=64)
+    value_hash = models.CharField(max_length=64)
+    normalized_on = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.translation_id}: {self.source_hash[:12]}"
+
+
+class PostSlug(models.Model):
+    """
+    Denormalized (language, slug) -> post index for blog_detail.
+    The current slug of each language has is_current=True; rows left behind by
+    renamed slugs stay as history so old URLs can redirect.
+    Kept in sync by blog.post_slugs.
+    """
+
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="slug_index")
+    language = models.CharField(max_length=10)
+    slug = models.CharField(max_length=255)
+    is_current = models.BooleanField(default=True)
+    created_on = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["language", "slug"], name="blog_postslug_language_slug_uniq"),
+        ]
+        indexes = [
+            models.Index(fields=["post", "language"], name="blog_postslug_post_lang_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.language}/{self.slug}"
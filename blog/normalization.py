@@ -0,0 +1,215 @@
+"""
+Materialize normalized post translations so page views are pure lookups.
+
+Translated slugs are slugified and missing ones filled with the default slug;
+translated bodies are run through clean_translation_html. Both happen when a
+post is translated, when its translations are edited in the admin, or through
+`manage.py refresh_translation_cleanups` -- never while rendering a page.
+A TranslationNormalization row remembers what each body was cleaned against,
+so unchanged bodies are skipped without parsing any HTML.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.utils.text import slugify
+from django_restful_translator.models import Translation
+
+from blog import slug_index, translation_writes
+from blog.models import Post, TranslationNormalization
+from blog.translation_cleanup import clean_translation_html
+
+logger = logging.getLogger(__name__)
+
+# Bump when clean_translation_html changes so every body is cleaned again.
+CLEANUP_VERSION = 1
+
+
+def content_hash(*parts: str) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update((part or "").encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _serialize_lookup(slug_lookup: Dict[str, str]) -> str:
+    return json.dumps(slug_lookup, sort_keys=True, ensure_ascii=False)
+
+
+def source_hash(source_body: str, slug_lookup: Dict[str, str]) -> str:
+    """Hash of everything a cleaned body depends on besides the translation itself."""
+    return _source_hash(source_body, _serialize_lookup(slug_lookup))
+
+
+def _source_hash(source_body: str, serialized_lookup: str) -> str:
+    return content_hash(str(CLEANUP_VERSION), source_body, serialized_lookup)
+
+
+def target_languages(language: Optional[str] = None) -> List[str]:
+    if language:
+        return [language]
+    return [code for code, _ in settings.LANGUAGES if code != settings.LANGUAGE_CODE]
+
+
+def _translations(posts: List[Post], field_name: str, languages: List[str]):
+    return Translation.objects.filter(
+        content_type=ContentType.objects.get_for_model(Post),
+        object_id__in=[str(post.pk) for post in posts],
+        field_name=field_name,
+        language__in=languages,
+    )
+
+
+def normalize_slugs(posts: Iterable[Post], languages: Iterable[str], dry_run: bool = False) -> int:
+    """
+    Slugify stored slug translations and create missing ones from the default
+    slug, reading every post's rows in one query and writing them in bulk.
+    """
+    posts, languages = list(posts), list(languages)
+    rows = {
+        (row.object_id, row.language): row
+        for row in _translations(posts, "slug", languages)
+    }
+    updated = 0
+    to_create = []
+    to_update = []
+    for post in posts:
+        for language in languages:
+            translation_obj = rows.get((str(post.pk), language))
+            if translation_obj and translation_obj.field_value:
+                normalized = slugify(translation_obj.field_value, allow_unicode=True)
+                if not normalized or normalized == translation_obj.field_value:
+                    continue
+                new_value = normalized
+            elif post.slug:
+                new_value = post.slug
+            else:
+                continue
+
+            updated += 1
+            if dry_run:
+                continue
+            if translation_obj:
+                translation_obj.field_value = new_value
+                to_update.append(translation_obj)
+            else:
+                to_create.append(
+                    Translation(
+                        content_type=ContentType.objects.get_for_model(Post),
+                        object_id=post.pk,
+                        language=language,
+                        field_name="slug",
+                        field_value=new_value,
+                    )
+                )
+            logger.info("Post %s slug for %s normalized to %s", post.pk, language, new_value)
+    translation_writes.bulk_write(created=to_create, updated=to_update)
+    return updated
+
+
+def normalize_post_slugs(post: Post, languages: Iterable[str], dry_run: bool = False) -> int:
+    """Slugify stored slug translations and create missing ones from the default slug."""
+    return normalize_slugs([post], languages, dry_run=dry_run)
+
+
+def normalize_bodies(
+    posts: Iterable[Post],
+    languages: Iterable[str],
+    slug_lookups: Dict[str, Dict[str, str]],
+    force: bool = False,
+    dry_run: bool = False,
+) -> List[Tuple[int, str]]:
+    """
+    Clean translated bodies whose source, slug lookup or text changed since the
+    last run; returns (post pk, language) for each body that changed.
+    slug_lookups maps language -> slug_index.post_slug_lookup(language).
+    Rows are read in one query and written with bulk_update in one transaction.
+    """
+    posts, languages = list(posts), list(languages)
+    by_id = {str(post.pk): post for post in posts}
+    serialized = {language: _serialize_lookup(slug_lookups[language]) for language in languages}
+    translations = (
+        _translations(posts, "body", languages)
+        .exclude(field_value="")
+        .select_related("blog_normalization")
+    )
+    updated = []
+    changed_rows = []
+    records = []
+    for translation_obj in translations:
+        post = by_id[translation_obj.object_id]
+        language = translation_obj.language
+        expected_source = _source_hash(post.body, serialized[language])
+        record = getattr(translation_obj, "blog_normalization", None)
+        if (
+            not force
+            and record is not None
+            and record.source_hash == expected_source
+            and record.value_hash == content_hash(translation_obj.field_value)
+        ):
+            continue
+
+        cleaned = clean_translation_html(post.body, translation_obj.field_value, slug_lookups[language])
+        changed = cleaned.strip() != (translation_obj.field_value or "").strip()
+        if changed:
+            updated.append((post.pk, language))
+        if dry_run:
+            continue
+        if changed:
+            translation_obj.field_value = cleaned
+            changed_rows.append(translation_obj)
+            logger.info("Post %s translation for %s normalized", post.pk, language)
+        records.append(
+            TranslationNormalization(
+                translation=translation_obj,
+                source_hash=expected_source,
+                value_hash=content_hash(translation_obj.field_value),
+            )
+        )
+    if not dry_run:
+        with transaction.atomic():
+            translation_writes.bulk_write(updated=changed_rows)
+            TranslationNormalization.objects.bulk_create(
+                records,
+                batch_size=translation_writes.BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=["translation"],
+                update_fields=["source_hash", "value_hash", "normalized_on"],
+            )
+    return updated
+
+
+def normalize_post_bodies(
+    post: Post,
+    languages: Iterable[str],
+    slug_lookups: Dict[str, Dict[str, str]],
+    force: bool = False,
+    dry_run: bool = False,
+) -> int:
+    """
+    Clean translated bodies whose source, slug lookup or text changed since the
+    last run. slug_lookups maps language -> slug_index.post_slug_lookup(language).
+    """
+    return len(normalize_bodies([post], languages, slug_lookups, force=force, dry_run=dry_run))
+
+
+def normalize_post(
+    post: Post,
+    language: Optional[str] = None,
+    force: bool = False,
+    dry_run: bool = False,
+) -> Dict[str, int]:
+    """Normalize one post's slug and body translations; returns update counts."""
+    languages = target_languages(language)
+    slugs = normalize_post_slugs(post, languages, dry_run=dry_run)
+    slug_lookups = {lang: slug_index.post_slug_lookup(lang) for lang in languages}
+    bodies = normalize_post_bodies(post, languages, slug_lookups, force=force, dry_run=dry_run)
+    return {"slugs": slugs, "bodies": bodies}
@@ -0,0 +1,86 @@
+"""Maintain and query the PostSlug index used to resolve blog_detail URLs."""
+
+import logging
+from typing import Dict, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.text import slugify
+
+from blog.models import Post, PostSlug
+
+logger = logging.getLogger(__name__)
+
+
+def current_slugs(post: Post) -> Dict[str, str]:
+    """
+    Return {language: URL slug} for every configured language, read straight
+    from the database (mirrors Post.get_translated_slug without its caches,
+    since this runs inside Translation save signals).
+    """
+    stored = dict(post.translations.filter(field_name="slug").values_list("language", "field_value"))
+    slugs = {}
+    for language, _ in settings.LANGUAGES:
+        value = stored.get(language)
+        slug = (slugify(value, allow_unicode=True) or value) if value else post.slug
+        if slug:
+            slugs[language] = slug
+    return slugs
+
+
+@transaction.atomic
+def sync_post_slugs(post: Post) -> int:
+    """
+    Point the index at post's current slugs, keeping replaced ones as history.
+    Returns the number of rows created or changed.
+    """
+    wanted = current_slugs(post)
+    rows = {(row.language, row.slug): row for row in PostSlug.objects.filter(post=post)}
+    changes = 0
+
+    for (language, slug), row in rows.items():
+        if row.is_current and wanted.get(language) != slug:
+            row.is_current = False
+            row.save(update_fields=["is_current"])
+            changes += 1
+
+    for language, slug in wanted.items():
+        row = rows.get((language, slug))
+        if row is not None:
+            if not row.is_current:
+                row.is_current = True
+                row.save(update_fields=["is_current"])
+                changes += 1
+            continue
+
+        taken = PostSlug.objects.select_for_update().filter(language=language, slug=slug).first()
+        if taken is None:
+            PostSlug.objects.create(post=post, language=language, slug=slug, is_current=True)
+        elif not taken.is_current:
+            # Another post's old slug is being reused; the live post wins.
+            taken.post = post
+            taken.is_current = True
+            taken.save(update_fields=["post", "is_current"])
+        else:
+            logger.warning(
+                "Slug %r for %s is already used by Post %s; Post %s not indexed for it",
+                slug,
+                language,
+                taken.post_id,
+                post.pk,
+            )
+            continue
+        changes += 1
+    return changes
+
+
+def resolve(language: str, slug: str) -> Optional[Tuple[Post, bool]]:
+    """Return (post, is_current) for a localized slug with one index probe, or None."""
+    row = (
+        PostSlug.objects.select_related("post")
+        .filter(language=language, slug=slug)
+        .first()
+    )
+    if row is None:
+        return None
+    return row.post, row.is_current
@@ -1,18 +1,34 @@
 import html
 import logging
-import re
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.core.exceptions import ImproperlyConfigured
 
 from blog.models import Post, Category
-from blog.translation_cleanup import build_slug_lookup, clean_translation_html
 from django.utils.text import slugify
 from django_restful_translator.models import Translation
 from django_restful_translator.processors.model import TranslationModelProcessor
 from django_restful_translator.processors.translation_service import TranslationService
 from django_restful_translator.translation_providers import TranslationProviderFactory
+from blog import (
+    language_switcher,
+    normalization,
+    post_slugs,
+    sitemap_files,
+    sitemaps,
+    slug_index,
+    translation_lookup,
+    translation_writes,
+)
+from pincatch import page_cache, segment_diff, translation_memory
+from pincatch.html_translation import translate_html, translate_text
+from pincatch.translation_executor import TranslationExecutor, throttled
+from pincatch.translation_gateway import ProviderUnavailable
+from pincatch.models import Page
+from pincatch.signals import pages_bulk_updated
 
 logger = logging.getLogger(__name__)
 
@@ -85,10 +101,14 @@ def _get_provider_safely(provider_name):
     return None
 
 
-def _safe_translate(provider, text, source_lang, target_lang, normalized_target=None):
+def _safe_translate(
+    provider, text, source_lang, target_lang, normalized_target=None, old_source=None, old_translations=()
+):
     """
     Translate text while preserving HTML structure and whitespace.
     Mirrors the defensive behavior used for dynamic Page translations.
+    With old_source (the text old_translations were made from), only the
+    segments that changed since are sent to the provider.
     """
     if not text:
         return text
@@ -100,60 +120,23 @@ def _safe_translate(provider, text, source_lang, target_lang, normalized_target=
         logger.warning("Unsupported target language %s; using source text", target_lang)
         return text
 
-    def _translate_html(html_text):
-        try:
-            from bs4 import BeautifulSoup, Comment
-        except Exception:
-            return None
-
-        def _apply_rtl(soup_obj):
-            block_tags = {"p", "li", "ul", "ol", "h1", "h2", "h3", "h4", "h5", "h6", "div", "section", "article", "details", "summary"}
-            for tag in soup_obj.find_all(block_tags):
-                if not tag.has_attr("dir"):
-                    tag["dir"] = "rtl"
-                current_style = tag.get("style", "")
-                if "text-align" not in current_style:
-                    tag["style"] = (current_style + "; text-align: right;").strip("; ")
-
-        def _preserve_whitespace(original, translated):
-            match = re.match(r"(\s*)(.*?)(\s*)$", original, flags=re.DOTALL)
-            if not match:
-                return translated
-            prefix, _, suffix = match.groups()
-            return f"{prefix}{translated}{suffix}"
-
-        try:
-            soup = BeautifulSoup(html_text, "html.parser")
-        except Exception:
-            return None
-
-        for node in soup.find_all(string=True):
-            if isinstance(node, Comment):
-                continue
-            if getattr(node, "parent", None) and node.parent.name in {"script", "style"}:
-                continue
-            original = str(node)
-            if not original.strip():
-                continue
-            try:
-                translated = provider.translate_text(original, source_lang, normalized)
-            except Exception:
-                translated = original
-            node.replace_with(_preserve_whitespace(original, translated))
-
-        if normalized.lower() in RTL_LANGS:
-            _apply_rtl(soup)
-
-        if soup.body:
-            return soup.body.decode_contents(formatter="minimal")
-        return "".join(str(element) for element in soup.contents)
+    rtl = normalized.lower() in RTL_LANGS
+    if old_source:
+        spliced = segment_diff.translate_changed(
+            provider, text, source_lang, normalized, old_source, old_translations, rtl=rtl
+        )
+        if spliced is not None:
+            return spliced
 
-    translated_html = _translate_html(text)
+    # Text nodes are batched into a few provider requests (see pincatch.html_translation).
+    translated_html = translate_html(provider, text, source_lang, normalized, rtl=rtl)
     if translated_html is not None:
         return translated_html
 
     try:
-        return provider.translate_text(text, source_lang, normalized)
+        return translate_text(provider, text, source_lang, normalized)
+    except ProviderUnavailable:
+        raise
     except Exception as exc:
         logger.error(
             "Translation error for %s -> %s: %s; using source text",
@@ -165,15 +148,17 @@ def _safe_translate(provider, text, source_lang, target_lang, normalized_target=
         return text
 
 
-def translate_model_instance(instance, model_class, reset_existing=False):
+def translate_model_instance(instance, model_class, reset_existing=False, languages=None):
     """
-    Translate a saved model instance to all configured languages except the default language
+    Translate a saved model instance to all configured languages except the default language.
+    Existing rows are read in one query; missing placeholders are bulk-created and
+    resets bulk-updated in a single transaction. languages restricts the targets.
     """
     try:
         logger.info(f"translate_model_instance called for {model_class.__name__} {instance.pk}")
         default_language = settings.LANGUAGE_CODE
         logger.info(f"Default language: {default_language}")
-        available_languages = [lang[0] for lang in settings.LANGUAGES]
+        available_languages = languages or [lang[0] for lang in settings.LANGUAGES]
         logger.info(f"Available languages: {available_languages}")
         translatable_fields = getattr(model_class, 'translatable_fields', [])
         logger.info(f"Translatable fields: {translatable_fields}")
@@ -184,20 +169,25 @@ def translate_model_instance(instance, model_class, reset_existing=False):
         
         content_type = ContentType.objects.get_for_model(model_class)
         logger.info(f"Content type: {content_type}")
-        
+
+        existing = {
+            (translation_obj.language, translation_obj.field_name): translation_obj
+            for translation_obj in Translation.objects.filter(
+                content_type=content_type,
+                object_id=instance.pk,
+                field_name__in=translatable_fields,
+            )
+        }
+        to_create = []
+        to_reset = []
+
         for target_language in available_languages:
             if target_language == default_language:
                 logger.info(f"Skipping default language: {default_language}")
                 continue
             
             for field_name in translatable_fields:
-                translation_obj = Translation.objects.filter(
-                    content_type=content_type,
-                    object_id=instance.pk,
-                    language=target_language,
-                    field_name=field_name
-                ).first()
-
+                translation_obj = existing.get((target_language, field_name))
                 original_value = getattr(instance, field_name, '')
 
                 if translation_obj:
@@ -208,7 +198,7 @@ def translate_model_instance(instance, model_class, reset_existing=False):
                         action = "Resetting" if reset_existing else "Re-queuing (same as source)"
                         logger.info(f"{action} translation for {field_name} in {target_language}")
                         translation_obj.field_value = ''
-                        translation_obj.save(update_fields=['field_value'])
+                        to_reset.append(translation_obj)
                         continue
                     if not original_value:
                         logger.warning(f"Field {field_name} has no value")
@@ -219,21 +209,22 @@ def translate_model_instance(instance, model_class, reset_existing=False):
                         logger.info(f"Translation for {field_name} in {target_language} already pending translation")
                     continue
 
-                if not translation_obj:
-                    if original_value:
-                        logger.info(f"Creating translation placeholder for {field_name} in {target_language}")
-                        print(f"Creating translation placeholder for {field_name} in {target_language}")
-                        Translation.objects.create(
+                if original_value:
+                    logger.info(f"Creating translation placeholder for {field_name} in {target_language}")
+                    to_create.append(
+                        Translation(
                             content_type=content_type,
                             object_id=instance.pk,
                             language=target_language,
                             field_name=field_name,
-                            field_value=''  # Empty placeholder so the provider will populate it
+                            field_value='',  # Empty placeholder so the provider will populate it
                         )
-                        logger.info("Translation placeholder created successfully")
-                    else:
-                        logger.warning(f"Field {field_name} has no value")
-                    continue
+                    )
+                else:
+                    logger.warning(f"Field {field_name} has no value")
+
+        translation_writes.bulk_write(created=to_create, updated=to_reset)
+        logger.info(f"Created {len(to_create)} translation placeholder(s), reset {len(to_reset)}")
 
     except Exception as e:
         logger.error(f"Error during translate_model_instance: {e}", exc_info=True)
@@ -292,11 +283,18 @@ class NormalizedTranslationService(TranslationService):
             raise
 
 
-def translate_with_provider(instance, model_class, provider_name='deepl'):
+def translate_with_provider(instance, model_class, provider_name='deepl', progress=None, languages=None):
     """
     Translate the model instance using the specified provider.
-    Process translations sequentially to avoid throttling and ensure every
-    configured language is attempted (similar to the dynamic Page flow).
+    Pending (empty) placeholders are translated in parallel by a
+    TranslationExecutor; provider calls share per-provider concurrency and
+    rate limits and are retried with backoff; while the provider's circuit
+    breaker is open they fail fast and the placeholders stay pending. Each result is saved as soon as
+    it arrives, so a rerun after an interruption only handles what is left.
+    Fields with a TranslationSnapshot only re-translate the segments edited
+    since that snapshot (pincatch.segment_diff). Results are written with
+    bulk_update every RESULT_BATCH_SIZE arrivals; progress(done, total) is
+    called after each batch. languages restricts the targets.
     """
     try:
         logger.info(
@@ -307,7 +305,7 @@ def translate_with_provider(instance, model_class, provider_name='deepl'):
         )
 
         default_language = settings.LANGUAGE_CODE
-        available_languages = [lang[0] for lang in settings.LANGUAGES]
+        available_languages = languages or [lang[0] for lang in settings.LANGUAGES]
         translatable_fields = getattr(model_class, 'translatable_fields', [])
 
         if not translatable_fields:
@@ -317,26 +315,20 @@ def translate_with_provider(instance, model_class, provider_name='deepl'):
         content_type = ContentType.objects.get_for_model(model_class)
 
         logger.info("Getting provider: %s", provider_name)
-        provider = _get_provider_safely(provider_name)
+        provider = throttled(_get_provider_safely(provider_name), provider_name)
         logger.info("Provider obtained: %s", provider)
 
-        translations_to_translate = []
-
-        for target_language in available_languages:
-            if target_language == default_language:
-                continue
-
-            for field_name in translatable_fields:
-                translation_obj = Translation.objects.filter(
-                    content_type=content_type,
-                    object_id=instance.pk,
-                    language=target_language,
-                    field_name=field_name
-                ).first()
-
-                if translation_obj and not translation_obj.field_value:
-                    translations_to_translate.append(translation_obj)
-                    logger.info("Queued translation for %s in %s", field_name, target_language)
+        translations_to_translate = list(
+            Translation.objects.filter(
+                content_type=content_type,
+                object_id=instance.pk,
+                language__in=[code for code in available_languages if code != default_language],
+                field_name__in=translatable_fields,
+                field_value='',
+            )
+        )
+        for translation_obj in translations_to_translate:
+            logger.info("Queued translation for %s in %s", translation_obj.field_name, translation_obj.language)
 
         logger.info("Total translations to translate: %s", len(translations_to_translate))
 
@@ -346,7 +338,7 @@ def translate_with_provider(instance, model_class, provider_name='deepl'):
 
         completed = 0
 
-        def _translate_value(text, target_language, field_name):
+        def _translate_value(text, target_language, field_name, snapshot=None):
             if not text:
                 return text
             normalized_lang = normalize_language_code(target_language)
@@ -364,7 +356,18 @@ def translate_with_provider(instance, model_class, provider_name='deepl'):
                     )
                     normalized = slugify(str(translated).replace(" ", "-"), allow_unicode=True)
                     return normalized or slugify(text, allow_unicode=True) or text
-                return _safe_translate(provider, text, settings.LANGUAGE_CODE, target_language, normalized_lang)
+                return _safe_translate(
+                    provider,
+                    text,
+                    settings.LANGUAGE_CODE,
+                    target_language,
+                    normalized_lang,
+                    old_source=snapshot.source_text if snapshot else None,
+                    old_translations=[snapshot.translated_text] if snapshot else (),
+                )
+            except ProviderUnavailable:
+                # Circuit open (pincatch.translation_gateway): leave the placeholder pending.
+                raise
             except Exception as exc:
                 logger.error(
                     "Translation error for %s -> %s (%s): %s; using source text",
@@ -376,106 +379,65 @@ def translate_with_provider(instance, model_class, provider_name='deepl'):
                 )
                 return text
 
-        for translation_obj in translations_to_translate:
-            target_lang = translation_obj.language
-            source_text = translation_obj.get_original_text()
-            translated = _translate_value(source_text, target_lang, translation_obj.field_name)
-            translation_obj.field_value = translated
-            translation_obj.save(update_fields=["field_value"])
-            completed += 1
-            logger.info(
-                "Translated %s in %s (%s/%s)",
-                translation_obj.field_name,
-                target_lang,
-                completed,
-                len(translations_to_translate),
-            )
-
-    except Exception as e:
-        logger.error("Error during translate_with_provider: %s", e, exc_info=True)
-
-
-def _ensure_translated_slugs(post: Post) -> None:
-    default_language = settings.LANGUAGE_CODE
-    target_languages = [lang for lang, _ in settings.LANGUAGES if lang != default_language]
-
-    for language in target_languages:
-        try:
-            translation_obj = post.translations.filter(
-                language=language,
-                field_name='slug'
-            ).first()
-
-            if translation_obj and translation_obj.field_value:
-                normalized_value = slugify(translation_obj.field_value, allow_unicode=True)
-                if normalized_value and translation_obj.field_value != normalized_value:
-                    translation_obj.field_value = normalized_value
-                    translation_obj.save(update_fields=['field_value'])
-                    logger.info(
-                        "Post %s slug for %s normalized to %s",
-                        post.pk,
-                        language,
-                        normalized_value,
-                    )
-                else:
-                    logger.info(
-                        "Post %s slug for %s already valid: %s",
-                        post.pk,
-                        language,
-                        translation_obj.field_value,
-                    )
-                continue
-
-            fallback_slug = post.slug
-            if translation_obj:
-                translation_obj.field_value = fallback_slug
-                translation_obj.save(update_fields=['field_value'])
-            else:
-                post.translations.create(
-                    language=language,
-                    field_name='slug',
-                    field_value=fallback_slug
-                )
-            logger.warning(
-                "Post %s slug for %s set to default slug: %s",
-                post.pk,
-                language,
-                fallback_slug,
+        # Source text and snapshots are read here (they touch the database); workers only call the provider.
+        by_pk = {translation_obj.pk: translation_obj for translation_obj in translations_to_translate}
+        sources = {pk: getattr(instance, translation_obj.field_name) for pk, translation_obj in by_pk.items()}
+        snapshot_keys = {
+            pk: segment_diff.snapshot_key(instance, translation_obj.field_name, translation_obj.language)
+            for pk, translation_obj in by_pk.items()
+        }
+        snapshots = segment_diff.load_snapshots(snapshot_keys.values())
+        jobs = [
+            (
+                pk,
+                _translate_value,
+                (
+                    sources[pk],
+                    translation_obj.language,
+                    translation_obj.field_name,
+                    snapshots.get(snapshot_keys[pk]),
+                ),
             )
-        except Exception as exc:
-            logger.error(
-                "Failed to ensure slug translation for Post %s language %s: %s",
-                post.pk,
-                language,
-                exc,
-                exc_info=True,
+            for pk, translation_obj in by_pk.items()
+        ]
+
+        unsaved = []
+
+        def _flush():
+            nonlocal completed
+            if not unsaved:
+                return
+            batch = [by_pk[pk] for pk in unsaved]
+            unsaved.clear()
+            translation_writes.bulk_write(updated=batch)
+            segment_diff.save_snapshots(
+                {
+                    snapshot_keys[translation_obj.pk]: (sources[translation_obj.pk], translation_obj.field_value)
+                    for translation_obj in batch
+                }
             )
+            translation_memory.flush()
+            completed += len(batch)
+            if progress is not None:
+                progress(completed, len(translations_to_translate))
+            logger.info("Saved %s translation(s) (%s/%s)", len(batch), completed, len(translations_to_translate))
+
+        def _save(pk, translated):
+            by_pk[pk].field_value = translated
+            unsaved.append(pk)
+            if len(unsaved) >= translation_writes.RESULT_BATCH_SIZE:
+                _flush()
 
+        try:
+            TranslationExecutor().run(jobs, on_result=_save)
+        finally:
+            _flush()
 
-def _post_translation_cleanup(post: Post) -> None:
-    """Normalize translated body HTML immediately after translation."""
-    translations = post.translations.filter(field_name='body').exclude(field_value="")
-    if not translations.exists():
-        return
-
-    source_body = post.body
-    all_posts = Post.objects.all().prefetch_related("translations")
-
-    for translation_obj in translations:
-        language = translation_obj.language
-        slug_lookup = build_slug_lookup(all_posts, language)
-        cleaned = clean_translation_html(source_body, translation_obj.field_value, slug_lookup)
-        if cleaned != translation_obj.field_value:
-            translation_obj.field_value = cleaned
-            translation_obj.save(update_fields=["field_value"])
-            logger.info(
-                "Post %s translation for %s normalized during post-save cleanup",
-                post.pk,
-                language,
-            )
+    except Exception as e:
+        logger.error("Error during translate_with_provider: %s", e, exc_info=True)
 
 
-def _do_post_translation(post_id, reset_existing=False):
+def _do_post_translation(post_id, reset_existing=False, progress=None):
     """
     Deferred translation task for Post - called after transaction commits
     """
@@ -486,16 +448,16 @@ def _do_post_translation(post_id, reset_existing=False):
         logger.info(f"Post {post_id} is {state}. Starting translation...")
         translate_model_instance(post, Post, reset_existing=reset_existing)
         logger.info(f"Translation objects prepared for Post {post_id}")
-        translate_with_provider(post, Post, provider_name='deepl')
+        translate_with_provider(post, Post, provider_name='deepl', progress=progress)
         logger.info(f"Translation completed for Post {post_id}")
-        _ensure_translated_slugs(post)
-        _post_translation_cleanup(post)
+        # Materialize normalized slugs and cleaned bodies so page views never write.
+        normalization.normalize_post(post)
     except Exception as e:
         print(f"❌ Post translation failed: {e}")
         logger.error(f"Post translation failed: {e}", exc_info=True)
 
 
-def _do_category_translation(category_id, reset_existing=False):
+def _do_category_translation(category_id, reset_existing=False, progress=None):
     """
     Deferred translation task for Category - called after transaction commits
     """
@@ -506,8 +468,106 @@ def _do_category_translation(category_id, reset_existing=False):
         logger.info(f"Category {category_id} is {state}. Starting translation...")
         translate_model_instance(category, Category, reset_existing=reset_existing)
         logger.info(f"Translation objects prepared for Category {category_id}")
-        translate_with_provider(category, Category, provider_name='deepl')
+        translate_with_provider(category, Category, provider_name='deepl', progress=progress)
         logger.info(f"Translation completed for Category {category_id}")
     except Exception as e:
         print(f"❌ Category translation failed: {e}")
         logger.error(f"Category translation failed: {e}", exc_info=True)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Translation)
+@receiver(post_delete, sender=Translation)
+def invalidate_rendered_pages(sender, **kwargs):
+    """Homepages list the latest posts, so blog changes drop cached page renders too."""
+    page_cache.invalidate_all()
+    language_switcher.invalidate()
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Page)
+@receiver(post_delete, sender=Page)
+@receiver(pages_bulk_updated, sender=Page)
+def invalidate_language_switcher(sender, **kwargs):
+    """Alternate-language URLs depend on page slugs and category names."""
+    language_switcher.invalidate()
+
+
+@receiver(post_save, sender=Translation)
+@receiver(post_delete, sender=Translation)
+def invalidate_translation_lookup(sender, **kwargs):
+    """get_translated_* reads are served from a process cache of Translation rows."""
+    translation_lookup.invalidate()
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Translation)
+@receiver(post_delete, sender=Translation)
+def invalidate_slug_index(sender, **kwargs):
+    """Category URLs are resolved from an in-memory index of translated names."""
+    slug_index.invalidate()
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Translation)
+@receiver(post_delete, sender=Translation)
+def invalidate_post_slug_lookups(sender, instance, **kwargs):
+    """Body link rewriting reads a cached default -> localized post slug map."""
+    if sender is Translation and instance.field_name != 'slug':
+        return
+    slug_index.invalidate_post_slug_lookups()
+
+
+@receiver(post_save, sender=Post)
+def sync_post_slug_index(sender, instance, raw=False, **kwargs):
+    """Keep PostSlug in step with the default slug."""
+    if raw:
+        return
+    post_slugs.sync_post_slugs(instance)
+
+
+@receiver(post_save, sender=Translation)
+@receiver(post_delete, sender=Translation)
+def sync_translated_slug_index(sender, instance, raw=False, **kwargs):
+    """Keep PostSlug in step with translated slugs."""
+    if raw or instance.field_name != 'slug':
+        return
+    if isinstance(kwargs.get('origin'), Post):
+        # The post itself is being deleted; its PostSlug rows cascade with it.
+        return
+    if instance.content_type_id != ContentType.objects.get_for_model(Post).pk:
+        return
+    post = Post.objects.filter(pk=instance.object_id).first()
+    if post is not None:
+        post_slugs.sync_post_slugs(post)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Page)
+@receiver(post_delete, sender=Page)
+@receiver(pages_bulk_updated, sender=Page)
+def invalidate_sitemap_sections(sender, **kwargs):
+    """Refresh the sitemap sections (cached and on-disk) of the changed content type."""
+    kind = {Post: 'posts', Category: 'categories', Page: 'pages'}[sender]
+    sitemaps.invalidate(kind)
+    sitemap_files.refresh(kind)
+
+
+@receiver(post_save, sender=Translation)
+@receiver(post_delete, sender=Translation)
+def invalidate_translated_sitemap_section(sender, instance, **kwargs):
+    """Translated post slugs and category names only change one language's section."""
+    content_types = ContentType.objects.get_for_models(Post, Category)
+    if instance.field_name == 'slug' and instance.content_type_id == content_types[Post].pk:
+        sitemaps.invalidate('posts', instance.language)
+        sitemap_files.refresh('posts', instance.language)
+    elif instance.field_name == 'name' and instance.content_type_id == content_types[Category].pk:
+        sitemaps.invalidate('categories', instance.language)
+        sitemap_files.refresh('categories', instance.language)
@@ -0,0 +1,110 @@
+"""
+Precomputed sitemap files, so the web server can answer crawlers without Django.
+
+Every section from blog.sitemaps is written to
+SITEMAP_FILES_ROOT/sitemap-<kind>-<language>.xml.gz, plus a sitemap.xml index
+(and a .gz copy for gzip_static) whose entries point at those files. With
+SITEMAP_FILES_ENABLED set, content signals rewrite only the affected sections
+and the index; `manage.py build_sitemaps` rebuilds everything. Serve the directory at SITEMAP_FILES_URL
+and alias /sitemap.xml to the index file, e.g. with Nginx:
+
+    location = /sitemap.xml { alias /srv/pincatch/media/sitemaps/sitemap.xml; }
+    location /media/sitemaps/ { alias /srv/pincatch/media/sitemaps/; }
+"""
+
+import gzip
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+
+from blog import sitemaps
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = "sitemap.xml"
+
+
+def enabled():
+    return getattr(settings, "SITEMAP_FILES_ENABLED", False)
+
+
+def files_root() -> Path:
+    return Path(getattr(settings, "SITEMAP_FILES_ROOT", Path(settings.MEDIA_ROOT) / "sitemaps"))
+
+
+def files_url() -> str:
+    return getattr(settings, "SITEMAP_FILES_URL", f"{settings.MEDIA_URL}sitemaps/")
+
+
+def section_filename(section) -> str:
+    return f"sitemap-{section.name}.xml.gz"
+
+
+def _write_atomic(path: Path, chunks, compress):
+    """Write chunks to a temp file next to path and rename it into place."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as raw:
+            stream = gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) if compress else raw
+            for chunk in chunks:
+                stream.write(chunk.encode("utf-8"))
+            if compress:
+                stream.close()
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def write_section(section, root=None):
+    root = root or sitemaps.base_url()
+    _write_atomic(files_root() / section_filename(section), sitemaps.iter_urlset(section, root), compress=True)
+
+
+def write_index(root=None):
+    root = root or sitemaps.base_url()
+    base = root + files_url()
+
+    def location_for(section):
+        return base + section_filename(section)
+
+    body = "".join(sitemaps.iter_index(location_for))
+    _write_atomic(files_root() / INDEX_FILENAME, [body], compress=False)
+    _write_atomic(files_root() / f"{INDEX_FILENAME}.gz", [body], compress=True)
+
+
+def build_all():
+    """Write every section and the index; returns the number of section files."""
+    root = sitemaps.base_url()
+    sections = sitemaps.all_sections()
+    for section in sections:
+        write_section(section, root)
+    write_index(root)
+    return len(sections)
+
+
+def _rebuild(kind, language):
+    try:
+        root = sitemaps.base_url()
+        for section in sitemaps.all_sections():
+            if section.kind == kind and language in (None, section.language):
+                write_section(section, root)
+        write_index(root)
+    except Exception:
+        # A stale file is better than a failed save; build_sitemaps repairs it.
+        logger.exception("Failed to rewrite sitemap files for %s/%s", kind, language or "*")
+
+
+def refresh(kind, language=None):
+    """Rewrite the files for one kind (optionally one language) once the transaction commits."""
+    if enabled():
+        transaction.on_commit(lambda: _rebuild(kind, language))
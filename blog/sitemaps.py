@@ -1,104 +1,289 @@
+"""
+Sitemaps split into one section per (content type, language).
+
+/sitemap.xml is a sitemap index pointing at /sitemap-<kind>-<language>.xml.
+Each section is written as a stream of XML chunks from lightweight value
+queries (or the Page routing table), then cached. Section cache keys carry a
+version that signals bump for just the affected kind/language, and responses
+carry Last-Modified from the newest entry so crawlers can revalidate cheaply.
+"""
+
+from datetime import datetime
+from typing import Iterator, NamedTuple, Optional, Tuple
+from xml.sax.saxutils import escape
+
 from django.conf import settings
-from django.contrib.sitemaps import Sitemap
+from django.contrib.sites.shortcuts import get_current_site
+from django.core.cache import cache
+from django.db.models import Max
+from django.http import Http404, HttpResponse, StreamingHttpResponse
 from django.urls import reverse
 from django.utils import translation
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 from django.utils.text import slugify
 
-from .models import Post, Category
-from pincatch.models import Page
-
-
-class StaticViewSitemap(Sitemap):
-    changefreq = "weekly"
-    priority = 1.0
-    protocol = "https"
-
-    def items(self):
-        names = [
-            "home",
-            "about",
-            "contactUs",
-            "privacyPolicy",
-            "termsAndConditions",
-            "copyrightPolicy",
-            "blog",
-        ]
-        return [
-            (language_code, name)
-            for language_code, _ in settings.LANGUAGES
-            for name in names
-        ]
-
-    def location(self, item):
-        language_code, name = item
-        with translation.override(language_code):
-            return reverse(name)
-
-
-class PostSitemap(Sitemap):
-    changefreq = "weekly"
-    priority = 1.0
-    protocol = "https"
-
-    def items(self):
-        return [
-            (language_code, post)
-            for language_code, _ in settings.LANGUAGES
-            for post in Post.objects.all()
-        ]
-
-    def location(self, item):
-        language_code, post = item
-        with translation.override(language_code):
-            return reverse("blog_detail", args=[post.slug])
-
-    def lastmod(self, item):
-        _, post = item
-        return post.last_modified
-
-
-class CategorySitemap(Sitemap):
-    changefreq = "weekly"
-    priority = 1.0
-    protocol = "https"
-
-    def items(self):
-        return [
-            (language_code, category)
-            for language_code, _ in settings.LANGUAGES
-            for category in Category.objects.all()
-        ]
-
-    def location(self, item):
-        language_code, category = item
-        with translation.override(language_code):
-            category_slug = slugify(category.get_translated_name(language_code), allow_unicode=True)
-            return reverse("blog_category", args=[category_slug])
-
-    def lastmod(self, item):
-        _, category = item
-        return category.last_modified
-
-
-class PageSitemap(Sitemap):
-    changefreq = "weekly"
-    priority = 0.8
-    protocol = "https"
-
-    def items(self):
-        return Page.objects.all()
-
-    def location(self, page: Page):
+from blog.models import Category, PostSlug
+from blog.translation_lookup import load_translation_map
+from pincatch.routing import get_routing_table
+from pincatch.versioned_cache import bump_version, shared_version
+
+SECTION_KINDS = ("static", "posts", "categories", "pages")
+STATIC_VIEW_NAMES = (
+    "home",
+    "about",
+    "contactUs",
+    "privacyPolicy",
+    "termsAndConditions",
+    "copyrightPolicy",
+    "blog",
+)
+PRIORITIES = {"static": "1.0", "posts": "1.0", "categories": "1.0", "pages": "0.8"}
+CHANGEFREQ = "weekly"
+PROTOCOL = "https"
+
+URLSET_OPEN = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+)
+URLSET_CLOSE = "</urlset>\n"
+INDEX_OPEN = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+)
+INDEX_CLOSE = "</sitemapindex>\n"
+CONTENT_TYPE = "application/xml"
+
+
+class Section(NamedTuple):
+    kind: str
+    language: str
+
+    @property
+    def name(self):
+        return f"{self.kind}-{self.language}"
+
+
+def all_sections():
+    return [
+        Section(kind, language)
+        for language, _ in settings.LANGUAGES
+        for kind in SECTION_KINDS
+    ]
+
+
+def parse_section(name) -> Optional[Section]:
+    kind, _, language = name.partition("-")
+    section = Section(kind, language)
+    return section if section in all_sections() else None
+
+
+# --- entries: (path, lastmod) per section ---------------------------------
+
+def _static_entries(language) -> Iterator[Tuple[str, Optional[datetime]]]:
+    with translation.override(language):
+        for name in STATIC_VIEW_NAMES:
+            yield reverse(name), None
+
+
+def _post_entries(language):
+    rows = (
+        PostSlug.objects.filter(language=language, is_current=True)
+        .order_by("post_id")
+        .values_list("slug", "post__last_modified")
+    )
+    with translation.override(language):
+        for slug, last_modified in rows.iterator():
+            yield reverse("blog_detail", args=[slug]), last_modified
+
+
+def _category_entries(language):
+    categories = list(Category.objects.order_by("pk").only("pk", "name", "last_modified"))
+    names = load_translation_map(categories, language=language, fields=["name"])
+    with translation.override(language):
+        for category in categories:
+            name = names.get((str(category.pk), language, "name"))
+            if name is None:
+                name = category.name
+            yield reverse("blog_category", args=[slugify(name, allow_unicode=True)]), category.last_modified
+
+
+def _page_entries(language):
+    table = get_routing_table()
+    for record in sorted(table.by_url.values(), key=lambda record: record.pk):
+        if record.language != language:
+            continue
         # Homepage URLs are handled separately to respect language-root placement.
-        if page.is_homepage:
-            lang_slug = page.get_language_slug()
-            if lang_slug:
-                return reverse("home_language", kwargs={"language_slug": lang_slug})
-            return reverse("home")
-
-        language_slug = page.get_language_slug()
-        slug = page.slug_url
-        return reverse("page_view", kwargs={"language_slug": language_slug, "slug": slug})
-
-    def lastmod(self, page: Page):
-        return page.last_modified
+        language_slug = record.get_language_slug()
+        if record.is_homepage:
+            if language_slug:
+                path = reverse("home_language", kwargs={"language_slug": language_slug})
+            else:
+                path = reverse("home")
+        else:
+            path = reverse("page_view", kwargs={"language_slug": language_slug, "slug": record.slug_url})
+        yield path, record.last_modified
+
+
+ENTRY_BUILDERS = {
+    "static": _static_entries,
+    "posts": _post_entries,
+    "categories": _category_entries,
+    "pages": _page_entries,
+}
+
+
+# --- XML writers ------------------------------------------------------------
+
+def base_url(request=None):
+    """Return scheme://domain used for <loc> values."""
+    return f"{PROTOCOL}://{get_current_site(request).domain}"
+
+
+def iter_urlset(section: Section, root: str, state: Optional[dict] = None) -> Iterator[str]:
+    """
+    Yield the <urlset> for section in chunks.
+    If given, state["lastmod"] ends up holding the newest entry's lastmod.
+    """
+    state = state if state is not None else {}
+    state["lastmod"] = None
+    yield URLSET_OPEN
+    for path, lastmod in ENTRY_BUILDERS[section.kind](section.language):
+        chunk = f"  <url>\n    <loc>{escape(root + path)}</loc>\n"
+        if lastmod:
+            chunk += f"    <lastmod>{lastmod:%Y-%m-%d}</lastmod>\n"
+            if state["lastmod"] is None or lastmod > state["lastmod"]:
+                state["lastmod"] = lastmod
+        chunk += (
+            f"    <changefreq>{CHANGEFREQ}</changefreq>\n"
+            f"    <priority>{PRIORITIES[section.kind]}</priority>\n"
+            "  </url>\n"
+        )
+        yield chunk
+    yield URLSET_CLOSE
+
+
+def section_lastmods():
+    """Return {Section: newest lastmod or None} with one aggregate query per model."""
+    posts = dict(
+        PostSlug.objects.filter(is_current=True)
+        .values_list("language")
+        .annotate(latest=Max("post__last_modified"))
+        .values_list("language", "latest")
+    )
+    categories = Category.objects.aggregate(latest=Max("last_modified"))["latest"]
+    pages = {}
+    for record in get_routing_table().by_url.values():
+        if record.last_modified and (
+            record.language not in pages or record.last_modified > pages[record.language]
+        ):
+            pages[record.language] = record.last_modified
+
+    lastmods = {}
+    for section in all_sections():
+        lastmods[section] = {
+            "static": None,
+            "posts": posts.get(section.language),
+            "categories": categories,
+            "pages": pages.get(section.language),
+        }[section.kind]
+    return lastmods
+
+
+def iter_index(location_for) -> Iterator[str]:
+    """Yield the <sitemapindex>; location_for(section) returns each section's absolute URL."""
+    yield INDEX_OPEN
+    for section, lastmod in section_lastmods().items():
+        chunk = f"  <sitemap>\n    <loc>{escape(location_for(section))}</loc>\n"
+        if lastmod:
+            chunk += f"    <lastmod>{lastmod.isoformat()}</lastmod>\n"
+        yield chunk + "  </sitemap>\n"
+    yield INDEX_CLOSE
+
+
+# --- caching ----------------------------------------------------------------
+
+INDEX_VERSION_KEY = "sitemap:version:index"
+
+
+def _version_key(kind, language):
+    return f"sitemap:version:{kind}:{language}"
+
+
+def invalidate(kind=None, language=None):
+    """
+    Mark sitemap sections stale: one kind (or all kinds) in one language (or all
+    languages, stored under "*"). The index is always refreshed as well.
+    """
+    kinds = [kind] if kind else SECTION_KINDS
+    for each in kinds:
+        bump_version(_version_key(each, language or "*"))
+    bump_version(INDEX_VERSION_KEY)
+
+
+def _section_cache_key(section, root):
+    keys = [_version_key(section.kind, "*"), _version_key(section.kind, section.language)]
+    version = ".".join(str(shared_version(key)) for key in keys)
+    return f"sitemap:section:{section.name}:{version}:{root}"
+
+
+def _index_cache_key(root):
+    return f"sitemap:index:{shared_version(INDEX_VERSION_KEY)}:{root}"
+
+
+def _cache_seconds():
+    return getattr(settings, "SITEMAP_CACHE_SECONDS", 24 * 3600)
+
+
+def _cached_response(request, entry):
+    body, lastmod = entry
+    if lastmod:
+        last_modified = int(lastmod.timestamp())
+        conditional = get_conditional_response(request, last_modified=last_modified)
+        if conditional is not None:
+            return conditional
+    response = HttpResponse(body, content_type=CONTENT_TYPE)
+    if lastmod:
+        response["Last-Modified"] = http_date(lastmod.timestamp())
+    return response
+
+
+def _stream_and_cache(chunks, key, state):
+    """Pass chunks through to the client and cache the body once it is complete."""
+    parts = []
+    for chunk in chunks:
+        parts.append(chunk)
+        yield chunk
+    cache.set(key, ("".join(parts), state.get("lastmod")), _cache_seconds())
+
+
+def sitemap_section(request, section):
+    parsed = parse_section(section)
+    if parsed is None:
+        raise Http404("No such sitemap section")
+    root = base_url(request)
+    key = _section_cache_key(parsed, root)
+    entry = cache.get(key)
+    if entry is not None:
+        return _cached_response(request, entry)
+    state = {}
+    return StreamingHttpResponse(
+        _stream_and_cache(iter_urlset(parsed, root, state), key, state),
+        content_type=CONTENT_TYPE,
+    )
+
+
+def sitemap_index(request):
+    root = base_url(request)
+    key = _index_cache_key(root)
+    entry = cache.get(key)
+    if entry is not None:
+        return _cached_response(request, entry)
+
+    def location_for(section):
+        return root + reverse("sitemap_section", kwargs={"section": section.name})
+
+    return StreamingHttpResponse(
+        _stream_and_cache(iter_index(location_for), key, {}),
+        content_type=CONTENT_TYPE,
+    )
@@ -0,0 +1,85 @@
+"""
+In-memory slug indexes: (language, localized slug) -> object for blog URL
+resolution, and default -> localized post slugs for rewriting body links.
+"""
+
+from typing import Dict, Optional, Tuple
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.utils.text import slugify
+from django_restful_translator.models import Translation
+
+from blog.models import Category, Post
+from blog.translation_lookup import load_translation_map
+from pincatch.versioned_cache import VersionedLocalCache
+
+_indexes = VersionedLocalCache("blog-slug-index")
+_post_slug_lookups = VersionedLocalCache("blog-post-slug-lookup")
+
+
+def invalidate() -> None:
+    """Rebuild slug indexes in every worker after a Category or Translation changes."""
+    _indexes.invalidate()
+
+
+def invalidate_post_slug_lookups() -> None:
+    """Rebuild post slug lookups after a post or a slug translation changes."""
+    _post_slug_lookups.invalidate()
+
+
+def _build_category_index() -> Dict[Tuple[str, str], int]:
+    """
+    Map every language's slugified translated name, and the slugified default
+    name, to the category pk. Earlier categories win on collisions, matching
+    the first-match scan blog_category used to do.
+    """
+    categories = list(Category.objects.order_by("pk").only("pk", "name"))
+    names = load_translation_map(categories, fields=["name"])
+    index: Dict[Tuple[str, str], int] = {}
+    for language, _ in settings.LANGUAGES:
+        for category in categories:
+            translated_name = names.get((str(category.pk), language, "name"))
+            if translated_name is None:
+                translated_name = category.name
+            index.setdefault((language, slugify(translated_name, allow_unicode=True)), category.pk)
+            index.setdefault((language, slugify(category.name, allow_unicode=True)), category.pk)
+    return index
+
+
+def category_pk_for_slug(language: str, slug: str) -> Optional[int]:
+    """Return the pk of the category whose URL slug in language is slug, or None."""
+    index = _indexes.get("category", _build_category_index)
+    return index.get((language, slug))
+
+
+def _build_post_slug_lookups() -> Dict[str, Dict[str, str]]:
+    """
+    {language: {default slug: localized slug}} for every post and configured
+    language, from two queries. Same values as Post.get_translated_slug.
+    """
+    base_slugs = dict(Post.objects.exclude(slug="").values_list("pk", "slug"))
+    stored = Translation.objects.filter(
+        content_type=ContentType.objects.get_for_model(Post),
+        field_name="slug",
+    ).exclude(field_value="")
+    translated = {
+        (object_id, language): value
+        for object_id, language, value in stored.values_list("object_id", "language", "field_value")
+    }
+    lookups = {}
+    for language, _ in settings.LANGUAGES:
+        lookup = {}
+        for pk, base_slug in base_slugs.items():
+            value = translated.get((str(pk), language))
+            lookup[str(base_slug)] = (slugify(value, allow_unicode=True) or value) if value else str(base_slug)
+        lookups[language] = lookup
+    return lookups
+
+
+def post_slug_lookup(language: str) -> Dict[str, str]:
+    """
+    Map default-language post slugs to their slugs in language, as used to
+    rewrite internal links in translated bodies. Shared, cached copy; don't mutate.
+    """
+    return _post_slug_lookups.get("all", _build_post_slug_lookups).get(language, {})
@@ -1,3 +1,41 @@
-from django.test import TestCase
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase, override_settings
+from django_restful_translator.models import Translation
 
-# Create your tests here.
+from blog import translation_lookup
+from blog.models import Post
+
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "blog-tests-default"},
+    "state": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "blog-tests-state"},
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHES, STATE_CACHE_ALIAS="state")
+class TranslationLookupTests(TestCase):
+    def setUp(self):
+        self.post = Post.objects.create(title="Hello", body="<p>Hello</p>", slug="hello")
+        content_type = ContentType.objects.get_for_model(Post)
+        for field_name, value in (("title", "Hallo"), ("body", "<p>Hallo</p>")):
+            Translation.objects.update_or_create(
+                content_type=content_type,
+                object_id=str(self.post.pk),
+                language="de",
+                field_name=field_name,
+                defaults={"field_value": value},
+            )
+        translation_lookup.invalidate()
+
+    def test_bodies_are_read_per_request_and_not_cached(self):
+        post = Post.objects.get(pk=self.post.pk)
+        self.assertEqual(post.get_translated_title("de"), "Hallo")
+        self.assertEqual(post.get_translated_body("de"), "<p>Hallo</p>")
+        self.assertEqual(translation_lookup.field_values(post, "body"), {"de": "<p>Hallo</p>"})
+        cached = translation_lookup.values_for(post)
+        self.assertIn(("de", "title"), cached)
+        self.assertNotIn(("de", "body"), cached)
+
+    def test_prefetched_bodies_need_no_query(self):
+        post = Post.objects.prefetch_related("translations").get(pk=self.post.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(post.get_translated_body("de"), "<p>Hallo</p>")
@@ -1,89 +1,155 @@
-"""Utilities for cleaning translated HTML content and rewriting internal links."""
+"""
+Utilities for cleaning translated HTML content and rewriting internal links.
+
+Each document is parsed once. The source side is analyzed into a reusable
+_SourceDocument (tag inventory, list index, tag counts) that is memoized per
+source HTML, so cleaning one post for every language parses its body once;
+the translation is then cleaned in place in a single pass per step.
+TRANSLATION_CLEANUP_PARSER selects the BeautifulSoup backend ("lxml" is
+several times faster than the default "html.parser" when installed).
+"""
 
 from __future__ import annotations
 
+import copy
 import re
-from typing import Dict, Iterable, List, Optional, Set, Tuple
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
 from urllib.parse import urlparse, urlunparse
 
-from bs4 import BeautifulSoup, NavigableString, Tag
+from bs4 import BeautifulSoup, FeatureNotFound, NavigableString, Tag
+from django.conf import settings
+
+LIST_ATTRS = ("type", "start", "reversed", "class", "style")
+ITEM_ATTRS = ("class", "style")
+CRITICAL_TAGS = {"p", "ol", "ul", "li", "h1", "h2", "h3", "h4", "h5", "h6"}
+RESTORE_TARGETS = ["h1", "h2", "h3", "h4", "h5", "h6", "p", "li", "blockquote"]
+
+
+@lru_cache(maxsize=None)
+def _parser_available(name: str) -> bool:
+    try:
+        BeautifulSoup("", name)
+    except FeatureNotFound:
+        return False
+    return True
+
+
+def _parse(html: str) -> BeautifulSoup:
+    parser = getattr(settings, "TRANSLATION_CLEANUP_PARSER", "html.parser")
+    if not _parser_available(parser):
+        parser = "html.parser"
+    return BeautifulSoup(html or "", parser)
+
+
+class _SourceItem(NamedTuple):
+    attrs: Dict[str, object]
+    needs_paragraph: bool
+
+
+class _SourceList(NamedTuple):
+    name: str
+    attrs: Dict[str, object]
+    items: List[_SourceItem]
+
+
+class _SourceDocument(NamedTuple):
+    """Read-only analysis of the source HTML; shared, so never mutate soup."""
 
+    soup: BeautifulSoup
+    tag_names: Set[str]
+    tag_count: int
+    critical_count: int
+    lists: List[_SourceList]
 
-def _allowed_tags_from_original(html: str) -> Set[str]:
-    """Return the set of tag names present in the original HTML."""
-    soup = BeautifulSoup(html or "", "html.parser")
-    return {tag.name for tag in soup.find_all(True)}
 
+def _index_list(tag: Tag) -> _SourceList:
+    items = [
+        _SourceItem(
+            attrs={attr: item[attr] for attr in ITEM_ATTRS if attr in item.attrs},
+            needs_paragraph=any(child.name == "p" for child in item.children if isinstance(child, Tag)),
+        )
+        for item in tag.find_all("li", recursive=False)
+    ]
+    return _SourceList(
+        name=tag.name,
+        attrs={attr: tag[attr] for attr in LIST_ATTRS if attr in tag.attrs},
+        items=items,
+    )
 
-def _normalize_lists(original_soup: BeautifulSoup, translated_soup: BeautifulSoup) -> None:
+
+@lru_cache(maxsize=64)
+def _source_document(original_html: str) -> _SourceDocument:
+    soup = _parse(original_html)
+    tags = soup.find_all(True)
+    return _SourceDocument(
+        soup=soup,
+        tag_names={tag.name for tag in tags},
+        tag_count=len(tags),
+        critical_count=sum(1 for tag in tags if tag.name in CRITICAL_TAGS),
+        lists=[_index_list(tag) for tag in tags if tag.name in ("ul", "ol")],
+    )
+
+
+def _copy_attrs(target: Tag, source_attrs: Dict[str, object], names: Iterable[str]) -> None:
+    for attr in names:
+        if attr in source_attrs:
+            target[attr] = source_attrs[attr]
+        elif attr in target.attrs:
+            del target[attr]
+
+
+def _normalize_lists(source: _SourceDocument, translated_soup: BeautifulSoup) -> None:
     """Align unordered and ordered lists with the original structure."""
-    original_lists = original_soup.find_all(["ul", "ol"])
     translated_lists = translated_soup.find_all(["ul", "ol"])
 
     # Remove extra lists that do not exist in the source content
-    if len(translated_lists) > len(original_lists):
-        for extra in translated_lists[len(original_lists) :]:
+    for extra in translated_lists[len(source.lists):]:
+        if not extra.decomposed:
             extra.decompose()
-        translated_lists = translated_soup.find_all(["ul", "ol"])
 
-    for index, translated_list in enumerate(translated_lists):
-        original_list: Optional[Tag] = original_lists[index] if index < len(original_lists) else None
-        if original_list is None:
-            translated_list.decompose()
+    for original_list, translated_list in zip(source.lists, translated_lists):
+        if translated_list.decomposed:
+            # Removed along with an enclosing list item below.
             continue
 
         # Force list type (ordered/unordered) to match source
-        if translated_list.name != original_list.name:
-            translated_list.name = original_list.name
+        translated_list.name = original_list.name
 
         # Copy basic structural attributes from the source list
-        for attr in ("type", "start", "reversed", "class", "style"):
-            if attr in original_list.attrs:
-                translated_list[attr] = original_list[attr]
-            elif attr in translated_list.attrs:
-                del translated_list[attr]
-
-        desired_count = len(original_list.find_all("li", recursive=False))
+        _copy_attrs(translated_list, original_list.attrs, LIST_ATTRS)
 
         # Remove nested <li> wrappers or empty list entries
-        items = translated_list.find_all("li", recursive=False)
-        for item in list(items):
+        items = []
+        for item in translated_list.find_all("li", recursive=False):
             # Promote nested list items if the translator embedded them
             nested_items = item.find_all("li")
             if nested_items:
                 for nested in nested_items:
-                    translated_list.insert(translated_list.contents.index(item), nested)
+                    item.insert_before(nested)
+                items.extend(nested_items)
                 item.decompose()
                 continue
 
             # Drop empty items introduced by the translator
             if not item.get_text(strip=True):
                 item.decompose()
+                continue
+            items.append(item)
 
-        items = translated_list.find_all("li", recursive=False)
+        desired_count = len(original_list.items)
         if desired_count and len(items) > desired_count:
             for extra in items[desired_count:]:
                 extra.decompose()
-            items = translated_list.find_all("li", recursive=False)
+            items = items[:desired_count]
 
         # Ensure every list item wraps its textual content in <p> if that
         # matches the source structure (helps keep formatting consistent)
-        original_items = original_list.find_all("li", recursive=False)
-        for idx, li in enumerate(items):
-            source_item = original_items[idx] if idx < len(original_items) else None
-            if source_item is None:
-                continue
-
-            for attr in ("class", "style"):
-                if attr in source_item.attrs:
-                    li[attr] = source_item[attr]
-                elif attr in li.attrs:
-                    del li[attr]
-
-            needs_paragraph = any(
-                child.name == "p" for child in source_item.children if isinstance(child, Tag)
-            )
-            if needs_paragraph and not any(child.name == "p" for child in li.children if isinstance(child, Tag)):
+        for li, source_item in zip(items, original_list.items):
+            _copy_attrs(li, source_item.attrs, ITEM_ATTRS)
+            if source_item.needs_paragraph and not any(
+                child.name == "p" for child in li.children if isinstance(child, Tag)
+            ):
                 content = list(li.contents)
                 li.clear()
                 paragraph = translated_soup.new_tag("p")
@@ -109,7 +175,7 @@ def _strip_redundant_breaks(translated_soup: BeautifulSoup, allowed_tags: Set[st
         br.decompose()
 
 
-def _structure_is_fragmented(original_soup: BeautifulSoup, translated_soup: BeautifulSoup) -> bool:
+def _structure_is_fragmented(source: _SourceDocument, translated_soup: BeautifulSoup) -> bool:
     """
     Return True when the translated markup lost too much of the original structure.
 
@@ -117,30 +183,25 @@ def _structure_is_fragmented(original_soup: BeautifulSoup, translated_soup: Beau
     paragraphs). If the translated HTML is mostly plain text or strips these tags,
     we rebuild it from the source skeleton so spacing and hierarchy stay intact.
     """
-    original_tags = original_soup.find_all(True)
     translated_tags = translated_soup.find_all(True)
 
-    if not original_tags:
+    if not source.tag_count:
         return False
     if not translated_tags:
         return True
 
-    original_count = len(original_tags)
-    translated_count = len(translated_tags)
-    if translated_count / original_count < 0.5:
+    if len(translated_tags) / source.tag_count < 0.5:
         return True
 
-    critical = {"p", "ol", "ul", "li", "h1", "h2", "h3", "h4", "h5", "h6"}
-    original_critical = sum(1 for tag in original_tags if tag.name in critical)
-    translated_critical = sum(1 for tag in translated_tags if tag.name in critical)
-    if original_critical and (translated_critical / original_critical) < 0.6:
+    translated_critical = sum(1 for tag in translated_tags if tag.name in CRITICAL_TAGS)
+    if source.critical_count and (translated_critical / source.critical_count) < 0.6:
         return True
 
     return False
 
 
 def _restore_structure_from_original(
-    original_soup: BeautifulSoup, translated_soup: BeautifulSoup
+    source: _SourceDocument, translated_soup: BeautifulSoup
 ) -> BeautifulSoup:
     """
     Clone the original HTML skeleton and populate its text nodes with translated copy.
@@ -184,12 +245,13 @@ def _restore_structure_from_original(
         target.clear()
         target.append(segment)
 
+    # The shared source soup must stay untouched; work on one copy of it.
+    rebuilt = copy.copy(source.soup)
     translated_segments = _extract_translation_segments()
     if not translated_segments:
-        return BeautifulSoup(str(original_soup), "html.parser")
+        return rebuilt
 
-    rebuilt = BeautifulSoup(str(original_soup), "html.parser")
-    targets = rebuilt.find_all(["h1", "h2", "h3", "h4", "h5", "h6", "p", "li", "blockquote"])
+    targets = rebuilt.find_all(RESTORE_TARGETS)
 
     for idx, target in enumerate(targets):
         fallback = target.get_text(" ", strip=True)
@@ -256,16 +318,14 @@ def clean_translation_html(
     slug_lookup: Dict[str, str],
 ) -> str:
     """Return a cleaned translation that mirrors the source structure."""
-    allowed_tags = _allowed_tags_from_original(original_html)
-
-    original_soup = BeautifulSoup(original_html or "", "html.parser")
-    translated_soup = BeautifulSoup(translated_html or "", "html.parser")
-
-    _remove_disallowed_tags(translated_soup, allowed_tags)
-    _strip_redundant_breaks(translated_soup, allowed_tags)
-    _normalize_lists(original_soup, translated_soup)
-    if _structure_is_fragmented(original_soup, translated_soup):
-        translated_soup = _restore_structure_from_original(original_soup, translated_soup)
+    source = _source_document(original_html or "")
+    translated_soup = _parse(translated_html)
+
+    _remove_disallowed_tags(translated_soup, source.tag_names)
+    _strip_redundant_breaks(translated_soup, source.tag_names)
+    _normalize_lists(source, translated_soup)
+    if _structure_is_fragmented(source, translated_soup):
+        translated_soup = _restore_structure_from_original(source, translated_soup)
     _rewrite_internal_hrefs(translated_soup, slug_lookup)
 
     # Trim leading/trailing whitespace-only nodes at the top level
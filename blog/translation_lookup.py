@@ -0,0 +1,129 @@
+"""Read-side access to TranslatableModel translations without a query per field."""
+
+from collections import defaultdict
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.contrib.contenttypes.models import ContentType
+from django_restful_translator.models import Translation
+
+from pincatch.versioned_cache import VersionedLocalCache
+
+# Large rich-text fields are kept out of the process cache and read per request.
+UNCACHED_FIELDS = frozenset({"body"})
+
+# (content_type_id, object_id) -> {(language, field_name): field_value}, without UNCACHED_FIELDS
+_values_cache = VersionedLocalCache("blog-translations", max_entries=4096)
+
+
+def invalidate() -> None:
+    """Drop cached translation values in every worker after a Translation changes."""
+    _values_cache.invalidate()
+
+
+def _cache_key(obj) -> Tuple[int, str]:
+    # Translation.object_id is a CharField, so keys use the string form of the pk.
+    return ContentType.objects.get_for_model(obj).pk, str(obj.pk)
+
+
+def _prefetched_values(obj) -> Optional[Dict[Tuple[str, str], str]]:
+    """Return the values from prefetch_related('translations'), or None when not prefetched."""
+    prefetched = getattr(obj, "_prefetched_objects_cache", {}).get("translations")
+    if prefetched is None:
+        return None
+    return {(row.language, row.field_name): row.field_value for row in prefetched}
+
+
+def _load(keys) -> Dict[Tuple[int, str], Dict[Tuple[str, str], str]]:
+    """Load every translation except UNCACHED_FIELDS for keys with one query per content type."""
+    loaded = {key: {} for key in keys}
+    ids_by_type = defaultdict(list)
+    for content_type_id, object_id in keys:
+        ids_by_type[content_type_id].append(object_id)
+    for content_type_id, object_ids in ids_by_type.items():
+        rows = Translation.objects.filter(
+            content_type_id=content_type_id, object_id__in=object_ids
+        ).exclude(field_name__in=UNCACHED_FIELDS).values_list("object_id", "language", "field_name", "field_value")
+        for object_id, language, field_name, field_value in rows:
+            loaded[(content_type_id, object_id)][(language, field_name)] = field_value
+    return loaded
+
+
+def values_for(obj) -> Dict[Tuple[str, str], str]:
+    """
+    Return {(language, field_name): value} for obj, from prefetched rows or the
+    process cache. Values of UNCACHED_FIELDS are only included when prefetched.
+    """
+    values = _prefetched_values(obj)
+    if values is not None:
+        return values
+    key = _cache_key(obj)
+    return _values_cache.get(key, lambda: _load([key])[key])
+
+
+def _uncached_values(obj, field_name: str, language: Optional[str] = None) -> Dict[str, str]:
+    """Return {language: value} for one of UNCACHED_FIELDS, from prefetched rows or one query."""
+    prefetched = _prefetched_values(obj)
+    if prefetched is not None:
+        return {
+            value_language: value
+            for (value_language, name), value in prefetched.items()
+            if name == field_name and language in (None, value_language)
+        }
+    content_type_id, object_id = _cache_key(obj)
+    rows = Translation.objects.filter(
+        content_type_id=content_type_id, object_id=object_id, field_name=field_name
+    )
+    if language is not None:
+        rows = rows.filter(language=language)
+    return dict(rows.values_list("language", "field_value"))
+
+
+def translated_value(obj, field_name: str, language: str) -> Optional[str]:
+    """Return the stored translation of field_name in language, or None when there is no row."""
+    if field_name in UNCACHED_FIELDS:
+        return _uncached_values(obj, field_name, language).get(language)
+    return values_for(obj).get((language, field_name))
+
+
+def field_values(obj, field_name: str) -> Dict[str, str]:
+    """Return {language: value} for one translated field of obj."""
+    if field_name in UNCACHED_FIELDS:
+        return _uncached_values(obj, field_name)
+    return {
+        language: value
+        for (language, name), value in values_for(obj).items()
+        if name == field_name
+    }
+
+
+def _cached_values(objects):
+    keys = list(dict.fromkeys(_cache_key(obj) for obj in objects if obj.pk is not None))
+    return _values_cache.get_many(keys, _load)
+
+
+def load_translation_map(
+    objects: Iterable[object],
+    language: Optional[str] = None,
+    fields: Optional[Iterable[str]] = None,
+) -> Dict[Tuple[str, str, str], str]:
+    """
+    Return {(object_id, language, field_name): value} for objects (a queryset or list),
+    loading whatever the process cache lacks in one query per model. UNCACHED_FIELDS
+    are not included; read them with translated_value() or field_values().
+    Also warms the cache, so later get_translated_* calls on these objects are free.
+    """
+    fields = set(fields) if fields is not None else None
+    translation_map = {}
+    for (_, object_id), values in _cached_values(objects).items():
+        for (value_language, field_name), value in values.items():
+            if language is not None and value_language != language:
+                continue
+            if fields is not None and field_name not in fields:
+                continue
+            translation_map[(object_id, value_language, field_name)] = value
+    return translation_map
+
+
+def prime(objects: Iterable[object]) -> None:
+    """Warm the process cache for objects in one query per model (see load_translation_map)."""
+    _cached_values(objects)
@@ -0,0 +1,77 @@
+"""
+Batched writes of Translation rows.
+
+Translation flows collect their creates and updates and write them with
+bulk_create/bulk_update in one transaction per batch instead of one save
+(and one fsync) per language x field. Bulk writes skip post_save, so
+translations_changed() then does what the Translation receivers in
+blog.signals do, once per batch instead of once per row.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.utils import timezone
+from django_restful_translator.models import Translation
+
+from blog import language_switcher, post_slugs, sitemap_files, sitemaps, slug_index, translation_lookup
+from blog.models import Category, Post
+from pincatch import page_cache
+
+BATCH_SIZE = 200
+
+# translate_with_provider writes results in batches of this many, so an
+# interrupted run loses at most one batch.
+RESULT_BATCH_SIZE = 25
+
+
+def translations_changed(rows: Iterable[Translation]) -> None:
+    """Invalidate caches and indexes that depend on the given Translation rows."""
+    rows = list(rows)
+    if not rows:
+        return
+    page_cache.invalidate_all()
+    language_switcher.invalidate()
+    translation_lookup.invalidate()
+    slug_index.invalidate()
+
+    content_types = ContentType.objects.get_for_models(Post, Category)
+    post_ids = set()
+    sections = set()
+    for row in rows:
+        if row.field_name == "slug" and row.content_type_id == content_types[Post].pk:
+            post_ids.add(row.object_id)
+            sections.add(("posts", row.language))
+        elif row.field_name == "name" and row.content_type_id == content_types[Category].pk:
+            sections.add(("categories", row.language))
+    if post_ids:
+        slug_index.invalidate_post_slug_lookups()
+    for post in Post.objects.filter(pk__in=post_ids):
+        post_slugs.sync_post_slugs(post)
+    for kind, language in sorted(sections):
+        sitemaps.invalidate(kind, language)
+        sitemap_files.refresh(kind, language)
+
+
+def bulk_write(
+    created: Iterable[Translation] = (),
+    updated: Iterable[Translation] = (),
+    fields: Iterable[str] = ("field_value",),
+) -> None:
+    """Insert created and update fields of updated in one transaction, then notify once."""
+    created, updated = list(created), list(updated)
+    if not created and not updated:
+        return
+    now = timezone.now()
+    for translation_obj in updated:
+        # bulk_update bypasses auto_now.
+        translation_obj.updated_at = now
+    with transaction.atomic():
+        if created:
+            Translation.objects.bulk_create(created, batch_size=BATCH_SIZE)
+        if updated:
+            Translation.objects.bulk_update(updated, [*fields, "updated_at"], batch_size=BATCH_SIZE)
+    translations_changed(created + updated)
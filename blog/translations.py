@@ -1,44 +1,48 @@
 import logging
-import threading
 
-from django.db import transaction
+from django.contrib.contenttypes.models import ContentType
+from django_restful_translator.models import Translation
 
 from blog.models import Post, Category
 from blog import signals
+from pincatch import translation_gateway, translation_jobs
 
 logger = logging.getLogger(__name__)
 
+POST_JOB = "blog.post"
+CATEGORY_JOB = "blog.category"
 
-def _run_in_background(fn, *args, **kwargs):
-    """
-    Fire-and-forget wrapper so admin actions don't block the request thread.
-    Mirrors the async behavior used for dynamic Page translations.
-    """
-    def _target():
-        try:
-            fn(*args, **kwargs)
-        except Exception:
-            logger.exception("Background blog translation failed")
-    threading.Thread(target=_target, daemon=True).start()
 
+def _raise_if_pending(model_class, object_id):
+    """Fail the job (so it is retried) while placeholders are still untranslated."""
+    pending = Translation.objects.filter(
+        content_type=ContentType.objects.get_for_model(model_class),
+        object_id=str(object_id),
+        field_value="",
+    ).count()
+    if pending:
+        # Left pending because the provider is down: let the job wait for it instead of spending an attempt.
+        translation_gateway.raise_if_unavailable("deepl")
+        raise RuntimeError(f"{pending} translation(s) still pending for {model_class.__name__} {object_id}")
 
-def _translate_post_async(post_id, reset_existing):
-    signals._do_post_translation(post_id, reset_existing=reset_existing)
 
+def run_post_job(object_id, reset_existing, progress=None):
+    """TRANSLATION_JOB_HANDLERS entry for queued post translations."""
+    signals._do_post_translation(int(object_id), reset_existing=reset_existing, progress=progress)
+    _raise_if_pending(Post, object_id)
 
-def _translate_category_async(category_id, reset_existing):
-    signals._do_category_translation(category_id, reset_existing=reset_existing)
 
+def run_category_job(object_id, reset_existing, progress=None):
+    """TRANSLATION_JOB_HANDLERS entry for queued category translations."""
+    signals._do_category_translation(int(object_id), reset_existing=reset_existing, progress=progress)
+    _raise_if_pending(Category, object_id)
 
-def trigger_post_translation(post_id, reset_existing=False):
-    """Trigger translation flow for a post without blocking the admin request."""
-    transaction.on_commit(
-        lambda: _run_in_background(_translate_post_async, post_id, reset_existing)
-    )
 
+def trigger_post_translation(post_id, reset_existing=False, priority=translation_jobs.PRIORITY_NORMAL):
+    """Queue a post translation for the run_translation_jobs worker."""
+    return translation_jobs.enqueue(POST_JOB, post_id, reset_existing=reset_existing, priority=priority)
 
-def trigger_category_translation(category_id, reset_existing=False):
-    """Trigger translation flow for a category without blocking the admin request."""
-    transaction.on_commit(
-        lambda: _run_in_background(_translate_category_async, category_id, reset_existing)
-    )
+
+def trigger_category_translation(category_id, reset_existing=False, priority=translation_jobs.PRIORITY_NORMAL):
+    """Queue a category translation for the run_translation_jobs worker."""
+    return translation_jobs.enqueue(CATEGORY_JOB, category_id, reset_existing=reset_existing, priority=priority)
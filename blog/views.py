@@ -1,11 +1,11 @@
 from django.core.paginator import Paginator
-from django.shortcuts import render, get_object_or_404
+from django.shortcuts import redirect, render, get_object_or_404
 from blog.models import Post, Category
+from blog import post_slugs, slug_index, translation_lookup
 from django.http import Http404, JsonResponse
 from django.utils import translation
 from django.utils.text import slugify
 from django.utils.translation import gettext as _
-from django.db.models import Q
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 import os
@@ -16,11 +16,14 @@ from pincatch.seo import build_seo_context
 
 def blogs(request):
     posts = Post.objects.all().order_by("-created_on")
-    # Prefetch translations for the current language
-    posts = posts.prefetch_related('translations')
+    posts = posts.prefetch_related('categories')
     paginator = Paginator(posts, 12)  # 12 posts per page
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
+    # Load the page's post and category translations in one query (or none when cached)
+    translation_lookup.prime(
+        list(page_obj) + [category for post in page_obj for category in post.categories.all()]
+    )
     breadcrumbs = [{'title': 'Home', 'url': 'home'}, {'title': 'Blog', 'url': None}]
     context = {
         "blogs": page_obj,
@@ -39,24 +42,15 @@ def blogs(request):
 def blog_category(request, category_slug):
     language = translation.get_language()
 
-    matching_category = None
-    display_name = None
-    for cate in Category.objects.all():
-        translated_name = cate.get_translated_name(language)
-        translated_slug = slugify(translated_name, allow_unicode=True)
-        default_slug = slugify(cate.name, allow_unicode=True)
-        if category_slug in {translated_slug, default_slug}:
-            matching_category = cate
-            display_name = translated_name
-            break
-
-    if not matching_category:
+    # One dict lookup in the cached slug index, then a primary-key fetch.
+    category_pk = slug_index.category_pk_for_slug(language, category_slug)
+    if category_pk is None:
         raise Http404("Category not found")
+    matching_category = get_object_or_404(Category, pk=category_pk)
+    display_name = matching_category.get_translated_name(language)
 
-    if display_name is None:
-        display_name = matching_category.get_translated_name(language)
-
-    posts = matching_category.posts.prefetch_related('translations').order_by("-created_on")
+    posts = list(matching_category.posts.prefetch_related('categories').order_by("-created_on"))
+    translation_lookup.prime(posts)
     breadcrumbs = [
         {'title': 'Home', 'url': 'home'},
         {'title': 'Blog', 'url': 'blog'},
@@ -81,19 +75,15 @@ def blog_detail(request, slug):
 
     normalized_slug = slugify(slug, allow_unicode=True)
 
-    translated_match = Post.objects.filter(
-        translations__language=language,
-        translations__field_name='slug'
-    ).filter(
-        Q(translations__field_value=slug) |
-        Q(translations__field_value=normalized_slug)
-    ).first()
-
-    if translated_match:
-        post = translated_match
-    else:
-        # Fallback to the base slug when no translated slug exists
+    match = post_slugs.resolve(language, normalized_slug)
+    if match is None:
+        # Fallback to the base slug for posts the index doesn't know yet
         post = get_object_or_404(Post, slug=normalized_slug)
+    else:
+        post, is_current = match
+        if not is_current:
+            # Old localized slug: send visitors and crawlers to the current URL.
+            return redirect("blog_detail", slug=post.get_translated_slug(language), permanent=True)
 
     breadcrumbs = [
         {'title': 'Home', 'url': 'home'},
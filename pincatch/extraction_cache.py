@@ -0,0 +1,27 @@
+import hashlib
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from pincatch import quota
+
+
+def cached_media_url(kind: str, page_url: Optional[str], extractor: Callable[[str], Optional[str]]) -> Optional[str]:
+    """
+    Return the media URL extracted from a pin page, reusing earlier results.
+    Successful extractions are cached per (kind, page URL) so repeated lookups
+    skip the page fetch / Selenium fallback and are billed as cache hits.
+    """
+    if not page_url:
+        return extractor(page_url)
+    digest = hashlib.sha256(page_url.strip().encode("utf-8")).hexdigest()
+    key = f"pin:{kind}:{digest}"
+    cached = cache.get(key)
+    if cached:
+        quota.record("cache_hit")
+        return cached
+    result = extractor(page_url)
+    if result:
+        cache.set(key, result, timeout=getattr(settings, "PIN_EXTRACTION_CACHE_SECONDS", 6 * 3600))
+    return result
@@ -0,0 +1,173 @@
+"""
+Translate HTML by text segments, batched per provider request.
+
+Every translatable text node is collected first, deduplicated, and sent to
+the provider in lists of up to provider.batch_size segments (and
+MAX_BATCH_CHARS characters), then written back into the nodes it came
+from. A long article costs one round trip per chunk instead of one per text
+node, and segments already in the translation memory cost none. Shared by
+the blog and dynamic Page translation flows.
+"""
+
+import logging
+import re
+from typing import Dict, Iterable, List, Optional
+
+from pincatch import translation_memory
+from pincatch.translation_gateway import ProviderUnavailable
+
+logger = logging.getLogger(__name__)
+
+MAX_BATCH_CHARS = 20000
+SKIP_PARENTS = {"script", "style"}
+RTL_BLOCK_TAGS = {
+    "p", "li", "ul", "ol", "h1", "h2", "h3", "h4", "h5", "h6",
+    "div", "section", "article", "details", "summary",
+}
+_WHITESPACE_RE = re.compile(r"(\s*)(.*?)(\s*)$", flags=re.DOTALL)
+
+
+def split_whitespace(text):
+    """Return (leading whitespace, core text, trailing whitespace)."""
+    match = _WHITESPACE_RE.match(text)
+    if not match:
+        return "", text, ""
+    return match.groups()
+
+
+def _batches(segments: List[str], batch_size: int, max_chars: int) -> Iterable[List[str]]:
+    batch, size = [], 0
+    for segment in segments:
+        if batch and (len(batch) >= batch_size or size + len(segment) > max_chars):
+            yield batch
+            batch, size = [], 0
+        batch.append(segment)
+        size += len(segment)
+    if batch:
+        yield batch
+
+
+def _translate_batch(provider, batch, source_lang, target_lang):
+    if len(batch) == 1 and getattr(provider, "batch_size", 1) <= 1:
+        # Single-text providers take a string, not a list.
+        return [provider.translate_text(batch[0], source_lang, target_lang)]
+    translated = provider.translate_text(list(batch), source_lang, target_lang)
+    if isinstance(translated, str) or len(translated) != len(batch):
+        raise ValueError("provider returned a different number of segments than it was sent")
+    return list(translated)
+
+
+def translate_segments(provider, segments: Iterable[str], source_lang, target_lang) -> Dict[str, str]:
+    """
+    Return {segment: translation} for the distinct non-empty segments.
+    Segments found in the translation memory are not sent to the provider.
+    A batch that still fails (after the provider's own retries) maps its
+    segments to themselves, so callers fall back to source text; only
+    ProviderUnavailable (circuit open) propagates.
+    """
+    unique = [segment for segment in dict.fromkeys(segments) if segment and segment.strip()]
+    translations = translation_memory.lookup_many(provider, source_lang, target_lang, unique)
+    missing = [segment for segment in unique if segment not in translations]
+    batch_size = max(1, int(getattr(provider, "batch_size", 1) or 1))
+    fresh = {}
+    try:
+        for batch in _batches(missing, batch_size, MAX_BATCH_CHARS):
+            try:
+                translated = _translate_batch(provider, batch, source_lang, target_lang)
+            except ProviderUnavailable:
+                # The provider is down: fail fast instead of storing source text as a translation.
+                raise
+            except Exception as exc:
+                logger.warning(
+                    "Batch of %s segment(s) %s->%s failed: %s; using source text",
+                    len(batch),
+                    source_lang,
+                    target_lang,
+                    exc,
+                )
+                translations.update(zip(batch, batch))
+                continue
+            fresh.update(zip(batch, translated))
+    finally:
+        translation_memory.remember_many(provider, source_lang, target_lang, fresh)
+    translations.update(fresh)
+    return translations
+
+
+def translate_text(provider, text, source_lang, target_lang):
+    """
+    Translate one plain string through the translation memory.
+    Provider errors propagate so callers can apply their own fallback.
+    """
+    remembered = translation_memory.lookup_many(provider, source_lang, target_lang, [text])
+    if text in remembered:
+        return remembered[text]
+    translated = provider.translate_text(text, source_lang, target_lang)
+    translation_memory.remember_many(provider, source_lang, target_lang, {text: translated})
+    return translated
+
+
+def apply_rtl(soup):
+    """Mark block elements right-to-left, keeping any existing alignment."""
+    for tag in soup.find_all(RTL_BLOCK_TAGS):
+        if not tag.has_attr("dir"):
+            tag["dir"] = "rtl"
+        current_style = tag.get("style", "")
+        if "text-align" not in current_style:
+            tag["style"] = (current_style + "; text-align: right;").strip("; ")
+
+
+def parse_html(html_text):
+    """Return a BeautifulSoup tree, or None when bs4 is missing or the HTML can't be parsed."""
+    try:
+        from bs4 import BeautifulSoup
+    except Exception:
+        return None
+    try:
+        return BeautifulSoup(html_text, "html.parser")
+    except Exception:
+        return None
+
+
+def text_nodes(soup):
+    """Return (node, leading whitespace, core text, trailing whitespace) for each translatable text node."""
+    from bs4.element import PreformattedString
+
+    nodes = []
+    for node in soup.find_all(string=True):
+        if isinstance(node, PreformattedString):
+            # Preserve comments (and doctypes, CDATA) untouched so they don't become visible text.
+            continue
+        if getattr(node, "parent", None) and node.parent.name in SKIP_PARENTS:
+            continue
+        prefix, core, suffix = split_whitespace(str(node))
+        if core:
+            nodes.append((node, prefix, core, suffix))
+    return nodes
+
+
+def render(soup):
+    # Return inner HTML without BeautifulSoup adding extra wrappers/whitespace.
+    if soup.body:
+        return soup.body.decode_contents(formatter="minimal")
+    return soup.decode(formatter="minimal")
+
+
+def translate_html(provider, html_text, source_lang, target_lang, rtl=False) -> Optional[str]:
+    """
+    Translate the text nodes of html_text, preserving markup and surrounding
+    whitespace. Returns None when the HTML can't be parsed (or bs4 is missing)
+    so callers can fall back to translating the raw string.
+    """
+    soup = parse_html(html_text)
+    if soup is None:
+        return None
+
+    nodes = text_nodes(soup)
+    translations = translate_segments(provider, (core for _, _, core, _ in nodes), source_lang, target_lang)
+    for node, prefix, core, suffix in nodes:
+        node.replace_with(f"{prefix}{translations.get(core, core)}{suffix}")
+
+    if rtl:
+        apply_rtl(soup)
+    return render(soup)
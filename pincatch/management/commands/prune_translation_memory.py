@@ -0,0 +1,51 @@
+"""Evict stale translation-memory entries and report memory statistics."""
+
+from __future__ import annotations
+
+from django.db.models import Sum
+from django.core.management.base import BaseCommand
+
+from pincatch import translation_memory
+from pincatch.models import TranslationMemory
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete translation-memory entries from older TRANSLATION_MEMORY_VERSIONs, "
+        "entries unused for --max-age-days, and the least recently used beyond --max-entries."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--max-age-days",
+            type=int,
+            default=None,
+            help="Delete entries not used for this many days.",
+        )
+        parser.add_argument(
+            "--max-entries",
+            type=int,
+            default=None,
+            help="Keep at most this many entries (most recently used win).",
+        )
+        parser.add_argument(
+            "--stats",
+            action="store_true",
+            help="Only print statistics; delete nothing.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        if not options.get("stats"):
+            deleted = translation_memory.prune(
+                max_age_days=options.get("max_age_days"),
+                max_entries=options.get("max_entries"),
+            )
+            self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} translation-memory entr(ies)."))
+
+        total = TranslationMemory.objects.count()
+        reused = TranslationMemory.objects.filter(hits__gt=0).count()
+        hits = TranslationMemory.objects.aggregate(total=Sum("hits"))["total"] or 0
+        self.stdout.write(
+            f"{total} entr(ies) at version {translation_memory.current_version()}; "
+            f"{reused} reused, {hits} hit(s) in total."
+        )
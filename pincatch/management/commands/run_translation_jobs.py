@@ -0,0 +1,58 @@
+"""Work through the durable translation queue (pincatch.translation_jobs)."""
+
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from pincatch import translation_gateway, translation_jobs
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued translation jobs on a bounded pool of worker threads. "
+        "Runs until interrupted unless --once is given."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Jobs run concurrently (default: TRANSLATION_JOB_WORKERS).",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once no job is due instead of polling for new ones.",
+        )
+        parser.add_argument(
+            "--poll-seconds",
+            type=float,
+            default=None,
+            help="Seconds between queue checks (default: TRANSLATION_JOB_POLL_SECONDS).",
+        )
+
+    def handle(self, *args, **options) -> None:
+        try:
+            translation_jobs.work(
+                max_workers=options.get("workers"),
+                once=options.get("once"),
+                poll_seconds=options.get("poll_seconds"),
+                stdout=self.stdout,
+            )
+        except KeyboardInterrupt:
+            # Jobs still marked running are re-queued once their lease expires.
+            self.stdout.write("Interrupted.")
+            self._write_provider_stats()
+            return
+        self._write_provider_stats()
+        self.stdout.write(self.style.SUCCESS("No translation jobs due."))
+
+    def _write_provider_stats(self) -> None:
+        for name, stats in translation_gateway.stats().items():
+            self.stdout.write(
+                f"{name}: circuit {stats['state']}, {stats['calls']} call(s), "
+                f"{stats['failures']} failed ({stats['timeouts']} timed out, {stats['quota_errors']} over quota), "
+                f"{stats['rejected']} rejected, {stats['characters']} character(s), "
+                f"{stats['avg_seconds']:.2f}s per call"
+            )
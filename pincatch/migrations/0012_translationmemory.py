@@ -0,0 +1,27 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pincatch", "0011_page_meta_keywords_head_html"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TranslationMemory",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("key", models.CharField(max_length=64, unique=True)),
+                ("provider", models.CharField(max_length=50)),
+                ("source_language", models.CharField(max_length=10)),
+                ("target_language", models.CharField(max_length=10)),
+                ("version", models.PositiveIntegerField(default=1)),
+                ("source_text", models.TextField()),
+                ("translated_text", models.TextField()),
+                ("hits", models.PositiveIntegerField(default=0)),
+                ("created_on", models.DateTimeField(auto_now_add=True)),
+                ("last_used_on", models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+        ),
+    ]
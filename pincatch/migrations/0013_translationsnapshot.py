@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pincatch", "0012_translationmemory"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TranslationSnapshot",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("key", models.CharField(max_length=255, unique=True)),
+                ("source_text", models.TextField()),
+                ("translated_text", models.TextField()),
+                ("updated_on", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,59 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pincatch", "0013_translationsnapshot"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TranslationJob",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("kind", models.CharField(max_length=50)),
+                ("object_id", models.CharField(max_length=64)),
+                ("reset_existing", models.BooleanField(default=False)),
+                ("priority", models.IntegerField(default=0)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("running", "Running"),
+                            ("done", "Done"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=10,
+                    ),
+                ),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                ("run_after", models.DateTimeField(default=django.utils.timezone.now)),
+                ("progress_done", models.PositiveIntegerField(default=0)),
+                ("progress_total", models.PositiveIntegerField(default=0)),
+                ("last_error", models.TextField(blank=True, default="")),
+                ("locked_by", models.CharField(blank=True, default="", max_length=100)),
+                ("locked_at", models.DateTimeField(blank=True, null=True)),
+                ("created_on", models.DateTimeField(auto_now_add=True)),
+                ("updated_on", models.DateTimeField(auto_now=True)),
+                ("finished_on", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "ordering": ["-created_on"],
+                "indexes": [
+                    models.Index(fields=["status", "priority", "run_after"], name="translationjob_queue_idx"),
+                    models.Index(fields=["kind", "object_id"], name="translationjob_object_idx"),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        condition=models.Q(("status", "pending")),
+                        fields=("kind", "object_id"),
+                        name="unique_pending_translation_job",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 from ckeditor_uploader.fields import RichTextUploadingField
 from django.core.exceptions import ValidationError
 
@@ -94,3 +95,99 @@ class Page(models.Model):
         if self.is_homepage and self.language == settings.LANGUAGE_CODE and not self.language_slug:
             return ""
         return self.language_slug or self.language
+
+
+class TranslationMemory(models.Model):
+    """
+    Machine-translation results reused across runs (pincatch.translation_memory).
+    key is a hash of the normalized source segment, languages, provider and
+    memory version, so bumping TRANSLATION_MEMORY_VERSION retires old entries.
+    """
+
+    key = models.CharField(max_length=64, unique=True)
+    provider = models.CharField(max_length=50)
+    source_language = models.CharField(max_length=10)
+    target_language = models.CharField(max_length=10)
+    version = models.PositiveIntegerField(default=1)
+    source_text = models.TextField()
+    translated_text = models.TextField()
+    hits = models.PositiveIntegerField(default=0)
+    created_on = models.DateTimeField(auto_now_add=True)
+    last_used_on = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"{self.provider} {self.source_language}->{self.target_language}: {self.source_text[:40]}"
+
+
+class TranslationSnapshot(models.Model):
+    """
+    The source text a stored translation was produced from, and the raw
+    translation as produced (pincatch.segment_diff). key identifies the
+    object, field and target language, e.g. "blog.post:12:body:de".
+    """
+
+    key = models.CharField(max_length=255, unique=True)
+    source_text = models.TextField()
+    translated_text = models.TextField()
+    updated_on = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.key
+
+
+class TranslationJob(models.Model):
+    """
+    One queued translation of an object (pincatch.translation_jobs), run by
+    `manage.py run_translation_jobs`. At most one pending job exists per
+    object; re-queuing merges into it.
+    """
+
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_DONE, "Done"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    kind = models.CharField(max_length=50)
+    object_id = models.CharField(max_length=64)
+    reset_existing = models.BooleanField(default=False)
+    priority = models.IntegerField(default=0)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    run_after = models.DateTimeField(default=timezone.now)
+    progress_done = models.PositiveIntegerField(default=0)
+    progress_total = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default="")
+    locked_by = models.CharField(max_length=100, blank=True, default="")
+    locked_at = models.DateTimeField(null=True, blank=True)
+    created_on = models.DateTimeField(auto_now_add=True)
+    updated_on = models.DateTimeField(auto_now=True)
+    finished_on = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_on"]
+        indexes = [
+            models.Index(fields=["status", "priority", "run_after"], name="translationjob_queue_idx"),
+            models.Index(fields=["kind", "object_id"], name="translationjob_object_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["kind", "object_id"],
+                condition=models.Q(status="pending"),
+                name="unique_pending_translation_job",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id} ({self.status})"
+
+    @property
+    def progress_percent(self):
+        if not self.progress_total:
+            return 100 if self.status == self.STATUS_DONE else 0
+        return min(100, int(100 * self.progress_done / self.progress_total))
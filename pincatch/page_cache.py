@@ -0,0 +1,121 @@
+import hashlib
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+
+from pincatch.versioned_cache import bump_version, shared_version
+
+logger = logging.getLogger(__name__)
+
+GENERATION_KEY = "pagecache:generation"
+# Rendered into cached HTML instead of a real token; swapped for the
+# requester's own CSRF token every time the cached body is served.
+CSRF_PLACEHOLDER = "__pincatch_csrf_placeholder__"
+# Marketing parameters that don't change the rendered page. Any other query
+# string bypasses the cache, so random parameters can't flood it with renders.
+TRACKING_PARAMS = frozenset(
+    {"utm_source", "utm_medium", "utm_campaign", "utm_term", "utm_content", "fbclid", "gclid", "msclkid"}
+)
+
+
+def _generation():
+    return shared_version(GENERATION_KEY)
+
+
+def invalidate_all():
+    """
+    Drop every cached page render.
+    Pages embed links to other pages (page_url), the header navigation and,
+    for homepages, the latest posts, so any content change bumps one shared
+    generation instead of tracking individual dependencies.
+    """
+    bump_version(GENERATION_KEY)
+
+
+def _is_cacheable(request):
+    if request.method not in ("GET", "HEAD"):
+        return False
+    if not getattr(settings, "PAGE_CACHE_ENABLED", True):
+        return False
+    if any(name not in TRACKING_PARAMS for name in request.GET):
+        return False
+    user = getattr(request, "user", None)
+    # Staff always get a fresh render so admin edits are visible immediately.
+    return not (user is not None and user.is_authenticated and user.is_staff)
+
+
+def _cache_key(request, page):
+    parts = [
+        str(page.pk),
+        page.language,
+        str(page.last_modified.timestamp() if page.last_modified else ""),
+        str(_generation()),
+        request.scheme,
+        request.get_host(),
+        request.path,
+    ]
+    digest = hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+    return f"pagecache:{digest}"
+
+
+def _apply_validators(response, entry):
+    response["ETag"] = entry["etag"]
+    if entry["last_modified"]:
+        response["Last-Modified"] = http_date(entry["last_modified"])
+    # Shared caches may store the page but must revalidate on every request,
+    # so edits still show up immediately while unchanged pages cost a 304.
+    response["Cache-Control"] = "no-cache"
+    patch_vary_headers(response, ("Cookie",))
+
+
+def serve_page(request, page, render_page):
+    """
+    Serve a dynamic Page through the rendered-page cache.
+
+    render_page(csrf_token) must return a full HttpResponse; it is only called
+    on a cache miss (or when caching doesn't apply), with the CSRF placeholder
+    so the stored body stays user-neutral.
+    """
+    if not _is_cacheable(request):
+        response = render_page(None)
+        response["Cache-Control"] = "no-store"
+        return response
+
+    key = _cache_key(request, page)
+    entry = cache.get(key)
+    if entry is None:
+        response = render_page(CSRF_PLACEHOLDER)
+        if response.status_code != 200 or response.streaming:
+            return response
+        body = response.content.decode(response.charset)
+        last_modified = int(page.last_modified.timestamp()) if page.last_modified else None
+        entry = {
+            "body": body,
+            "content_type": response["Content-Type"],
+            "etag": 'W/"%s"' % hashlib.md5(body.encode("utf-8")).hexdigest(),
+            "last_modified": last_modified,
+        }
+        cache.set(key, entry, timeout=getattr(settings, "PAGE_CACHE_SECONDS", 3600))
+
+    # Make sure the CSRF cookie is issued even when we answer with a 304.
+    csrf_token = get_token(request)
+    conditional = get_conditional_response(
+        request,
+        etag=entry["etag"],
+        last_modified=entry["last_modified"],
+    )
+    if conditional is not None:
+        _apply_validators(conditional, entry)
+        return conditional
+
+    response = HttpResponse(
+        entry["body"].replace(CSRF_PLACEHOLDER, csrf_token),
+        content_type=entry["content_type"],
+    )
+    _apply_validators(response, entry)
+    return response
@@ -0,0 +1,210 @@
+import contextvars
+import hashlib
+import math
+import time
+from typing import Dict, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import JsonResponse
+
+from pincatch.ratelimit import client_ip
+
+_current_meter = contextvars.ContextVar("pin_quota_meter", default=None)
+
+BYTES_PER_MB = 1024 * 1024
+
+
+class QuotaMeter:
+    """Collects the work a single /pin/ request triggered so it can be billed afterwards."""
+
+    def __init__(self, costs: Dict[str, int]):
+        self.costs = costs
+        self.charges: Dict[str, int] = {}
+
+    def record(self, kind: str, units: int = 1) -> None:
+        self.charges[kind] = self.charges.get(kind, 0) + units
+
+    @property
+    def total(self) -> int:
+        return sum(self.costs.get(kind, 0) * units for kind, units in self.charges.items())
+
+
+def record(kind: str, units: int = 1) -> None:
+    """
+    Charge the current request for a unit of work ('cache_hit', 'page_fetch', 'selenium').
+    Safe to call outside a metered request (management commands, shell); it's a no-op there.
+    """
+    meter = _current_meter.get()
+    if meter is not None:
+        meter.record(kind, units)
+
+
+def record_bytes(byte_count: int) -> None:
+    """Charge the current request for relaying byte_count bytes, billed per started MB."""
+    if byte_count > 0:
+        record("relay_mb", math.ceil(byte_count / BYTES_PER_MB))
+
+
+# Refill, charge and store one bucket in a single atomic step on Redis.
+# Values travel as strings so fractional balances survive the Lua number conversion.
+_CONSUME_SCRIPT = """
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local capacity = tonumber(ARGV[1])
+local refill = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local tokens = tonumber(state[1])
+if tokens == nil then
+    tokens = capacity
+else
+    tokens = math.min(capacity, tokens + math.max(0, now - tonumber(state[2])) * refill)
+end
+tokens = tokens - tonumber(ARGV[4])
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', ARGV[3])
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[5]))
+return tostring(tokens)
+"""
+
+
+class TokenBucket:
+    """
+    Token bucket stored in the shared cache as (tokens, updated_at).
+    Requests are admitted while the balance is positive and billed after the
+    view runs, so an expensive request can push the bucket into debt that
+    later refills have to pay off before the client is admitted again.
+
+    On Redis, consume() refills and charges in one Lua script, so concurrent
+    requests from one identity can't overwrite each other's charges. Other
+    backends (the file cache fallback) read, subtract and write back, so
+    charges racing in parallel can be lost: the limit there is approximate.
+    """
+
+    def __init__(self, capacity: float, refill_per_second: float, cache_alias: str = "default", prefix: str = "quota"):
+        self.capacity = float(capacity)
+        self.refill_per_second = float(refill_per_second)
+        self.cache_alias = cache_alias
+        self.prefix = prefix
+        self._script = None
+
+    def _key(self, identity: str) -> str:
+        return f"{self.prefix}:{identity}"
+
+    def _redis(self, identity: str):
+        """Return (redis client, full key) when the cache is Redis, else (None, None)."""
+        from django.core.cache.backends.redis import RedisCache
+
+        cache = caches[self.cache_alias]
+        if not isinstance(cache, RedisCache):
+            return None, None
+        # A hash, under its own key so it never meets a pickled (tokens, updated_at) value.
+        key = cache.make_and_validate_key(f"{self._key(identity)}:h")
+        return cache._cache.get_client(key, write=True), key
+
+    def _refilled(self, tokens: float, updated_at: float, now: float) -> float:
+        return min(self.capacity, tokens + max(0.0, now - updated_at) * self.refill_per_second)
+
+    def _load(self, identity: str, now: float) -> float:
+        client, key = self._redis(identity)
+        if client is not None:
+            tokens, updated_at = client.hmget(key, ["tokens", "updated_at"])
+            if tokens is None:
+                return self.capacity
+            return self._refilled(float(tokens), float(updated_at), now)
+        state = caches[self.cache_alias].get(self._key(identity))
+        if not state:
+            return self.capacity
+        tokens, updated_at = state
+        return self._refilled(tokens, updated_at, now)
+
+    def _timeout(self) -> int:
+        # Keep state only as long as it takes a fully drained bucket to refill.
+        if self.refill_per_second <= 0:
+            return 86400
+        return int(self.capacity / self.refill_per_second) + 60
+
+    def peek(self, identity: str, now: Optional[float] = None) -> float:
+        now = time.time() if now is None else now
+        return self._load(identity, now)
+
+    def consume(self, identity: str, amount: float, now: Optional[float] = None) -> float:
+        now = time.time() if now is None else now
+        client, key = self._redis(identity)
+        if client is not None:
+            if self._script is None:
+                self._script = client.register_script(_CONSUME_SCRIPT)
+            tokens = self._script(
+                keys=[key],
+                args=[repr(self.capacity), repr(self.refill_per_second), repr(now), repr(float(amount)), self._timeout()],
+                client=client,
+            )
+            return float(tokens)
+        tokens = self._load(identity, now) - amount
+        caches[self.cache_alias].set(self._key(identity), (tokens, now), timeout=self._timeout())
+        return tokens
+
+    def seconds_until(self, tokens: float, target: float = 1.0) -> int:
+        if tokens >= target or self.refill_per_second <= 0:
+            return 0
+        return max(1, math.ceil((target - tokens) / self.refill_per_second))
+
+
+def resolve_identity(request) -> Tuple[str, str]:
+    """Return (bucket identity, tier name) for an API key or the client IP."""
+    api_key = request.META.get("HTTP_X_API_KEY", "").strip()
+    api_keys = getattr(settings, "PIN_API_KEYS", {})
+    if api_key and api_key in api_keys:
+        digest = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+        return f"key:{digest}", api_keys[api_key]
+    return f"ip:{client_ip(request)}", "anonymous"
+
+
+class PinQuotaMiddleware:
+    """
+    Cost-aware quota for the /pin/ extraction API.
+    Each request is billed by the work it triggered (recorded through record()
+    and record_bytes()) against a per-client token bucket; the remaining budget
+    is reported back in X-Quota-* response headers.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.prefix = getattr(settings, "PIN_QUOTA_PATH_PREFIX", "/pin/")
+        self.costs = dict(getattr(settings, "PIN_QUOTA_COSTS", {}))
+        self.cache_alias = getattr(settings, "RATELIMIT_CACHE_ALIAS", "default")
+        self.buckets = {
+            tier: TokenBucket(options["capacity"], options["refill_per_second"], self.cache_alias)
+            for tier, options in getattr(settings, "PIN_QUOTA_TIERS", {}).items()
+        }
+        self.enabled = getattr(settings, "RATELIMIT_ENABLE", True) and bool(self.buckets)
+
+    def __call__(self, request):
+        if not self.enabled or not request.path_info.startswith(self.prefix):
+            return self.get_response(request)
+
+        identity, tier = resolve_identity(request)
+        bucket = self.buckets.get(tier) or self.buckets["anonymous"]
+        balance = bucket.peek(identity)
+        if balance < 1:
+            response = JsonResponse({"error": "Quota exceeded. Please try again later."}, status=429)
+            response["Retry-After"] = str(bucket.seconds_until(balance))
+            self._add_headers(response, bucket, balance, 0)
+            return response
+
+        meter = QuotaMeter(self.costs)
+        token = _current_meter.set(meter)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current_meter.reset(token)
+
+        cost = meter.total or self.costs.get("request", 1)
+        remaining = bucket.consume(identity, cost)
+        self._add_headers(response, bucket, remaining, cost)
+        return response
+
+    @staticmethod
+    def _add_headers(response, bucket, remaining, cost):
+        response["X-Quota-Limit"] = str(int(bucket.capacity))
+        response["X-Quota-Remaining"] = str(max(0, int(remaining)))
+        response["X-Quota-Cost"] = str(int(cost))
+        response["X-Quota-Reset"] = str(bucket.seconds_until(remaining, bucket.capacity))
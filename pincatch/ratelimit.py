@@ -0,0 +1,147 @@
+import math
+import re
+import time
+from typing import Dict, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+
+RATE_RE = re.compile(r"^(\d+)/(\d*)([smhd])$")
+PERIOD_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_rate(rate: str) -> Tuple[int, int]:
+    """Turn a rate such as '10/m' or '100/5m' into (limit, period_seconds)."""
+    match = RATE_RE.match((rate or "").strip())
+    if not match:
+        raise ValueError(f"Invalid rate: {rate!r}")
+    limit, multiplier, unit = match.groups()
+    return int(limit), int(multiplier or 1) * PERIOD_SECONDS[unit]
+
+
+def client_ip(request) -> str:
+    """
+    Return the client address used for rate limiting, read only from the
+    configured RATELIMIT_IP_META_KEY. Client-supplied headers are never
+    trusted on their own: behind a reverse proxy that overwrites X-Real-IP,
+    set RATELIMIT_IP_META_KEY=HTTP_X_REAL_IP.
+    """
+    meta_key = getattr(settings, "RATELIMIT_IP_META_KEY", "REMOTE_ADDR")
+    return request.META.get(meta_key, "").strip() or "unknown"
+
+
+def is_blocked_user_agent(request) -> bool:
+    user_agent = request.META.get("HTTP_USER_AGENT", "")
+    return not user_agent or "python" in user_agent.lower()
+
+
+class SlidingWindowCounter:
+    """
+    Sliding-window rate counter backed by a shared Django cache.
+    Each key keeps a counter for the current and previous fixed window; the
+    previous window is weighted by how much of it still overlaps the sliding
+    window, which gives a smooth limit for two cache round trips per hit.
+    """
+
+    def __init__(self, cache_alias: str = "default", prefix: str = "rl"):
+        self.cache_alias = cache_alias
+        self.prefix = prefix
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def hit(self, key: str, limit: int, period: int, now: Optional[float] = None) -> Tuple[bool, int]:
+        """Count one request for key; return (allowed, retry_after_seconds)."""
+        now = time.time() if now is None else now
+        window = int(now // period)
+        current_key = f"{self.prefix}:{period}:{key}:{window}"
+        previous_key = f"{self.prefix}:{period}:{key}:{window - 1}"
+
+        cache = self.cache
+        if cache.add(current_key, 1, timeout=period * 2):
+            current = 1
+        else:
+            try:
+                current = cache.incr(current_key)
+            except ValueError:
+                # Key expired between add() and incr(); start a fresh window.
+                cache.set(current_key, 1, timeout=period * 2)
+                current = 1
+        previous = cache.get(previous_key, 0)
+
+        elapsed = (now % period) / period
+        estimated = previous * (1 - elapsed) + current
+        if estimated <= limit:
+            return True, 0
+        return False, max(1, math.ceil(period - (now % period)))
+
+
+class RoutePolicy:
+    """Rate limit and bot filtering rules for one named route."""
+
+    def __init__(self, name: str, rate: str, block_bots: bool = True):
+        self.name = name
+        self.rate = rate
+        self.limit, self.period = parse_rate(rate)
+        self.block_bots = block_bots
+
+
+def compile_policies(config: Dict[str, object]) -> Dict[str, RoutePolicy]:
+    """
+    Build route policies keyed by URL name from settings.RATELIMIT_POLICIES.
+    Values are either a rate string or a dict with 'rate' and optional 'block_bots'.
+    """
+    policies = {}
+    for url_name, options in (config or {}).items():
+        if isinstance(options, str):
+            options = {"rate": options}
+        policies[url_name] = RoutePolicy(
+            url_name,
+            options["rate"],
+            block_bots=options.get("block_bots", True),
+        )
+    return policies
+
+
+class RateLimitMiddleware:
+    """
+    Apply per-route rate limits and User-Agent filtering in one place.
+    Policies are compiled once at startup and looked up by URL name, so
+    unprotected routes and static/media files skip all counter work.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.policies = compile_policies(getattr(settings, "RATELIMIT_POLICIES", {}))
+        self.counter = SlidingWindowCounter(getattr(settings, "RATELIMIT_CACHE_ALIAS", "default"))
+        self.bypass_prefixes = tuple(
+            prefix for prefix in (settings.STATIC_URL, getattr(settings, "MEDIA_URL", None)) if prefix
+        )
+        self.enabled = getattr(settings, "RATELIMIT_ENABLE", True)
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not self.enabled or not self.policies:
+            return None
+        if self.bypass_prefixes and request.path_info.startswith(self.bypass_prefixes):
+            return None
+        match = getattr(request, "resolver_match", None)
+        policy = self.policies.get(match.url_name) if match else None
+        if policy is None:
+            return None
+
+        if policy.block_bots and is_blocked_user_agent(request):
+            return HttpResponse("Forbidden", status=403)
+
+        allowed, retry_after = self.counter.hit(
+            f"{policy.name}:{client_ip(request)}", policy.limit, policy.period
+        )
+        if allowed:
+            return None
+        response = HttpResponse("Too Many Requests", status=429)
+        response["Retry-After"] = str(retry_after)
+        return response
@@ -0,0 +1,97 @@
+import hashlib
+import logging
+import re
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.template import engines
+from django.utils.safestring import mark_safe
+
+logger = logging.getLogger(__name__)
+
+# Preload commonly used libraries so rich text snippets can call them
+# without needing explicit `{% load %}` statements.
+RICH_CONTENT_PREAMBLE = "{% load page_links i18n static %}"
+TEMPLATE_SYNTAX_RE = re.compile(r"\{[%{#]")
+
+_PURE_HTML = object()
+_INVALID = object()
+
+
+class CompiledTemplateCache:
+    """
+    Bounded LRU of compiled rich-content templates keyed by a hash of the content.
+    Content without any template syntax is remembered as pure HTML and never compiled.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _compile(self, content):
+        if not TEMPLATE_SYNTAX_RE.search(content):
+            return _PURE_HTML
+        try:
+            return engines["django"].from_string(RICH_CONTENT_PREAMBLE + content)
+        except Exception as exc:
+            logger.warning("Failed to compile rich content: %s", exc)
+            return _INVALID
+
+    def get(self, content):
+        """Return a compiled template, _PURE_HTML or _INVALID for content."""
+        key = hashlib.sha1(content.encode("utf-8")).hexdigest()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        # Compile outside the lock; two threads racing on the same content
+        # just produce the same template twice.
+        entry = self._compile(content)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+compiled_templates = CompiledTemplateCache(getattr(settings, "RICH_CONTENT_TEMPLATE_CACHE_SIZE", 256))
+
+
+def render_rich_content(content, context, request=None):
+    """
+    Render stored rich content (Page.content) through the Django template
+    engine so template tags embedded in it (e.g. page_url) are executed.
+    context must be a plain dict; pass request to run context processors.
+    """
+    if not content:
+        return ""
+    content = str(content)
+    template_obj = compiled_templates.get(content)
+    if template_obj is _PURE_HTML or template_obj is _INVALID:
+        return mark_safe(content)
+    try:
+        return mark_safe(template_obj.render(context, request))
+    except Exception:
+        # Fall back to raw content if rendering fails; better to show something
+        # than break the page for users.
+        logger.warning("Failed to render rich content; serving raw HTML", exc_info=True)
+        return mark_safe(content)
@@ -0,0 +1,131 @@
+from datetime import datetime
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from django.conf import settings
+from django.http import Http404
+from django.urls import NoReverseMatch, reverse
+
+from pincatch.models import Page
+from pincatch.versioned_cache import VersionedLocalCache
+
+
+class PageRecord(NamedTuple):
+    """Lightweight routing view of a Page row; load the full Page only to render it."""
+
+    pk: int
+    slug_url: str
+    language: str
+    language_slug: str
+    is_homepage: bool
+    group_id: Optional[int]
+    last_modified: Optional[datetime]
+
+    def get_language_slug(self):
+        """Return the URL slug used for this language (mirrors Page.get_language_slug)."""
+        if self.is_homepage and self.language == settings.LANGUAGE_CODE and not self.language_slug:
+            return ""
+        return self.language_slug or self.language
+
+
+class PageRoutingTable:
+    """
+    In-memory indexes over every Page so routing decisions need no queries.
+    Each index keeps the lowest-pk match, matching the previous
+    `.filter(...).first()` lookups.
+    """
+
+    def __init__(self, records):
+        self.by_url: Dict[Tuple[str, str], PageRecord] = {}
+        self.by_language: Dict[Tuple[str, str], PageRecord] = {}
+        self.by_group: Dict[Tuple[int, str], PageRecord] = {}
+        self.home_by_language: Dict[str, PageRecord] = {}
+        self.home_by_language_slug: Dict[str, PageRecord] = {}
+        self._link_cache: Dict[Tuple[str, str], Optional[str]] = {}
+        for record in records:
+            self.by_url.setdefault((record.slug_url, record.language_slug), record)
+            self.by_language.setdefault((record.slug_url, record.language), record)
+            if record.group_id:
+                self.by_group.setdefault((record.group_id, record.language), record)
+            if record.is_homepage:
+                self.home_by_language.setdefault(record.language, record)
+                self.home_by_language_slug.setdefault(record.language_slug, record)
+
+    def page_for_url(self, slug_url, language_slug) -> Optional[PageRecord]:
+        return self.by_url.get((slug_url, language_slug))
+
+    def page_for_language(self, slug_url, language) -> Optional[PageRecord]:
+        return self.by_language.get((slug_url, language))
+
+    def page_in_group(self, group_id, language) -> Optional[PageRecord]:
+        if not group_id:
+            return None
+        return self.by_group.get((group_id, language))
+
+    def link_target(self, slug_url, language_code) -> Optional[PageRecord]:
+        """Page a page_url link points at: the language's own page, else the default-language one."""
+        return self.page_for_url(slug_url, language_code) or self.page_for_language(
+            slug_url, settings.LANGUAGE_CODE
+        )
+
+    def link_url(self, slug_url, language_code) -> Optional[str]:
+        """
+        Return the page_view URL for a page_url link, or None when no Page matches.
+        Results are memoized for the lifetime of the table (page_view URLs don't
+        depend on the active language), so link-heavy content reverses each slug once.
+        """
+        key = (slug_url, language_code)
+        try:
+            return self._link_cache[key]
+        except KeyError:
+            pass
+        page = self.link_target(slug_url, language_code)
+        url = None
+        if page:
+            try:
+                url = reverse(
+                    "page_view",
+                    kwargs={"language_slug": page.get_language_slug(), "slug": page.slug_url},
+                )
+            except NoReverseMatch:
+                # e.g. a default-language homepage kept at the root without a language slug
+                url = None
+        self._link_cache[key] = url
+        return url
+
+    def home_for_language(self, language) -> Optional[PageRecord]:
+        return self.home_by_language.get(language)
+
+    def home_for_language_slug(self, language_slug) -> Optional[PageRecord]:
+        if not language_slug:
+            return None
+        return self.home_by_language_slug.get(language_slug)
+
+
+_tables = VersionedLocalCache("page-routing")
+
+
+def _build_table():
+    rows = Page.objects.order_by("pk").values_list(
+        "pk", "slug_url", "language", "language_slug", "is_homepage", "group_id", "last_modified"
+    )
+    return PageRoutingTable(PageRecord(*row) for row in rows)
+
+
+def get_routing_table() -> PageRoutingTable:
+    return _tables.get("table", _build_table)
+
+
+def invalidate():
+    """Rebuild the routing table in every worker after a Page changes."""
+    _tables.invalidate()
+
+
+def load_page(page):
+    """Return the full Page for a PageRecord (or pass a Page through unchanged)."""
+    if isinstance(page, Page):
+        return page
+    try:
+        return Page.objects.get(pk=page.pk)
+    except Page.DoesNotExist:
+        # The routing table can briefly lag behind a deleted page.
+        raise Http404("Page not found")
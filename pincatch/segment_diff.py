@@ -0,0 +1,202 @@
+"""
+Re-translate only the segments of a document that changed.
+
+Every machine-translated field keeps a TranslationSnapshot of the source it
+was produced from and the translation as produced. When the source is
+edited, the old and new text segments (html_translation.text_nodes) are
+aligned with difflib: segments in unchanged runs reuse the earlier
+translation at the aligned position, and only inserted or replaced segments
+go to the provider. The result is the new source markup with translations
+spliced in, so re-translating after a typo fix costs one segment, not the
+whole document. translate_fields does the same for several fields of one
+document at once, sending all their pending segments in shared requests.
+"""
+
+import logging
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, Optional, Tuple
+
+from pincatch.html_translation import apply_rtl, parse_html, render, text_nodes, translate_segments
+from pincatch.models import TranslationSnapshot
+from pincatch.translation_memory import LOOKUP_CHUNK, normalize_segment
+
+logger = logging.getLogger(__name__)
+
+
+def snapshot_key(obj, field_name, language):
+    return f"{obj._meta.label_lower}:{obj.pk}:{field_name}:{language}"
+
+
+def load_snapshots(keys: Iterable[str]) -> Dict[str, TranslationSnapshot]:
+    keys = list(keys)
+    snapshots = {}
+    for start in range(0, len(keys), LOOKUP_CHUNK):
+        snapshots.update(TranslationSnapshot.objects.in_bulk(keys[start:start + LOOKUP_CHUNK], field_name="key"))
+    return snapshots
+
+
+def save_snapshots(items: Dict[str, Tuple[str, str]]):
+    """Upsert {key: (source_text, translated_text)} in one statement per chunk."""
+    snapshots = [
+        TranslationSnapshot(key=key, source_text=source_text or "", translated_text=translated_text or "")
+        for key, (source_text, translated_text) in items.items()
+    ]
+    TranslationSnapshot.objects.bulk_create(
+        snapshots,
+        batch_size=LOOKUP_CHUNK,
+        update_conflicts=True,
+        unique_fields=["key"],
+        update_fields=["source_text", "translated_text", "updated_on"],
+    )
+
+
+def is_html(text):
+    return "<" in text and ">" in text
+
+
+def _cores(soup):
+    return [core for _, _, core, _ in text_nodes(soup)]
+
+
+def _reused_plain(source_text, old_source, candidates) -> Optional[str]:
+    """Plain fields (titles, descriptions) are a single segment: reuse it whole or not at all."""
+    if normalize_segment(source_text) != normalize_segment(old_source):
+        return None
+    for candidate in candidates:
+        if candidate.strip() != source_text.strip():
+            return candidate
+    return None
+
+
+def _reused_segments(old_source, candidates, new_nodes) -> Optional[Dict[int, str]]:
+    """
+    Return {index in new_nodes: earlier translation} for the segments that
+    did not change, or None when no candidate lines up with old_source.
+    """
+    old_soup = parse_html(old_source)
+    if old_soup is None:
+        return None
+    old_cores = _cores(old_soup)
+    translated_cores = None
+    for candidate in candidates:
+        candidate_soup = parse_html(candidate)
+        if candidate_soup is None:
+            continue
+        cores = _cores(candidate_soup)
+        if len(cores) == len(old_cores):
+            translated_cores = cores
+            break
+    if translated_cores is None:
+        return None
+
+    new_cores = [core for _, _, core, _ in new_nodes]
+    reused = {}
+    matcher = SequenceMatcher(None, old_cores, new_cores, autojunk=False)
+    for tag, i1, i2, j1, _ in matcher.get_opcodes():
+        if tag != "equal":
+            continue
+        for offset in range(i2 - i1):
+            translated = translated_cores[i1 + offset]
+            # Still identical to its source means it was never translated (e.g. a failed batch); retry it.
+            if translated != old_cores[i1 + offset]:
+                reused[j1 + offset] = translated
+    return reused
+
+
+def _splice(soup, nodes, reused, translations, rtl):
+    for index, (node, prefix, core, suffix) in enumerate(nodes):
+        node.replace_with(f"{prefix}{reused.get(index, translations.get(core, core))}{suffix}")
+    if rtl:
+        apply_rtl(soup)
+    return render(soup)
+
+
+def translate_changed(
+    provider,
+    source_text,
+    source_lang,
+    target_lang,
+    old_source,
+    old_translations: Iterable[str],
+    rtl=False,
+) -> Optional[str]:
+    """
+    Translate source_text reusing old_translations (earlier translations of
+    old_source, best first) for the segments that did not change. Returns
+    None when there is nothing to reuse or no candidate lines up with
+    old_source segment for segment; callers then translate from scratch.
+    """
+    candidates = [candidate for candidate in old_translations if candidate]
+    if not old_source or not candidates:
+        return None
+
+    if not is_html(source_text):
+        return _reused_plain(source_text, old_source, candidates)
+
+    new_soup = parse_html(source_text)
+    if new_soup is None:
+        return None
+    new_nodes = text_nodes(new_soup)
+    reused = _reused_segments(old_source, candidates, new_nodes)
+    if reused is None:
+        return None
+
+    pending = [core for index, (_, _, core, _) in enumerate(new_nodes) if index not in reused]
+    translations = translate_segments(provider, pending, source_lang, target_lang) if pending else {}
+    logger.info(
+        "Reused %s of %s segment(s) for %s->%s; %s sent for translation",
+        len(reused),
+        len(new_nodes),
+        source_lang,
+        target_lang,
+        len(pending),
+    )
+    return _splice(new_soup, new_nodes, reused, translations, rtl)
+
+
+def translate_fields(
+    provider,
+    fields: Dict[str, str],
+    source_lang,
+    target_lang,
+    previous: Optional[Dict[str, Tuple[str, Iterable[str]]]] = None,
+    rtl=False,
+) -> Dict[str, str]:
+    """
+    Translate several fields of one document into one language with a single
+    translate_segments call, so their segments share provider requests
+    instead of costing one round trip per field. previous maps a field name
+    to (old_source, old_translations) as for translate_changed; unchanged
+    segments reuse those translations. Returns {field name: translation}.
+    """
+    previous = previous or {}
+    results = {}
+    plain = {}
+    documents = {}
+    pending = []
+    for name, text in fields.items():
+        if not text:
+            results[name] = text
+            continue
+        old_source, old_translations = previous.get(name, (None, ()))
+        candidates = [candidate for candidate in old_translations if candidate]
+        soup = parse_html(text) if is_html(text) else None
+        if soup is not None:
+            nodes = text_nodes(soup)
+            reused = (_reused_segments(old_source, candidates, nodes) if old_source and candidates else None) or {}
+            pending.extend(core for index, (_, _, core, _) in enumerate(nodes) if index not in reused)
+            documents[name] = (soup, nodes, reused)
+            continue
+        reused_text = _reused_plain(text, old_source, candidates) if old_source and candidates else None
+        if reused_text is not None:
+            results[name] = reused_text
+            continue
+        plain[name] = text
+        pending.append(text)
+
+    translations = translate_segments(provider, pending, source_lang, target_lang) if pending else {}
+    for name, text in plain.items():
+        results[name] = translations.get(text, text)
+    for name, (soup, nodes, reused) in documents.items():
+        results[name] = _splice(soup, nodes, reused, translations, rtl)
+    return results
@@ -92,6 +92,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'pincatch.ratelimit.RateLimitMiddleware',
+    'pincatch.quota.PinQuotaMiddleware',
 ]
 
 ROOT_URLCONF = 'urls'
@@ -126,9 +128,53 @@ DATABASES = {
      'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Translation job workers write concurrently; take the write lock up front
+        # and wait for it instead of failing with "database is locked".
+        'OPTIONS': {
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 20,
+        },
     }
 }
 
+# Cache
+# Shared between workers so rate limit counters hold across processes.
+# Point REDIS_URL at a Redis instance in production; the file cache keeps
+# single-host deployments working without extra services.
+# The "state" alias holds rate-limit counters, quota buckets and the shared
+# version/generation keys (page_cache, routing, VersionedLocalCache, sitemaps),
+# kept apart from rendered pages and sitemaps so culling those never drops them.
+# On the file backend incr() is not atomic across processes and full caches
+# cull entries at random, so limits and quotas are approximate there.
+REDIS_URL = get_env("REDIS_URL", "")
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        },
+        'state': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'state',
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': get_env("DJANGO_CACHE_DIR", str(BASE_DIR / '.cache')),
+            # Room for rendered pages in every language, sitemap sections and pin extractions.
+            'OPTIONS': {'MAX_ENTRIES': 20000, 'CULL_FREQUENCY': 10},
+        },
+        'state': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': get_env("DJANGO_STATE_CACHE_DIR", str(BASE_DIR / '.cache-state')),
+            'OPTIONS': {'MAX_ENTRIES': 100000, 'CULL_FREQUENCY': 10},
+        },
+    }
+STATE_CACHE_ALIAS = "state"
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -217,7 +263,97 @@ DEEPL_AUTH_KEY = "b0f4e722-9985-4c86-90df-497c4cf9b041"
 if not DEEPL_AUTH_KEY and not DEBUG:
     raise ImproperlyConfigured("DEEPL_AUTH_KEY is required")
 
+# Parallel machine translation (pincatch.translation_executor). Limits apply per
+# provider across all threads of a process; failed calls retry with backoff.
+TRANSLATION_MAX_WORKERS = int(get_env("TRANSLATION_MAX_WORKERS", "8"))
+TRANSLATION_PROVIDER_LIMITS = {
+    "deepl": {
+        "concurrency": int(get_env("DEEPL_CONCURRENCY", "4")),
+        "rate_per_second": float(get_env("DEEPL_RATE_PER_SECOND", "8")),
+        "max_retries": 4,
+        "backoff_seconds": 1.0,
+    },
+}
+# Circuit breaker and per-call timeout per provider (pincatch.translation_gateway): after
+# failure_threshold consecutive failures calls fail fast for reset_seconds (doubling up to
+# max_reset_seconds) until a probe succeeds; a quota error pauses for quota_reset_seconds.
+TRANSLATION_PROVIDER_BREAKERS = {
+    "deepl": {
+        "failure_threshold": int(get_env("DEEPL_FAILURE_THRESHOLD", "5")),
+        "reset_seconds": 30.0,
+        "max_reset_seconds": 600.0,
+        "call_timeout_seconds": float(get_env("DEEPL_CALL_TIMEOUT_SECONDS", "60")),
+        "quota_reset_seconds": 3600.0,
+    },
+}
+# Reuse earlier translations of identical segments (pincatch.translation_memory).
+# Bump the version after changing providers or glossaries; prune_translation_memory evicts.
+TRANSLATION_MEMORY_ENABLED = get_env_bool("TRANSLATION_MEMORY_ENABLED", True)
+TRANSLATION_MEMORY_VERSION = int(get_env("TRANSLATION_MEMORY_VERSION", "1"))
+# BeautifulSoup backend for blog.translation_cleanup; "lxml" is faster when installed
+# (falls back to "html.parser" otherwise). Output can differ slightly between parsers.
+TRANSLATION_CLEANUP_PARSER = get_env("TRANSLATION_CLEANUP_PARSER", "html.parser")
+# Durable translation queue (pincatch.translation_jobs); run `manage.py run_translation_jobs`.
+TRANSLATION_JOB_WORKERS = int(get_env("TRANSLATION_JOB_WORKERS", "2"))
+TRANSLATION_JOB_MAX_ATTEMPTS = int(get_env("TRANSLATION_JOB_MAX_ATTEMPTS", "5"))
+TRANSLATION_JOB_RETRY_SECONDS = 30
+TRANSLATION_JOB_MAX_RETRY_SECONDS = 3600
+TRANSLATION_JOB_LEASE_SECONDS = 1800
+TRANSLATION_JOB_POLL_SECONDS = 5
+TRANSLATION_JOB_HANDLERS = {
+    "blog.post": "blog.translations.run_post_job",
+    "blog.category": "blog.translations.run_category_job",
+    "pincatch.page": "pincatch.translations.run_page_job",
+}
+
 RATELIMIT_IP_META_KEY = get_env("RATELIMIT_IP_META_KEY", "REMOTE_ADDR")
+RATELIMIT_ENABLE = get_env_bool("RATELIMIT_ENABLE", True)
+RATELIMIT_CACHE_ALIAS = STATE_CACHE_ALIAS
+# Rate limits applied by pincatch.ratelimit.RateLimitMiddleware, keyed by URL name.
+RATELIMIT_POLICIES = {
+    "home": "10/m",
+    "home_language": "10/m",
+    "imageDownloader": "10/m",
+    "gifDownloader": "10/m",
+    "profileDownloader": "10/m",
+    "page_view": "10/m",
+}
+
+# Cost-aware quotas for the /pin/ extraction API (pincatch.quota.PinQuotaMiddleware).
+# Each request is billed by the work it triggers; buckets refill continuously.
+PIN_QUOTA_PATH_PREFIX = "/pin/"
+PIN_QUOTA_COSTS = {
+    "request": 1,      # minimum charge for requests that did no billable work
+    "cache_hit": 1,
+    "page_fetch": 5,
+    "selenium": 50,
+    "relay_mb": 2,     # per started MB relayed through download_* endpoints
+}
+PIN_QUOTA_TIERS = {
+    "anonymous": {"capacity": int(get_env("PIN_QUOTA_CAPACITY", "300")), "refill_per_second": float(get_env("PIN_QUOTA_REFILL", "0.5"))},
+    "api": {"capacity": int(get_env("PIN_QUOTA_API_CAPACITY", "3000")), "refill_per_second": float(get_env("PIN_QUOTA_API_REFILL", "5"))},
+}
+# Comma-separated "key:tier" pairs, e.g. PIN_API_KEYS=abc123:api
+PIN_API_KEYS = {
+    key.strip(): tier.strip()
+    for key, _, tier in (item.partition(":") for item in get_env("PIN_API_KEYS", "").split(","))
+    if key.strip() and tier.strip()
+}
+PIN_EXTRACTION_CACHE_SECONDS = int(get_env("PIN_EXTRACTION_CACHE_SECONDS", str(6 * 3600)))
+
+# Rendered dynamic Page responses (pincatch.page_cache); invalidated on Page/Post saves.
+PAGE_CACHE_ENABLED = get_env_bool("PAGE_CACHE_ENABLED", True)
+PAGE_CACHE_SECONDS = int(get_env("PAGE_CACHE_SECONDS", "3600"))
+
+# Per-language sitemap sections (blog.sitemaps); invalidated per section on content saves.
+SITEMAP_CACHE_SECONDS = int(get_env("SITEMAP_CACHE_SECONDS", str(24 * 3600)))
+# Gzipped sitemap files for the web server to serve (blog.sitemap_files, `manage.py build_sitemaps`).
+# Opt-in: when enabled, every content save rewrites the affected language sections
+# and the index on disk after its transaction commits.
+SITEMAP_FILES_ENABLED = get_env_bool("SITEMAP_FILES_ENABLED", False)
+SITEMAP_FILES_ROOT = os.path.join(MEDIA_ROOT, "sitemaps")
+SITEMAP_FILES_URL = f"{MEDIA_URL}sitemaps/"
+
 ADMIN_URL = normalise_path(get_env("DJANGO_ADMIN_URL", "admin/"), "admin/")
 ROSETTA_URL = normalise_path(get_env("DJANGO_ROSETTA_URL", "rosetta/"), "rosetta/")
 
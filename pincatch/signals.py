@@ -1,12 +1,16 @@
 import os
-import re
 import shutil
 import logging
 from django.conf import settings
+from django.db import transaction
 from django.db.models.signals import post_save, post_delete, pre_save
-from django.dispatch import receiver
+from django.dispatch import Signal, receiver
+from django.utils import timezone
 from django_restful_translator.translation_providers import TranslationProviderFactory
 from pincatch.models import Page
+from pincatch import page_cache, routing, segment_diff, translation_memory
+from pincatch.translation_executor import TranslationExecutor, throttled
+from pincatch.translation_gateway import ProviderUnavailable
 from django.core.exceptions import ImproperlyConfigured
 
 logger = logging.getLogger(__name__)
@@ -34,6 +38,20 @@ RTL_LANGS = {
     'ar', 'ar-ye', 'ar-eg', 'ar-sa', 'fa', 'he', 'ur', 'ps'
 }
 
+# Sent as pages_bulk_updated.send(sender=Page, pages=[...]) by pages_changed()
+# after Page rows are written without save() (bulk_update). Page post_save
+# receivers that maintain caches, indexes or files listen to it too, so the
+# two write paths can't drift apart.
+pages_bulk_updated = Signal()
+
+
+def pages_changed(pages):
+    """Do what the Page post_save receivers would for pages written with bulk_update, once."""
+    pages = list(pages)
+    if pages:
+        pages_bulk_updated.send(sender=Page, pages=pages)
+
+
 @receiver(pre_save, sender=Page)
 def remember_previous_template_path(sender, instance, **kwargs):
     """
@@ -91,21 +109,26 @@ def generate_page_templates(sender, instance, created, **kwargs):
     else:
         # If nothing changed but the template file is missing (e.g., not checked into VCS on prod),
         # ensure it gets (re)generated so dynamic content renders.
-        language_slug = new_language_slug or settings.LANGUAGE_CODE
-        _, template_path = _get_template_paths(instance.slug_url, language_slug)
-        if not os.path.isfile(template_path):
-            try:
-                _generate_page_template(instance)
-            except Exception as e:  # pragma: no cover - safety net for missing templates
-                logger.error(
-                    "Error regenerating missing template for page %s/%s: %s",
-                    instance.slug_url,
-                    instance.language,
-                    e,
-                    exc_info=True,
-                )
+        _ensure_page_template(instance)
     # Translation to other languages is triggered explicitly via admin actions, not automatically on save.
 
+def _ensure_page_template(page_instance):
+    """Regenerate the page's template file if it is missing."""
+    language_slug = page_instance.get_language_slug() or settings.LANGUAGE_CODE
+    _, template_path = _get_template_paths(page_instance.slug_url, language_slug)
+    if not os.path.isfile(template_path):
+        try:
+            _generate_page_template(page_instance)
+        except Exception as e:  # pragma: no cover - safety net for missing templates
+            logger.error(
+                "Error regenerating missing template for page %s/%s: %s",
+                page_instance.slug_url,
+                page_instance.language,
+                e,
+                exc_info=True,
+            )
+
+
 def _generate_page_template(page_instance):
     """
     Generate HTML template for a specific language
@@ -143,47 +166,136 @@ def _generate_page_template(page_instance):
     logger.info(f"Generated template: {template_path}")
 
 
-def _translate_page_to_other_languages(source_page, force_override=True):
+PAGE_TRANSLATION_FIELDS = ("name", "meta_title", "meta_description", "meta_keywords", "head_html", "content")
+
+
+def _translate_page_to_other_languages(source_page, force_override=True, progress=None):
     """
     Translate the default-language page into all configured languages, saving each Page record.
     Uses django_restful_translator providers already installed in the project.
 
     force_override=True will overwrite existing translated content (used on first create).
     force_override=False will backfill only empty fields to respect manual edits.
+    Either way, segments unchanged since the last run keep their existing translation.
+
+    Languages are translated concurrently on a TranslationExecutor, each as one
+    batched request for all its fields; the pages are then written on this
+    thread in one transaction. progress(done, total) is called as each language
+    finishes translating. Raises ProviderUnavailable, after saving the other
+    languages, when the provider's circuit breaker skipped some of them.
     """
     default_lang = settings.LANGUAGE_CODE
     if source_page.language != default_lang:
         return
 
-    provider = _get_provider_safely()
+    provider = throttled(_get_provider_safely(), "deepl")
     languages = [lang[0] for lang in settings.LANGUAGES if lang[0] != default_lang]
+    snapshots = segment_diff.load_snapshots(
+        segment_diff.snapshot_key(source_page, field_name, language)
+        for language in languages
+        for field_name in PAGE_TRANSLATION_FIELDS
+    )
+    existing = {
+        page.language: page
+        for page in Page.objects.filter(slug_url=source_page.slug_url, language__in=languages)
+    }
+
+    translated = {}
+    unavailable = []
+
+    def _collect(language, result):
+        translated[language] = result
+        if progress is not None:
+            progress(len(translated), len(languages))
+
+    def _skipped(language, exc):
+        if isinstance(exc, ProviderUnavailable):
+            unavailable.append(exc)
+
+    TranslationExecutor().run(
+        (
+            (
+                language,
+                _translate_page_fields,
+                (provider, source_page, existing.get(language), language, snapshots, force_override),
+            )
+            for language in languages
+        ),
+        on_result=_collect,
+        on_error=_skipped,
+    )
+    _save_translated_pages(source_page, existing, translated, provider is not None)
+    translation_memory.flush()
+    if unavailable:
+        # Languages skipped while the provider was down stay untranslated; fail so the job is retried.
+        raise unavailable[0]
 
-    for language in languages:
-        target_page, _ = Page.objects.get_or_create(
-            slug_url=source_page.slug_url,
-            language=language,
-            defaults={"group": source_page.group, "language_slug": language},
-        )
-        if not target_page.language_slug:
-            target_page.language_slug = language
-        target_page.is_homepage = source_page.is_homepage
-
-        def _maybe_translate(field_name):
-            current = getattr(target_page, field_name)
-            source_val = getattr(source_page, field_name)
-            if force_override or not current or current == source_val:
-                translated = _safe_translate(provider, source_val, default_lang, language)
-                setattr(target_page, field_name, translated)
-
-        # Keep translations in sync; translate when forced, empty, or still matching the source language.
-        _maybe_translate("name")
-        _maybe_translate("meta_title")
-        _maybe_translate("meta_description")
-        _maybe_translate("meta_keywords")
-        _maybe_translate("head_html")
-        _maybe_translate("content")
 
-        target_page.save()
+def _translate_page_fields(provider, source_page, target_page, language, snapshots, force_override):
+    """
+    Worker job: return ({field: translation}, {snapshot key: (source, translation)})
+    for the fields of target_page (None when not created yet) that need translating.
+    Reads only; the caller saves.
+    """
+    # Keep translations in sync; translate when forced, empty, or still matching the source language.
+    fields = {}
+    previous = {}
+    for field_name in PAGE_TRANSLATION_FIELDS:
+        current = getattr(target_page, field_name) if target_page is not None else None
+        source_val = getattr(source_page, field_name)
+        if force_override or not current or current == source_val:
+            fields[field_name] = source_val
+            snapshot = snapshots.get(segment_diff.snapshot_key(source_page, field_name, language))
+            if snapshot:
+                previous[field_name] = (snapshot.source_text, [current, snapshot.translated_text])
+
+    values = _safe_translate_fields(provider, fields, settings.LANGUAGE_CODE, language, previous)
+    produced = {
+        segment_diff.snapshot_key(source_page, field_name, language): (fields[field_name], value)
+        for field_name, value in values.items()
+    }
+    return values, produced
+
+
+def _save_translated_pages(source_page, existing, translated, save_snapshots):
+    """
+    Write every translated language in one transaction. New pages (and pages
+    without a language slug) go through save() so their templates are generated;
+    the rest are bulk-updated and reported through pages_changed() once.
+    """
+    now = timezone.now()
+    updated = []
+    produced = {}
+    with transaction.atomic():
+        for language, (values, language_produced) in translated.items():
+            produced.update(language_produced)
+            target_page = existing.get(language)
+            if target_page is None or not target_page.language_slug:
+                if target_page is None:
+                    target_page = Page(
+                        slug_url=source_page.slug_url,
+                        language=language,
+                        group=source_page.group,
+                        language_slug=language,
+                    )
+                target_page.language_slug = language
+                target_page.is_homepage = source_page.is_homepage
+                for field_name, value in values.items():
+                    setattr(target_page, field_name, value)
+                target_page.save()
+                continue
+            target_page.is_homepage = source_page.is_homepage
+            for field_name, value in values.items():
+                setattr(target_page, field_name, value)
+            # bulk_update bypasses auto_now.
+            target_page.last_modified = now
+            updated.append(target_page)
+        if updated:
+            Page.objects.bulk_update(updated, [*PAGE_TRANSLATION_FIELDS, "is_homepage", "last_modified"])
+        if save_snapshots:
+            segment_diff.save_snapshots(produced)
+    # bulk_update skips post_save.
+    pages_changed(updated)
 
 
 def _get_provider_safely():
@@ -197,73 +309,23 @@ def _get_provider_safely():
     return None
 
 
-def _safe_translate(provider, text, source_lang, target_lang):
-    """Translate text; on any failure, return the original text so pages are still created."""
-    if not text:
-        return text
+def _safe_translate_fields(provider, fields, source_lang, target_lang, previous=None):
+    """
+    Translate {field: text} in one batched pass; on a failure, return the original
+    texts so pages are still created. ProviderUnavailable propagates. previous maps a field to (old_source,
+    old_translations), so only segments changed since then are translated.
+    """
     if provider is None:
-        return text
-    if getattr(provider, "_disable_after_error", False):
-        return text
+        return dict(fields)
     normalized_target = LANGUAGE_CODE_MAP.get(target_lang, target_lang)
-    # Preserve HTML structure by translating only text nodes when markup is present.
-    def _translate_html(html_text):
-        try:
-            from bs4 import BeautifulSoup
-        except Exception:
-            return None
-
-        def _apply_rtl(soup_obj):
-            block_tags = {"p", "li", "ul", "ol", "h1", "h2", "h3", "h4", "h5", "h6", "div", "section", "article", "details", "summary"}
-            for tag in soup_obj.find_all(block_tags):
-                if not tag.has_attr("dir"):
-                    tag["dir"] = "rtl"
-                # Keep existing alignment; only set if none
-                current_style = tag.get("style", "")
-                if "text-align" not in current_style:
-                    tag["style"] = (current_style + "; text-align: right;").strip("; ")
-
-        def _preserve_whitespace(original, translated):
-            match = re.match(r"(\s*)(.*?)(\s*)$", original, flags=re.DOTALL)
-            if not match:
-                return translated
-            prefix, core, suffix = match.groups()
-            return f"{prefix}{translated}{suffix}"
-
-        try:
-            from bs4 import Comment
-
-            soup = BeautifulSoup(html_text, "html.parser")
-            for node in soup.find_all(string=True):
-                if isinstance(node, Comment):
-                    # Preserve comments untouched so they don't become visible text after translation.
-                    continue
-                if getattr(node, "parent", None) and node.parent.name in {"script", "style"}:
-                    continue
-                original = str(node)
-                if not original.strip():
-                    continue
-                try:
-                    translated = provider.translate_text(original, source_lang, normalized_target)
-                except Exception:
-                    translated = original
-                node.replace_with(_preserve_whitespace(original, translated))
-            if normalized_target.lower() in RTL_LANGS:
-                _apply_rtl(soup)
-            # Return inner HTML without BeautifulSoup adding extra wrappers/whitespace.
-            if soup.body:
-                return soup.body.decode_contents(formatter="minimal")
-            # Fallback to all top-level contents joined.
-            return "".join(child.decode(formatter="minimal") if hasattr(child, "decode") else str(child) for child in soup.contents)
-        except Exception:
-            return None
-
-    if "<" in text and ">" in text:
-        translated_html = _translate_html(text)
-        if translated_html is not None:
-            return translated_html
+    rtl = normalized_target.lower() in RTL_LANGS
     try:
-        return provider.translate_text(text, source_lang, normalized_target)
+        return segment_diff.translate_fields(
+            provider, fields, source_lang, normalized_target, previous=previous, rtl=rtl
+        )
+    except ProviderUnavailable:
+        # Circuit open (pincatch.translation_gateway): skip this language rather than save source text.
+        raise
     except Exception as exc:
         logger.error(
             "Translation failed for %s->%s: %s; using source text",
@@ -272,11 +334,7 @@ def _safe_translate(provider, text, source_lang, target_lang):
             exc,
             exc_info=True,
         )
-        try:
-            provider._disable_after_error = True  # Avoid hammering provider when failing (e.g., offline)
-        except Exception:
-            pass
-        return text
+        return dict(fields)
 
 
 def _remove_template_file(slug_url, language_slug):
@@ -335,3 +393,19 @@ def delete_page_template(sender, instance, **kwargs):
     Remove the generated template file (and empty directory) when a Page is deleted.
     """
     _remove_template_file(instance.slug_url, instance.get_language_slug())
+
+
+@receiver(pages_bulk_updated, sender=Page)
+def ensure_bulk_updated_page_templates(sender, pages, **kwargs):
+    """bulk_update skips generate_page_templates; make sure each page still has its template."""
+    for page in pages:
+        _ensure_page_template(page)
+
+
+@receiver(post_save, sender=Page)
+@receiver(post_delete, sender=Page)
+@receiver(pages_bulk_updated, sender=Page)
+def invalidate_rendered_pages(sender, **kwargs):
+    """Drop cached page renders and routing so admin edits show up on the next request."""
+    routing.invalidate()
+    page_cache.invalidate_all()
@@ -0,0 +1,133 @@
+import gzip
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from blog import sitemap_files, sitemaps
+from pincatch import page_cache, signals
+from pincatch.models import Page
+from pincatch.ratelimit import RateLimitMiddleware
+from pincatch.versioned_cache import bump_version, shared_version, state_cache
+
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "tests-default"},
+    "state": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "tests-state"},
+}
+
+
+@override_settings(
+    CACHES=LOCMEM_CACHES,
+    RATELIMIT_ENABLE=True,
+    RATELIMIT_IP_META_KEY="REMOTE_ADDR",
+    RATELIMIT_POLICIES={"home": "2/m"},
+)
+class RateLimitMiddlewareTests(SimpleTestCase):
+    def _hit(self, middleware, **meta):
+        request = RequestFactory().get("/", HTTP_USER_AGENT="Mozilla/5.0", **meta)
+        request.resolver_match = SimpleNamespace(url_name="home")
+        return middleware.process_view(request, None, (), {})
+
+    def test_spoofed_x_real_ip_does_not_reset_the_counter(self):
+        middleware = RateLimitMiddleware(lambda request: None)
+        for spoofed in ("10.0.0.1", "10.0.0.2"):
+            self.assertIsNone(self._hit(middleware, REMOTE_ADDR="203.0.113.7", HTTP_X_REAL_IP=spoofed))
+        response = self._hit(middleware, REMOTE_ADDR="203.0.113.7", HTTP_X_REAL_IP="10.0.0.3")
+        self.assertEqual(response.status_code, 429)
+
+
+@override_settings(CACHES=LOCMEM_CACHES, STATE_CACHE_ALIAS="state")
+class SharedVersionTests(SimpleTestCase):
+    def test_lost_version_key_does_not_revert_to_an_older_version(self):
+        seen = {shared_version("version:test")}
+        bump_version("version:test")
+        seen.add(shared_version("version:test"))
+        state_cache().delete("version:test")
+        self.assertNotIn(shared_version("version:test"), seen)
+
+
+@override_settings(CACHES=LOCMEM_CACHES, STATE_CACHE_ALIAS="state", PAGE_CACHE_ENABLED=True)
+class PageCacheTests(SimpleTestCase):
+    page = SimpleNamespace(pk=1, language="en", last_modified=datetime(2024, 1, 1, tzinfo=timezone.utc))
+
+    def setUp(self):
+        cache.clear()
+
+    def _serve(self, path):
+        request = RequestFactory().get(path)
+        return page_cache.serve_page(request, self.page, lambda csrf_token: HttpResponse("<p>page</p>"))
+
+    def _entries(self):
+        return [key for key in cache._cache if "pagecache:" in key]
+
+    def test_arbitrary_query_strings_do_not_create_entries(self):
+        self._serve("/about/?a=1")
+        self._serve("/about/?a=2")
+        self.assertEqual(self._entries(), [])
+
+    def test_tracking_parameters_share_the_plain_path_entry(self):
+        self._serve("/about/")
+        self._serve("/about/?utm_source=newsletter")
+        self._serve("/about/?utm_source=ads&gclid=123")
+        self.assertEqual(len(self._entries()), 1)
+
+
+class FakeProvider:
+    batch_size = 50
+
+    def translate_text(self, text, source_language, target_language):
+        if isinstance(text, list):
+            return [f"[{target_language}]{item}" for item in text]
+        return f"[{target_language}]{text}"
+
+
+class BulkPageTranslationTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        overrides = override_settings(
+            CACHES=LOCMEM_CACHES,
+            STATE_CACHE_ALIAS="state",
+            BASE_DIR=self.root,
+            LANGUAGES=[("en", "English"), ("de", "German")],
+            TRANSLATION_MEMORY_ENABLED=False,
+            SITEMAP_FILES_ENABLED=True,
+            SITEMAP_FILES_ROOT=self.root / "sitemaps",
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        cache.clear()
+        self.source = Page.objects.create(slug_url="about", language="en", name="About", content="<p>Hello</p>")
+        Page.objects.create(slug_url="about", language="de", language_slug="de", name="Alt", content="<p>Alt</p>")
+        Page.objects.filter(language="de").update(last_modified=datetime(2020, 1, 1, tzinfo=timezone.utc))
+
+    def _index(self):
+        response = sitemaps.sitemap_index(RequestFactory().get("/sitemap.xml"))
+        if response.streaming:
+            return b"".join(response.streaming_content).decode()
+        return response.content.decode()
+
+    def _pages_file(self):
+        with gzip.open(self.root / "sitemaps" / "sitemap-pages-de.xml.gz", "rt") as handle:
+            return handle.read()
+
+    def test_bulk_retranslation_refreshes_page_sitemaps(self):
+        sitemaps.invalidate("pages")
+        sitemap_files.build_all()
+        index_before = self._index()
+        self.assertIn("2020-01-01", index_before)
+        self.assertIn("<lastmod>2020-01-01</lastmod>", self._pages_file())
+
+        with mock.patch.object(signals, "_get_provider_safely", return_value=FakeProvider()):
+            with self.captureOnCommitCallbacks(execute=True):
+                signals._translate_page_to_other_languages(self.source, force_override=True)
+
+        self.assertEqual(Page.objects.get(language="de").name, "[DE]About")
+        self.assertNotEqual(self._index(), index_before)
+        self.assertNotIn("<lastmod>2020-01-01</lastmod>", self._pages_file())
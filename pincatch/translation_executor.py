@@ -0,0 +1,199 @@
+"""
+Run machine-translation work in parallel without overrunning the provider.
+
+ThrottledProvider wraps a django_restful_translator provider so every
+translate_text call, from any thread, shares that provider's concurrency cap,
+request rate and circuit breaker (pincatch.translation_gateway), and is
+retried with exponential backoff on errors.
+TranslationExecutor fans independent jobs (e.g. one language x field each)
+out over a bounded thread pool and hands every result back on the calling
+thread, so database writes stay single-threaded (SQLite) and each finished
+job is saved immediately: an interrupted run keeps its progress and the next
+run only picks up what is still pending.
+"""
+
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Optional, Tuple
+
+from django.conf import settings
+from django.db import connections
+
+from pincatch.translation_gateway import ProviderUnavailable, gateway_for, is_quota_error
+
+logger = logging.getLogger(__name__)
+
+
+class ProviderLimits(NamedTuple):
+    concurrency: int = 4
+    rate_per_second: float = 8.0
+    max_retries: int = 4
+    backoff_seconds: float = 1.0
+    max_backoff_seconds: float = 30.0
+
+
+def limits_for(provider_name) -> ProviderLimits:
+    configured = getattr(settings, "TRANSLATION_PROVIDER_LIMITS", {}).get(provider_name, {})
+    return ProviderLimits(**configured)
+
+
+class RateLimiter:
+    """Blocking token bucket shared by every thread of the process."""
+
+    def __init__(self, rate_per_second, burst=None):
+        self.rate = float(rate_per_second)
+        self.capacity = float(burst if burst is not None else max(1.0, self.rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class _ProviderThrottle:
+    def __init__(self, limits: ProviderLimits):
+        self.limits = limits
+        self.semaphore = threading.BoundedSemaphore(max(1, limits.concurrency))
+        self.limiter = RateLimiter(limits.rate_per_second)
+
+
+_throttles: Dict[str, _ProviderThrottle] = {}
+_throttles_lock = threading.Lock()
+
+
+def _throttle_for(provider_name) -> _ProviderThrottle:
+    with _throttles_lock:
+        throttle = _throttles.get(provider_name)
+        if throttle is None:
+            throttle = _throttles[provider_name] = _ProviderThrottle(limits_for(provider_name))
+        return throttle
+
+
+def backoff_delay(attempt, limits: ProviderLimits) -> float:
+    """Exponential backoff with full jitter for retry number attempt (0-based)."""
+    ceiling = min(limits.max_backoff_seconds, limits.backoff_seconds * (2 ** attempt))
+    return random.uniform(0, ceiling)
+
+
+class ThrottledProvider:
+    """
+    Provider proxy: translate_text goes through the provider's
+    translation_gateway (circuit breaker, call timeout, metrics), waits for
+    a concurrency slot and a rate token, and retries failures with backoff
+    before re-raising the last error. While the breaker is open it raises
+    ProviderUnavailable without retrying. Other attributes (batch_size, ...)
+    pass through to the wrapped provider.
+    """
+
+    def __init__(self, provider, provider_name):
+        self._provider = provider
+        self.provider_name = provider_name
+        self._throttle = _throttle_for(provider_name)
+        self._gateway = gateway_for(provider_name, max_in_flight=self._throttle.limits.concurrency)
+
+    def __getattr__(self, name):
+        return getattr(self._provider, name)
+
+    def translate_text(self, text, source_language, target_language):
+        limits = self._throttle.limits
+        attempt = 0
+        while True:
+            self._gateway.admit()
+            try:
+                with self._throttle.semaphore:
+                    self._throttle.limiter.acquire()
+                    return self._gateway.call(self._provider.translate_text, text, source_language, target_language)
+            except Exception as exc:
+                if attempt >= limits.max_retries or is_quota_error(exc):
+                    raise
+                delay = backoff_delay(attempt, limits)
+                logger.warning(
+                    "%s translate_text failed (%s); retry %s/%s in %.1fs",
+                    self.provider_name,
+                    exc,
+                    attempt + 1,
+                    limits.max_retries,
+                    delay,
+                )
+                attempt += 1
+                time.sleep(delay)
+
+
+def throttled(provider, provider_name):
+    """Wrap provider in a ThrottledProvider; None (no provider configured) passes through."""
+    if provider is None or isinstance(provider, ThrottledProvider):
+        return provider
+    return ThrottledProvider(provider, provider_name)
+
+
+def _in_worker(fn, args):
+    try:
+        return fn(*args)
+    finally:
+        # Jobs may read (e.g. the translation memory); don't leak this thread's connections.
+        connections.close_all()
+
+
+class TranslationExecutor:
+    """
+    Bounded thread pool for independent translation jobs.
+
+    run() takes (key, fn, args) jobs, executes fn(*args) in worker threads and
+    calls on_result(key, value) on the calling thread as each job finishes.
+    Worker functions may read from the database but must not write to it.
+    """
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or getattr(settings, "TRANSLATION_MAX_WORKERS", 8)
+
+    def run(
+        self,
+        jobs: Iterable[Tuple[Any, Callable, tuple]],
+        on_result: Optional[Callable[[Any, Any], None]] = None,
+        on_error: Optional[Callable[[Any, BaseException], None]] = None,
+    ) -> Dict[Any, Any]:
+        """Return {key: value} for jobs that succeeded."""
+        jobs = list(jobs)
+        results = {}
+        if not jobs:
+            return results
+        workers = max(1, min(self.max_workers, len(jobs)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="translate") as pool:
+            futures = {pool.submit(_in_worker, fn, args): key for key, fn, args in jobs}
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    value = future.result()
+                except ProviderUnavailable as exc:
+                    logger.warning("Translation job %s skipped: %s", key, exc)
+                    if on_error is not None:
+                        on_error(key, exc)
+                    continue
+                except Exception as exc:
+                    logger.error("Translation job %s failed: %s", key, exc, exc_info=True)
+                    if on_error is not None:
+                        on_error(key, exc)
+                    continue
+                results[key] = value
+                if on_result is not None:
+                    try:
+                        on_result(key, value)
+                    except Exception:
+                        # Keep saving the other results; the failed one stays pending.
+                        logger.exception("Saving translation job %s failed", key)
+        return results
@@ -0,0 +1,243 @@
+"""
+Provider health shared by the blog and dynamic Page translation flows.
+
+Every provider request made through translation_executor.ThrottledProvider
+passes a per-provider gateway. The gateway refuses calls at once while the
+provider's circuit breaker is open, bounds each call with a timeout, and
+counts calls, failures and characters for stats(). failure_threshold
+consecutive failures open the breaker for reset_seconds. After that a
+single half-open probe is let through: success closes the breaker, and
+failure reopens it with the cool-down doubled (up to max_reset_seconds).
+A quota error (DeepL 456) opens it for quota_reset_seconds straight away.
+Refused calls raise ProviderUnavailable. The flows then leave their
+placeholders pending and queued jobs wait for the provider to recover,
+instead of every worker thread sitting through timeouts and retries.
+"""
+
+import logging
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Dict, NamedTuple
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class ProviderUnavailable(Exception):
+    """The provider's breaker is open; retry_after is the number of seconds until the next probe."""
+
+    def __init__(self, provider_name, retry_after, reason=""):
+        self.provider_name = provider_name
+        self.retry_after = max(0.0, float(retry_after))
+        self.reason = reason
+        super().__init__(f"{provider_name} unavailable ({reason or 'circuit open'}); retry in {self.retry_after:.0f}s")
+
+
+class ProviderTimeout(TimeoutError):
+    pass
+
+
+class BreakerPolicy(NamedTuple):
+    failure_threshold: int = 5
+    reset_seconds: float = 30.0
+    max_reset_seconds: float = 600.0
+    call_timeout_seconds: float = 60.0
+    quota_reset_seconds: float = 3600.0
+
+
+def policy_for(provider_name) -> BreakerPolicy:
+    configured = getattr(settings, "TRANSLATION_PROVIDER_BREAKERS", {}).get(provider_name, {})
+    return BreakerPolicy(**configured)
+
+
+def is_quota_error(exc) -> bool:
+    """True for errors that retrying won't fix until the provider's quota resets."""
+    try:
+        from deepl import QuotaExceededException
+    except Exception:
+        return False
+    return isinstance(exc, QuotaExceededException)
+
+
+def _characters(text) -> int:
+    if isinstance(text, str):
+        return len(text)
+    return sum(len(item) for item in text)
+
+
+class CircuitBreaker:
+    """Closed / open / half-open state of one provider, shared by every thread of the process."""
+
+    def __init__(self, provider_name, policy: BreakerPolicy):
+        self.provider_name = provider_name
+        self.policy = policy
+        self.state = CLOSED
+        self.reason = ""
+        self._failures = 0
+        self._cooldown = policy.reset_seconds
+        self._open_until = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def retry_after(self) -> float:
+        with self._lock:
+            if self.state == CLOSED:
+                return 0.0
+            return max(0.0, self._open_until - time.monotonic())
+
+    def admit(self):
+        """Raise ProviderUnavailable unless a call may go out now."""
+        with self._lock:
+            now = time.monotonic()
+            if self.state == OPEN:
+                if now < self._open_until:
+                    raise ProviderUnavailable(self.provider_name, self._open_until - now, self.reason)
+                self.state = HALF_OPEN
+                self._probing = False
+            if self.state == HALF_OPEN:
+                if self._probing:
+                    raise ProviderUnavailable(self.provider_name, self.policy.reset_seconds, "probe in progress")
+                self._probing = True
+                logger.info("%s circuit half-open; probing", self.provider_name)
+
+    def record_success(self):
+        with self._lock:
+            if self.state != CLOSED:
+                logger.warning("%s circuit closed; provider recovered", self.provider_name)
+            self.state = CLOSED
+            self.reason = ""
+            self._failures = 0
+            self._cooldown = self.policy.reset_seconds
+            self._probing = False
+
+    def record_failure(self, reason, quota=False):
+        with self._lock:
+            self._failures += 1
+            if quota:
+                self._open(self.policy.quota_reset_seconds, reason)
+            elif self.state == HALF_OPEN:
+                self._cooldown = min(self.policy.max_reset_seconds, self._cooldown * 2)
+                self._open(self._cooldown, reason)
+            elif self.state == CLOSED and self._failures >= self.policy.failure_threshold:
+                self._open(self._cooldown, reason)
+
+    def _open(self, seconds, reason):
+        self.state = OPEN
+        self.reason = reason
+        self._probing = False
+        self._open_until = time.monotonic() + seconds
+        logger.warning(
+            "%s circuit open for %.0fs after %s failure(s): %s",
+            self.provider_name,
+            seconds,
+            self._failures,
+            reason,
+        )
+
+
+class ProviderGateway:
+    """
+    Breaker, per-call timeout and metrics for one provider. Calls run on a
+    pool of max_in_flight threads, so a call that outlives its timeout keeps
+    its slot until the provider answers and never raises the real number of
+    open requests above the provider's concurrency.
+    """
+
+    def __init__(self, provider_name, max_in_flight, policy: BreakerPolicy = None):
+        self.provider_name = provider_name
+        self.policy = policy or policy_for(provider_name)
+        self.breaker = CircuitBreaker(provider_name, self.policy)
+        self._calls = ThreadPoolExecutor(max_workers=max(1, max_in_flight), thread_name_prefix=f"{provider_name}-call")
+        self._stats = Counter()
+        self._stats_lock = threading.Lock()
+
+    def _count(self, **counts):
+        with self._stats_lock:
+            self._stats.update(counts)
+
+    def admit(self):
+        try:
+            self.breaker.admit()
+        except ProviderUnavailable:
+            self._count(rejected=1)
+            raise
+
+    def call(self, fn, text, *args):
+        """Run fn(text, *args) within the call timeout and record the outcome. Call admit() first."""
+        started = time.monotonic()
+        timeout = self.policy.call_timeout_seconds
+        try:
+            if timeout and timeout > 0:
+                future = self._calls.submit(fn, text, *args)
+                try:
+                    result = future.result(timeout=timeout)
+                except FutureTimeout:
+                    future.cancel()
+                    raise ProviderTimeout(f"{self.provider_name} call timed out after {timeout:g}s") from None
+            else:
+                result = fn(text, *args)
+        except Exception as exc:
+            quota = is_quota_error(exc)
+            self._count(
+                calls=1,
+                failures=1,
+                timeouts=int(isinstance(exc, ProviderTimeout)),
+                quota_errors=int(quota),
+                seconds=time.monotonic() - started,
+            )
+            self.breaker.record_failure(f"{type(exc).__name__}: {exc}", quota=quota)
+            raise
+        self._count(calls=1, characters=_characters(text), seconds=time.monotonic() - started)
+        self.breaker.record_success()
+        return result
+
+    def stats(self) -> Dict[str, float]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        calls = stats.get("calls", 0)
+        return {
+            "state": self.breaker.state,
+            "retry_after": self.breaker.retry_after(),
+            "calls": calls,
+            "failures": stats.get("failures", 0),
+            "timeouts": stats.get("timeouts", 0),
+            "quota_errors": stats.get("quota_errors", 0),
+            "rejected": stats.get("rejected", 0),
+            "characters": stats.get("characters", 0),
+            "avg_seconds": stats.get("seconds", 0.0) / calls if calls else 0.0,
+        }
+
+
+_gateways: Dict[str, ProviderGateway] = {}
+_gateways_lock = threading.Lock()
+
+
+def gateway_for(provider_name, max_in_flight=4) -> ProviderGateway:
+    with _gateways_lock:
+        gateway = _gateways.get(provider_name)
+        if gateway is None:
+            gateway = _gateways[provider_name] = ProviderGateway(provider_name, max_in_flight)
+        return gateway
+
+
+def raise_if_unavailable(provider_name):
+    """Raise ProviderUnavailable while provider_name's breaker is not closed."""
+    with _gateways_lock:
+        gateway = _gateways.get(provider_name)
+    if gateway is None or gateway.breaker.state == CLOSED:
+        return
+    raise ProviderUnavailable(provider_name, gateway.breaker.retry_after(), gateway.breaker.reason)
+
+
+def stats() -> Dict[str, Dict[str, float]]:
+    """Per-provider breaker state and call counters for this process."""
+    with _gateways_lock:
+        gateways = dict(_gateways)
+    return {name: gateway.stats() for name, gateway in sorted(gateways.items())}
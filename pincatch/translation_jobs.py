@@ -0,0 +1,223 @@
+"""
+Durable translation queue.
+
+Admin actions enqueue a TranslationJob row instead of starting a thread, so
+bulk actions no longer fan out one unbounded thread per object and queued
+work survives restarts. `manage.py run_translation_jobs` claims due jobs
+(highest priority first) into a bounded pool; a failed job is retried with
+exponential backoff up to TRANSLATION_JOB_MAX_ATTEMPTS times, and a job
+whose worker died is picked up again once its lease expires. A job that
+fails with ProviderUnavailable (pincatch.translation_gateway) waits for
+the provider to recover without spending an attempt. Handlers are looked
+up by job kind in TRANSLATION_JOB_HANDLERS and called as
+handler(object_id, reset_existing, progress); progress(done, total) is
+stored on the job for the admin.
+"""
+
+import logging
+import os
+import socket
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from pincatch import translation_memory
+from pincatch.models import TranslationJob
+from pincatch.translation_gateway import ProviderUnavailable
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_NORMAL = 0
+PRIORITY_HIGH = 10
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def enqueue(kind, object_id, reset_existing=False, priority=PRIORITY_NORMAL) -> TranslationJob:
+    """
+    Queue a translation of one object, merging into its pending job if there
+    is one (the higher priority and reset_existing=True win).
+    """
+    object_id = str(object_id)
+    for _ in range(2):
+        with transaction.atomic():
+            job = (
+                TranslationJob.objects.select_for_update()
+                .filter(kind=kind, object_id=object_id, status=TranslationJob.STATUS_PENDING)
+                .first()
+            )
+            if job is not None:
+                job.priority = max(job.priority, priority)
+                job.reset_existing = job.reset_existing or reset_existing
+                job.save(update_fields=["priority", "reset_existing", "updated_on"])
+                return job
+            try:
+                with transaction.atomic():
+                    return TranslationJob.objects.create(
+                        kind=kind,
+                        object_id=object_id,
+                        reset_existing=reset_existing,
+                        priority=priority,
+                    )
+            except IntegrityError:
+                # Another request queued the same object in between; merge into that job.
+                continue
+    raise RuntimeError(f"Could not enqueue {kind} {object_id}")
+
+
+def latest_jobs(kind, object_ids):
+    """Return {object_id: most recent TranslationJob} for the given objects."""
+    jobs = {}
+    queryset = TranslationJob.objects.filter(kind=kind, object_id__in=[str(pk) for pk in object_ids])
+    for job in queryset.order_by("created_on", "pk"):
+        jobs[job.object_id] = job
+    return jobs
+
+
+def report_progress(job_id, done, total):
+    """Store progress; also renews the job's lease."""
+    TranslationJob.objects.filter(pk=job_id).update(
+        progress_done=done,
+        progress_total=total,
+        locked_at=timezone.now(),
+    )
+
+
+def retry_delay(attempts) -> float:
+    base = _setting("TRANSLATION_JOB_RETRY_SECONDS", 30)
+    return min(_setting("TRANSLATION_JOB_MAX_RETRY_SECONDS", 3600), base * (2 ** max(0, attempts - 1)))
+
+
+def requeue_expired() -> int:
+    """Return jobs whose worker stopped renewing the lease to the queue."""
+    cutoff = timezone.now() - timedelta(seconds=_setting("TRANSLATION_JOB_LEASE_SECONDS", 1800))
+    requeued = 0
+    for job in TranslationJob.objects.filter(status=TranslationJob.STATUS_RUNNING, locked_at__lt=cutoff):
+        logger.warning("Translation job %s lost its worker (%s); re-queuing", job.pk, job.locked_by)
+        requeued += _retry_or_fail(job, "Worker stopped before finishing")
+    return requeued
+
+
+def claim(worker_id):
+    """Mark the next due job running for this worker and return it (None when idle)."""
+    due = (
+        TranslationJob.objects.filter(status=TranslationJob.STATUS_PENDING, run_after__lte=timezone.now())
+        .order_by("-priority", "run_after", "pk")
+        .values_list("pk", flat=True)[:10]
+    )
+    for pk in list(due):
+        claimed = TranslationJob.objects.filter(pk=pk, status=TranslationJob.STATUS_PENDING).update(
+            status=TranslationJob.STATUS_RUNNING,
+            locked_by=worker_id,
+            locked_at=timezone.now(),
+            attempts=F("attempts") + 1,
+            progress_done=0,
+            progress_total=0,
+        )
+        if claimed:
+            return TranslationJob.objects.get(pk=pk)
+    return None
+
+
+def _retry_or_fail(job, error, delay=None) -> int:
+    """
+    Reschedule a failed attempt with backoff, or mark the job failed. Returns 1 if re-queued.
+    With delay (the provider was unavailable), re-queue after delay seconds without spending the attempt.
+    """
+    now = timezone.now()
+    running = TranslationJob.objects.filter(pk=job.pk, status=TranslationJob.STATUS_RUNNING)
+    refund = {"attempts": F("attempts") - 1} if delay is not None else {}
+    if delay is None and job.attempts >= _setting("TRANSLATION_JOB_MAX_ATTEMPTS", 5):
+        running.update(status=TranslationJob.STATUS_FAILED, last_error=error, locked_by="", finished_on=now)
+        return 0
+    try:
+        with transaction.atomic():
+            # The reset (if any) already happened; retries only fill what is still pending.
+            running.update(
+                status=TranslationJob.STATUS_PENDING,
+                reset_existing=False,
+                run_after=now + timedelta(seconds=retry_delay(job.attempts) if delay is None else delay),
+                last_error=error,
+                locked_by="",
+                locked_at=None,
+                **refund,
+            )
+    except IntegrityError:
+        # The object was queued again meanwhile; that pending job covers this retry.
+        running.update(
+            status=TranslationJob.STATUS_FAILED,
+            last_error=f"{error} (superseded by a newer job)",
+            locked_by="",
+            finished_on=now,
+        )
+        return 0
+    return 1
+
+
+def run_job(job):
+    """Run one claimed job on the current thread."""
+    try:
+        handler_path = _setting("TRANSLATION_JOB_HANDLERS", {}).get(job.kind)
+        if not handler_path:
+            raise LookupError(f"No handler configured for translation job kind {job.kind!r}")
+        handler = import_string(handler_path)
+        handler(
+            job.object_id,
+            job.reset_existing,
+            lambda done, total: report_progress(job.pk, done, total),
+        )
+    except ProviderUnavailable as exc:
+        # Wait for the breaker's next probe (at least the base retry delay) and keep the attempt.
+        logger.warning("Translation job %s (%s %s) postponed: %s", job.pk, job.kind, job.object_id, exc)
+        _retry_or_fail(job, f"{type(exc).__name__}: {exc}", delay=max(exc.retry_after, retry_delay(1)))
+    except Exception as exc:
+        logger.exception("Translation job %s (%s %s) failed", job.pk, job.kind, job.object_id)
+        _retry_or_fail(job, f"{type(exc).__name__}: {exc}")
+    else:
+        TranslationJob.objects.filter(pk=job.pk, status=TranslationJob.STATUS_RUNNING).update(
+            status=TranslationJob.STATUS_DONE,
+            last_error="",
+            locked_by="",
+            finished_on=timezone.now(),
+        )
+    finally:
+        translation_memory.flush()
+        connections.close_all()
+
+
+def work(max_workers=None, once=False, poll_seconds=None, stdout=None):
+    """
+    Run queued jobs on up to max_workers threads until interrupted, or with
+    once=True until no job is due.
+    """
+    max_workers = max(1, max_workers or _setting("TRANSLATION_JOB_WORKERS", 2))
+    poll_seconds = poll_seconds if poll_seconds is not None else _setting("TRANSLATION_JOB_POLL_SECONDS", 5)
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    running = set()
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="translation-job") as pool:
+        while True:
+            requeue_expired()
+            running = {future for future in running if not future.done()}
+            idle = False
+            while len(running) < max_workers:
+                job = claim(worker_id)
+                if job is None:
+                    idle = True
+                    break
+                if stdout is not None:
+                    stdout.write(f"Running job {job.pk}: {job.kind} {job.object_id} (attempt {job.attempts})")
+                running.add(pool.submit(run_job, job))
+            if once and idle and not running:
+                return
+            if running:
+                wait(running, timeout=poll_seconds, return_when=FIRST_COMPLETED)
+            else:
+                time.sleep(poll_seconds)
@@ -0,0 +1,185 @@
+"""
+Translation memory: reuse earlier machine translations of the same segment.
+
+Entries are keyed by a hash of the whitespace-normalized source segment, the
+source/target languages, the provider and TRANSLATION_MEMORY_VERSION; bump
+the version to stop reusing older entries (prune_translation_memory deletes
+them). Lookups may run on translation worker threads, but new entries and
+hit counts are buffered in memory and only written by flush(), which the
+translation flows call from the thread that saves their results.
+"""
+
+import hashlib
+import logging
+import threading
+from collections import Counter
+from datetime import timedelta
+from typing import Dict, Iterable
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.db.models import F
+from django.utils import timezone
+
+from pincatch.models import TranslationMemory
+
+logger = logging.getLogger(__name__)
+
+# SQLite caps the number of bound parameters per query.
+LOOKUP_CHUNK = 500
+
+_lock = threading.Lock()
+_pending: Dict[str, TranslationMemory] = {}
+_pending_hits: Counter = Counter()
+_stats = Counter()
+
+
+def enabled():
+    return getattr(settings, "TRANSLATION_MEMORY_ENABLED", True)
+
+
+def current_version():
+    return getattr(settings, "TRANSLATION_MEMORY_VERSION", 1)
+
+
+def normalize_segment(text):
+    return " ".join(str(text).split())
+
+
+def provider_name(provider):
+    return (
+        getattr(provider, "provider_name", None)
+        or getattr(provider, "name", None)
+        or type(provider).__name__
+    )
+
+
+def memory_key(provider, source_language, target_language, text):
+    raw = "\0".join(
+        [
+            str(current_version()),
+            provider,
+            str(source_language).lower(),
+            str(target_language).lower(),
+            normalize_segment(text),
+        ]
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def lookup_many(provider, source_language, target_language, segments: Iterable[str]) -> Dict[str, str]:
+    """Return {segment: remembered translation} for the segments the memory knows."""
+    if not enabled():
+        return {}
+    name = provider_name(provider)
+    keys = {memory_key(name, source_language, target_language, segment): segment for segment in segments}
+    total = len(keys)
+    found = {}
+    with _lock:
+        for key in list(keys):
+            entry = _pending.get(key)
+            if entry is not None:
+                found[keys.pop(key)] = entry.translated_text
+                _pending_hits[key] += 1
+
+    remaining = list(keys)
+    try:
+        for start in range(0, len(remaining), LOOKUP_CHUNK):
+            chunk = remaining[start:start + LOOKUP_CHUNK]
+            rows = TranslationMemory.objects.filter(key__in=chunk).values_list("key", "translated_text")
+            for key, translated_text in rows:
+                found[keys[key]] = translated_text
+                with _lock:
+                    _pending_hits[key] += 1
+    except DatabaseError as exc:
+        # The memory only saves money; never let it block a translation.
+        logger.warning("Translation memory lookup failed: %s", exc)
+
+    with _lock:
+        _stats["hits"] += len(found)
+        _stats["misses"] += total - len(found)
+    return found
+
+
+def remember_many(provider, source_language, target_language, translations: Dict[str, str]) -> None:
+    """Buffer {segment: translation} pairs; flush() writes them."""
+    if not enabled():
+        return
+    name = provider_name(provider)
+    with _lock:
+        for segment, translated_text in translations.items():
+            key = memory_key(name, source_language, target_language, segment)
+            _pending[key] = TranslationMemory(
+                key=key,
+                provider=name,
+                source_language=str(source_language),
+                target_language=str(target_language),
+                version=current_version(),
+                source_text=normalize_segment(segment),
+                translated_text=translated_text,
+            )
+
+
+def flush() -> int:
+    """Write buffered entries and hit counts; call from the thread that saves results."""
+    with _lock:
+        entries = list(_pending.values())
+        hits = dict(_pending_hits)
+        _pending.clear()
+        _pending_hits.clear()
+    try:
+        if entries:
+            TranslationMemory.objects.bulk_create(entries, ignore_conflicts=True)
+        if hits:
+            now = timezone.now()
+            by_count = {}
+            for key, count in hits.items():
+                by_count.setdefault(count, []).append(key)
+            for count, keys in by_count.items():
+                for start in range(0, len(keys), LOOKUP_CHUNK):
+                    TranslationMemory.objects.filter(key__in=keys[start:start + LOOKUP_CHUNK]).update(
+                        hits=F("hits") + count,
+                        last_used_on=now,
+                    )
+    except DatabaseError as exc:
+        logger.warning("Translation memory flush failed: %s", exc)
+        return 0
+    return len(entries)
+
+
+def stats() -> Dict[str, float]:
+    """Hit/miss counters for this process since start (or reset_stats())."""
+    with _lock:
+        hits, misses, pending = _stats["hits"], _stats["misses"], len(_pending)
+    lookups = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / lookups if lookups else 0.0,
+        "pending": pending,
+    }
+
+
+def reset_stats() -> None:
+    with _lock:
+        _stats.clear()
+
+
+def prune(max_age_days=None, max_entries=None) -> int:
+    """
+    Evict entries from older memory versions, entries unused for max_age_days,
+    and the least recently used entries beyond max_entries. Returns rows deleted.
+    """
+    deleted, _ = TranslationMemory.objects.exclude(version=current_version()).delete()
+    if max_age_days is not None:
+        cutoff = timezone.now() - timedelta(days=max_age_days)
+        count, _ = TranslationMemory.objects.filter(last_used_on__lt=cutoff).delete()
+        deleted += count
+    if max_entries is not None:
+        stale_ids = list(
+            TranslationMemory.objects.order_by("-last_used_on", "-pk").values_list("pk", flat=True)[max_entries:]
+        )
+        for start in range(0, len(stale_ids), LOOKUP_CHUNK):
+            count, _ = TranslationMemory.objects.filter(pk__in=stale_ids[start:start + LOOKUP_CHUNK]).delete()
+            deleted += count
+    return deleted
@@ -0,0 +1,134 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+def state_cache():
+    """The cache alias for shared counters and version keys (STATE_CACHE_ALIAS)."""
+    return caches[getattr(settings, "STATE_CACHE_ALIAS", "default")]
+
+
+def shared_version(key):
+    """
+    Return the shared version stored under key. A missing key (never set, or
+    culled) is seeded with a fresh clock-based value rather than read as 0, so
+    losing it can never bring back entries cached under an older version.
+    """
+    cache = state_cache()
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key, 0)
+    return version
+
+
+def bump_version(key):
+    """Move the shared version under key so every entry keyed on it goes stale."""
+    cache = state_cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), timeout=None)
+
+
+class VersionedLocalCache:
+    """
+    Process-local memo that is thrown away whenever a shared version number moves.
+
+    Values live in the worker's memory, so lookups cost no I/O. Writers call
+    invalidate(), which bumps a version key in the shared cache; other workers
+    notice on their next check (at most every check_interval seconds) and
+    rebuild. max_age bounds staleness if a change bypassed the signals
+    (e.g. a queryset.update() in a migration).
+    """
+
+    def __init__(self, name, check_interval=1.0, max_age=300.0, max_entries=None):
+        self.version_key = f"version:{name}"
+        self.check_interval = check_interval
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._values = OrderedDict()
+        self._version = None
+        self._generation = 0
+        self._checked_at = 0.0
+        self._built_at = 0.0
+
+    def _shared_version(self):
+        try:
+            return shared_version(self.version_key)
+        except Exception:
+            # A cache outage must not take routing down; fall back to max_age expiry.
+            return self._version
+
+    def _validate(self, now):
+        if now - self._checked_at < self.check_interval:
+            return
+        self._checked_at = now
+        version = self._shared_version()
+        expired = self.max_age is not None and now - self._built_at > self.max_age
+        if version != self._version or expired:
+            self._values.clear()
+            self._generation += 1
+            self._version = version
+            self._built_at = now
+
+    def get(self, key, builder):
+        """Return the value for key, calling builder() to create it when missing."""
+        with self._lock:
+            self._validate(time.monotonic())
+            if key in self._values:
+                self._values.move_to_end(key)
+                return self._values[key]
+            generation = self._generation
+
+        value = builder()
+        with self._lock:
+            # Don't store a value built from data an invalidate() has since replaced.
+            if generation == self._generation:
+                self._values[key] = value
+                if self.max_entries is not None:
+                    while len(self._values) > self.max_entries:
+                        self._values.popitem(last=False)
+        return value
+
+    def get_many(self, keys, builder):
+        """
+        Return {key: value} for keys, calling builder(missing_keys) once for the
+        keys not cached yet; builder must return a dict covering all of them.
+        """
+        found = {}
+        with self._lock:
+            self._validate(time.monotonic())
+            missing = []
+            for key in keys:
+                if key in self._values:
+                    self._values.move_to_end(key)
+                    found[key] = self._values[key]
+                else:
+                    missing.append(key)
+            generation = self._generation
+        if not missing:
+            return found
+
+        built = builder(missing)
+        with self._lock:
+            if generation == self._generation:
+                self._values.update(built)
+                if self.max_entries is not None:
+                    while len(self._values) > self.max_entries:
+                        self._values.popitem(last=False)
+        found.update(built)
+        return found
+
+    def invalidate(self):
+        """Drop this worker's values and tell every other worker to do the same."""
+        bump_version(self.version_key)
+        with self._lock:
+            self._values.clear()
+            self._generation += 1
+            self._version = None
+            self._checked_at = 0.0
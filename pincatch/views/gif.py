@@ -17,6 +17,8 @@ from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 
+from pincatch import quota
+from pincatch.extraction_cache import cached_media_url
 from pincatch.proxy_pool import (
     add_proxy_to_chrome_options,
     mark_proxy_failure,
@@ -161,7 +163,9 @@ def download_gif(request):
         if not filepath:
             return HttpResponse('Failed to download GIF', status=500)
         with open(filepath, 'rb') as f:
-            response = HttpResponse(f.read(), content_type=content_type)
+            payload = f.read()
+            quota.record_bytes(len(payload))
+            response = HttpResponse(payload, content_type=content_type)
             response['Content-Disposition'] = f'attachment; filename="{smart_str(filename)}"'
             return response
     return HttpResponse('Invalid request method', status=405)
@@ -257,6 +261,7 @@ def get_gif_url(page_url):
     Returns a valid GIF URL or None if not possible.
     """
     try:
+        quota.record("page_fetch")
         resp = proxy_request("get", page_url, headers=REQUEST_HEADERS, timeout=8)
         if resp.status_code == 200:
             soup = BeautifulSoup(resp.text, 'html.parser')
@@ -271,6 +276,7 @@ def get_gif_url(page_url):
         pass
     
     try:
+        quota.record("selenium")
         options = webdriver.ChromeOptions()
         options.add_argument('--headless')
         options.add_argument('--disable-gpu')
@@ -306,7 +312,7 @@ def download_pinterest_gif(request):
     except (json.JSONDecodeError, TypeError):
         return JsonResponse({'error': 'Invalid or empty JSON body.'}, status=400)
     page_url = data.get('url')
-    gif_url = get_gif_url(page_url)
+    gif_url = cached_media_url("gif", page_url, get_gif_url)
 
     if not gif_url:
         return JsonResponse(
@@ -15,6 +15,8 @@ from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 
+from pincatch import quota
+from pincatch.extraction_cache import cached_media_url
 from pincatch.proxy_pool import (
     add_proxy_to_chrome_options,
     mark_proxy_failure,
@@ -49,7 +51,9 @@ def download_image(request):
         if not filepath:
             return HttpResponse('Failed to download image', status=500)
         with open(filepath, 'rb') as f:
-            response = HttpResponse(f.read(), content_type='image/jpeg')
+            payload = f.read()
+            quota.record_bytes(len(payload))
+            response = HttpResponse(payload, content_type='image/jpeg')
             response['Content-Disposition'] = f'attachment; filename="{smart_str(filename)}"'
             return response
     return HttpResponse('Invalid request method', status=405)
@@ -103,6 +107,7 @@ def get_image_url(page_url):
     headers = {'User-Agent': 'Mozilla/5.0'}
     
     try:
+        quota.record("page_fetch")
         resp = proxy_request("get", page_url, headers=headers, timeout=8)
         if resp.status_code == 200:
             soup = BeautifulSoup(resp.text, 'html.parser')
@@ -113,6 +118,7 @@ def get_image_url(page_url):
         pass
     
     try:
+        quota.record("selenium")
         options = webdriver.ChromeOptions()
         options.add_argument('--headless')
         options.add_argument('--disable-gpu')
@@ -146,6 +152,6 @@ def download_pinterest_image(request):
     except (json.JSONDecodeError, TypeError):
         return JsonResponse({'error': 'Invalid or empty JSON body.'}, status=400)
     page_url = data.get('url')
-    image_url = get_image_url(page_url)
+    image_url = cached_media_url("image", page_url, get_image_url)
     data = {'image_url': image_url}
     return JsonResponse(data)
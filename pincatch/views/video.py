@@ -15,6 +15,8 @@ from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 
+from pincatch import quota
+from pincatch.extraction_cache import cached_media_url
 from pincatch.proxy_pool import (
     add_proxy_to_chrome_options,
     mark_proxy_failure,
@@ -51,7 +53,9 @@ def download_video(request):
         if not filepath:
             return HttpResponse('Failed to download video', status=500)
         with open(filepath, 'rb') as f:
-            response = HttpResponse(f.read(), content_type='video/mp4')
+            payload = f.read()
+            quota.record_bytes(len(payload))
+            response = HttpResponse(payload, content_type='video/mp4')
             response['Content-Disposition'] = f'attachment; filename="{smart_str(filename)}"'
             return response
     return HttpResponse('Invalid request method', status=405)
@@ -118,6 +122,7 @@ def get_video_url(page_url):
     # Fast method: requests + BeautifulSoup
     try:
         headers = {'User-Agent': 'Mozilla/5.0'}
+        quota.record("page_fetch")
         resp = proxy_request("get", page_url, headers=headers, timeout=8)
         if resp.status_code == 200:
             soup = BeautifulSoup(resp.text, 'html.parser')
@@ -133,6 +138,7 @@ def get_video_url(page_url):
     except Exception:
         pass
     # Fallback: Selenium (minimal wait)
+    quota.record("selenium")
     options = webdriver.ChromeOptions()
     options.add_argument('--headless')
     options.add_argument('--disable-gpu')
@@ -173,7 +179,7 @@ def download_pinterest_video(request):
     except (json.JSONDecodeError, TypeError):
         return JsonResponse({'error': 'Invalid or empty JSON body.'}, status=400)
     page_url = data.get('url')
-    video_url = get_video_url(page_url)
+    video_url = cached_media_url("video", page_url, get_video_url)
 
     if not video_url:
         return JsonResponse(
@@ -22,15 +22,7 @@ import views
 from django.conf import settings
 from django.conf.urls.static import static
 from django.conf.urls.i18n import i18n_patterns, set_language
-from django.contrib.sitemaps.views import sitemap
-from blog.sitemaps import StaticViewSitemap, PostSitemap, CategorySitemap, PageSitemap
-
-sitemaps = {
-    'static': StaticViewSitemap,
-    'posts': PostSitemap,
-    'categories': CategorySitemap,
-    'pages': PageSitemap,
-}
+from blog import sitemaps
 
 urlpatterns = i18n_patterns(
     path('admin/', admin.site.urls),
@@ -49,7 +41,8 @@ urlpatterns += [
     path("pinterest-gif-downloader", views.gifDownload, name="gifDownloader"),
     path("pinterest-profile-picture-downloader", views.profileDownload, name="profileDownloader"),
     path('pin/', include('pincatch.urls')),
-    path('sitemap.xml', sitemap, {'sitemaps': sitemaps}, name='sitemap'),
+    path('sitemap.xml', sitemaps.sitemap_index, name='sitemap'),
+    path('sitemap-<str:section>.xml', sitemaps.sitemap_section, name='sitemap_section'),
     path('robots.txt', views.robot , name='robot'),
     path('ckeditor/', include('ckeditor_uploader.urls')),
     path("<slug:language_slug>/", views.localized_home, name="home_language"),
@@ -60,4 +53,5 @@ if settings.DEBUG:
 # No changes needed for CSRF, User-Agent, or rate limiting in urls.py itself.
 # Just a comment for maintainability
 # Only the protected views (with CSRF, ratelimit, and header checks) are exposed here.
-# All protections are handled in the view functions themselves.
+# Rate limits and User-Agent checks are applied by pincatch.ratelimit.RateLimitMiddleware
+# using the URL names listed in settings.RATELIMIT_POLICIES.
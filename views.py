@@ -1,17 +1,15 @@
 import re
 from django.conf import settings
-from django.shortcuts import render, get_object_or_404, redirect
+from django.shortcuts import render, redirect
 from django.http import HttpResponse, Http404
-from django.views.decorators.csrf import csrf_protect
-from django_ratelimit.decorators import ratelimit
 from django.utils import translation
 from django.utils.translation import gettext as _
 from django.template import TemplateDoesNotExist
 from django.template.loader import select_template
-from django.template import engines, RequestContext
-from django.utils.safestring import mark_safe
 from blog.models import Post
 from pincatch.models import Page
+from pincatch import page_cache, routing
+from pincatch.rich_content import render_rich_content
 from pincatch.seo import build_seo_context
 
 
@@ -19,23 +17,22 @@ def _render_rich_content(request, context, content):
     """
     Render stored rich content through the Django template engine so that
     template tags embedded in Page.content (e.g., page_url) are executed.
+    Compiled templates are shared with the render_page_content tag.
     """
-    if not content:
-        return ""
-
-    template_source = "{% load page_links i18n static %}" + str(content)
-    try:
-        template_obj = engines["django"].from_string(template_source)
-        return mark_safe(template_obj.render(RequestContext(request, context)))
-    except Exception:
-        # Fall back to raw content if rendering fails; better to show something
-        # than break the page for users.
-        return mark_safe(content)
+    return render_rich_content(content, context, request)
 
 def _render_page_instance(request, page):
     # Ensure template context reflects the page's language (lang/dir attributes, translations).
     translation.activate(page.language)
     request.LANGUAGE_CODE = page.language
+    return page_cache.serve_page(
+        request,
+        page,
+        lambda csrf_token: _build_page_response(request, routing.load_page(page), csrf_token),
+    )
+
+
+def _build_page_response(request, page, csrf_token=None):
     context_language_code = translation.get_language()
     breadcrumbs = [{'title': 'Home', 'url': 'home'}]
     if page.slug_url == Page.HOME_SLUG:
@@ -62,6 +59,9 @@ def _render_page_instance(request, page):
     context['rendered_content'] = rendered_content
     # Preserve compatibility with templates that still reference {{ content }} directly.
     context['content'] = rendered_content
+    if csrf_token:
+        # Cached renders carry a placeholder that page_cache swaps per request.
+        context['csrf_token'] = csrf_token
     lang_slug = page.get_language_slug() or settings.LANGUAGE_CODE
     primary_template = f'{page.slug_url}/{lang_slug}.html'
 
@@ -76,23 +76,18 @@ def _render_page_instance(request, page):
 
     try:
         template = select_template(fallback_templates)
-        response = render(request, template.template.name, context)
-        # Avoid CDN/proxy caching so admin edits appear immediately in production.
-        response["Cache-Control"] = "no-store"
-        return response
+        return render(request, template.template.name, context)
     except TemplateDoesNotExist:
         # Surface the original path in the error for debugging.
         raise TemplateDoesNotExist(primary_template)
 
 
 def _find_home_page_by_slug(language_slug):
-    if not language_slug:
-        return None
-    return Page.objects.filter(is_homepage=True, language_slug=language_slug).first()
+    return routing.get_routing_table().home_for_language_slug(language_slug)
 
 
 def _find_home_page_by_language(language_code):
-    return Page.objects.filter(is_homepage=True, language=language_code).first()
+    return routing.get_routing_table().home_for_language(language_code)
 
 
 def index(request, language_slug=None):
@@ -133,28 +128,20 @@ def index(request, language_slug=None):
             return response
         target_page = default_home
 
-    # CSRF protection is enabled by default with csrf_protect
-    @csrf_protect
-    @ratelimit(key='header:x-real-ip', rate='10/m', block=True)
-    def protected_home(request):
-        # User-Agent check
-        user_agent = request.META.get('HTTP_USER_AGENT', '')
-        if 'python' in user_agent.lower() or not user_agent:
-            return HttpResponse('Forbidden', status=403)
-        if target_page:
-            translation.activate(target_language)
-            request.LANGUAGE_CODE = target_language
-            return _render_page_instance(request, target_page)
-        # ...existing logic...
-        posts = Post.objects.all().order_by("-created_on").prefetch_related('translations')[:3]
-        breadcrumbs = [{'title': 'Home', 'url': None}]
-        context = {
-            'blogs': posts,
-            'breadcrumbs': breadcrumbs,
-        }
-        context.update(build_seo_context(request))
-        return render(request, 'home.html', context)
-    return protected_home(request)
+    # Rate limiting and User-Agent filtering are applied by RateLimitMiddleware.
+    if target_page:
+        translation.activate(target_language)
+        request.LANGUAGE_CODE = target_language
+        return _render_page_instance(request, target_page)
+    # ...existing logic...
+    posts = Post.objects.all().order_by("-created_on").prefetch_related('translations')[:3]
+    breadcrumbs = [{'title': 'Home', 'url': None}]
+    context = {
+        'blogs': posts,
+        'breadcrumbs': breadcrumbs,
+    }
+    context.update(build_seo_context(request))
+    return render(request, 'home.html', context)
 
 
 def localized_home(request, language_slug):
@@ -166,7 +153,7 @@ def _render_page_or_fallback(request, slug_url, fallback_template, breadcrumbs,
     For default-language routes without a language prefix, serve a dynamic Page
     if one exists; otherwise fall back to the static template.
     """
-    page = Page.objects.filter(slug_url=slug_url, language=settings.LANGUAGE_CODE).first()
+    page = routing.get_routing_table().page_for_language(slug_url, settings.LANGUAGE_CODE)
     if page:
         return _render_page_instance(request, page)
 
@@ -179,64 +166,37 @@ def _render_page_or_fallback(request, slug_url, fallback_template, breadcrumbs,
 
 
 def imageDownload(request):
-    # CSRF protection is enabled by default with csrf_protect
-    @csrf_protect
-    @ratelimit(key='header:x-real-ip', rate='10/m', block=True)
-    def protected_home(request):
-        # User-Agent check
-        user_agent = request.META.get('HTTP_USER_AGENT', '')
-        if 'python' in user_agent.lower() or not user_agent:
-            return HttpResponse('Forbidden', status=403)
-        breadcrumbs = [{'title': 'Home', 'url': 'home'}, {'title': 'Image Downloader', 'url': None}]
-        return _render_page_or_fallback(
-            request,
-            slug_url="pinterest-image-downloader",
-            fallback_template='image.html',
-            breadcrumbs=breadcrumbs,
-            seo_title=_("Pinterest Image Downloader - Save HD Photos from Pins"),
-            seo_description=_("Download Pinterest images in HD quality without installing any apps using PinCatch."),
-        )
-    return protected_home(request)
+    breadcrumbs = [{'title': 'Home', 'url': 'home'}, {'title': 'Image Downloader', 'url': None}]
+    return _render_page_or_fallback(
+        request,
+        slug_url="pinterest-image-downloader",
+        fallback_template='image.html',
+        breadcrumbs=breadcrumbs,
+        seo_title=_("Pinterest Image Downloader - Save HD Photos from Pins"),
+        seo_description=_("Download Pinterest images in HD quality without installing any apps using PinCatch."),
+    )
 
 def gifDownload(request):
-    # CSRF protection is enabled by default with csrf_protect
-    @csrf_protect
-    @ratelimit(key='header:x-real-ip', rate='10/m', block=True)
-    def protected_home(request):
-        # User-Agent check
-        user_agent = request.META.get('HTTP_USER_AGENT', '')
-        if 'python' in user_agent.lower() or not user_agent:
-            return HttpResponse('Forbidden', status=403)
-        breadcrumbs = [{'title': 'Home', 'url': 'home'}, {'title': 'Gif Downloader', 'url': None}]
-        return _render_page_or_fallback(
-            request,
-            slug_url="pinterest-gif-downloader",
-            fallback_template='gif.html',
-            breadcrumbs=breadcrumbs,
-            seo_title=_("Pinterest GIF Downloader - Save Animated Pins Online"),
-            seo_description=_("Convert and download Pinterest GIFs instantly in high quality with the free PinCatch GIF downloader."),
-        )
-    return protected_home(request)
+    breadcrumbs = [{'title': 'Home', 'url': 'home'}, {'title': 'Gif Downloader', 'url': None}]
+    return _render_page_or_fallback(
+        request,
+        slug_url="pinterest-gif-downloader",
+        fallback_template='gif.html',
+        breadcrumbs=breadcrumbs,
+        seo_title=_("Pinterest GIF Downloader - Save Animated Pins Online"),
+        seo_description=_("Convert and download Pinterest GIFs instantly in high quality with the free PinCatch GIF downloader."),
+    )
 
 def profileDownload(request):
-    # CSRF protection is enabled by default with csrf_protect
-    @csrf_protect
-    @ratelimit(key='header:x-real-ip', rate='10/m', block=True)
-    def protected_home(request):
-        # User-Agent check
-        user_agent = request.META.get('HTTP_USER_AGENT', '')
-        if 'python' in user_agent.lower() or not user_agent:
-            return HttpResponse('Forbidden', status=403)
-        breadcrumbs = [{'title': 'Home', 'url': 'home'}, {'title': 'Profile Picture Downloader', 'url': None}]
-        return _render_page_or_fallback(
-            request,
-            slug_url="pinterest-profile-picture-downloader",
-            fallback_template='profile.html',
-            breadcrumbs=breadcrumbs,
-            seo_title=_("Pinterest URL Downloader - Save Animated Pins Online"),
-            seo_description=_("Convert and download Pinterest URLs instantly in high quality with the free PinCatch Url downloader."),
-        )
-    return protected_home(request)
+    breadcrumbs = [{'title': 'Home', 'url': 'home'}, {'title': 'Profile Picture Downloader', 'url': None}]
+    return _render_page_or_fallback(
+        request,
+        slug_url="pinterest-profile-picture-downloader",
+        fallback_template='profile.html',
+        breadcrumbs=breadcrumbs,
+        seo_title=_("Pinterest URL Downloader - Save Animated Pins Online"),
+        seo_description=_("Convert and download Pinterest URLs instantly in high quality with the free PinCatch Url downloader."),
+    )
 
 def is_valid_url(url):
     return re.match(r'^https?://(www\.)?pinterest\.com/', url)
@@ -298,17 +258,8 @@ def page_view(request, language_slug, slug):
     """
     Dynamic view for handling all Page instances
     """
-    # CSRF protection is enabled by default with csrf_protect
-    @csrf_protect
-    @ratelimit(key='header:x-real-ip', rate='10/m', block=True)
-    def protected_page_view(request, language_slug, slug):
-        # User-Agent check
-        user_agent = request.META.get('HTTP_USER_AGENT', '')
-        if 'python' in user_agent.lower() or not user_agent:
-            return HttpResponse('Forbidden', status=403)
-
-        # Get the page by group slug_url and language
-        page = get_object_or_404(Page, slug_url=slug, language_slug=language_slug)
-        return _render_page_instance(request, page)
-
-    return protected_page_view(request, language_slug, slug)
+    # Get the page by group slug_url and language from the in-memory routing table
+    page = routing.get_routing_table().page_for_url(slug, language_slug)
+    if page is None:
+        raise Http404("Page not found")
+    return _render_page_instance(request, page)